@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark du filtre « processus intéressant » pour un passage de scan
+
+Compare l'ancienne liste reconstruite à chaque appel (recherche linéaire)
+à l'index précalculé d'AppMapper, sur une table de noms mêlant noms Windows
+(.exe) et Linux (comm, binaires).
+
+Usage: python benchmarks/bench_interesting_index.py [--processes 600] [--repeat 200]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.app_mapper import app_mapper
+
+
+def legacy_is_interesting_app(proc_name: str) -> bool:
+    """Ancienne implémentation de SystemMonitor._is_interesting_app"""
+    interesting_patterns = [
+        'chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe',
+        'notepad.exe', 'notepad++.exe', 'code.exe', 'sublime_text.exe',
+        'atom.exe', 'vim.exe', 'emacs.exe',
+        'winword.exe', 'excel.exe', 'powerpnt.exe', 'outlook.exe',
+        'python.exe', 'node.exe', 'java.exe', 'javaw.exe',
+        'pycharm64.exe', 'idea64.exe', 'devenv.exe',
+        'discord.exe', 'slack.exe', 'teams.exe', 'zoom.exe',
+        'telegram.exe', 'whatsapp.exe',
+        'spotify.exe', 'vlc.exe', 'photoshop.exe', 'gimp.exe',
+        'steam.exe', 'origin.exe', 'epicgameslauncher.exe',
+        'cmd.exe', 'powershell.exe', 'explorer.exe'
+    ]
+    return proc_name in interesting_patterns
+
+
+def process_names(count: int) -> list:
+    """Table de noms réaliste : surtout des démons, quelques applications"""
+    apps = ['chrome.exe', 'code', 'firefox', 'slack.exe', 'spotify', 'gnome-shell']
+    names = []
+    for i in range(count):
+        if i % 25 == 0:
+            names.append(apps[(i // 25) % len(apps)])
+        else:
+            names.append(f"kworker/{i}:0" if i % 2 else f"svc_daemon{i}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    
+    names = process_names(args.processes)
+    
+    legacy_matches = sum(legacy_is_interesting_app(name) for name in names)
+    index_matches = sum(app_mapper.is_interesting(name) for name in names)
+    
+    legacy = timeit.timeit(lambda: [legacy_is_interesting_app(n) for n in names], number=args.repeat)
+    index = timeit.timeit(lambda: [app_mapper.is_interesting(n) for n in names], number=args.repeat)
+    
+    print(f"🧪 {args.processes} processus par passage, {args.repeat} passages")
+    print(f"{'Filtre':<18}{'µs/passage':>12}{'correspondances':>17}")
+    print(f"{'liste (ancien)':<18}{legacy / args.repeat * 1e6:>12.1f}{legacy_matches:>17}")
+    print(f"{'index':<18}{index / args.repeat * 1e6:>12.1f}{index_matches:>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark déterministe de SystemMonitor par rejeu de session
+
+Rejoue une session (enregistrée avec `--record`, ou synthétique par défaut)
+à travers SystemMonitor et mesure :
+- le coût d'un scan (temps CPU et temps réel)
+- le délai de détection : écart entre un changement de fenêtre enregistré et
+  le premier scan qui désigne la bonne application
+- le débit des callbacks de changement de fenêtre (rejeu des événements focus)
+
+Usage:
+    python benchmarks/bench_monitor_replay.py [--duration 600] [--processes 400]
+    python benchmarks/bench_monitor_replay.py --record session.jsonl --duration 120
+    python benchmarks/bench_monitor_replay.py --replay session.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.monitor_backends import (
+    RECORDING_VERSION, PsutilBackend, RecordingBackend, ReplayBackend
+)
+from src.core.system_monitor import SystemMonitor
+from src.core.usage_timeline import UsageTimeline
+from src.utils.app_mapper import app_mapper
+
+APPS = ['code', 'firefox', 'slack', 'spotify', 'gimp', 'vlc', 'discord', 'thunderbird']
+
+
+def synthesize_session(path: str, duration: int, processes: int, seed: int = 42):
+    """
+    Session synthétique : un scan par seconde, l'application active change
+    toutes les 5 à 60 s et consomme du CPU, les autres restent au repos sauf
+    de brefs pics d'activité (lecture audio, synchronisation) qui les font
+    passer en tête le temps d'un scan
+    """
+    rng = random.Random(seed)
+    wall = 1_780_000_000.0
+    table = {pid: f"daemon{pid}" for pid in range(100, 100 + processes)}
+    app_pids = {}
+    for i, name in enumerate(APPS):
+        pid = 5000 + i
+        table[pid] = name
+        app_pids[name] = pid
+    cpu = {pid: 0.0 for pid in app_pids.values()}
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        def write(record):
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        
+        write({'type': 'header', 'version': RECORDING_VERSION, 'wall': wall})
+        active, next_switch = None, 0
+        for t in range(duration):
+            if t >= next_switch:
+                active = rng.choice([app for app in APPS if app != active])
+                next_switch = t + rng.randint(5, 60)
+                write({'type': 'focus', 't': t - 0.5, 'wall': wall + t - 0.5,
+                       'pid': app_pids[active], 'name': active, 'title': active})
+            
+            burst = rng.choice(APPS) if rng.random() < 0.1 else None
+            procs = {}
+            for pid, name in table.items():
+                values = {}
+                if t == 0:
+                    values.update(name=name, create_time=wall - 7200)
+                if pid in cpu:
+                    if name == active:
+                        cpu[pid] += 0.4
+                    else:
+                        cpu[pid] += 0.5 if name == burst else rng.uniform(0, 0.01)
+                    values.update(memory_info=[200 * 1024 * 1024, 0], cpu_times=[cpu[pid], 0.0])
+                if values:
+                    procs[str(pid)] = values
+            write({'type': 'scan', 't': float(t), 'wall': wall + t, 'pids': list(table), 'procs': procs})
+
+
+def record_session(path: str, duration: float):
+    """Enregistre une session réelle (scans psutil, et focus X11 si disponible)"""
+    backend = RecordingBackend(PsutilBackend(), path)
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = SystemMonitor(lambda app, context: print(f"  → {app}"), process_backend=backend)
+        monitor.timeline = UsageTimeline(directory)
+        monitor.start()
+        try:
+            time.sleep(duration)
+        finally:
+            monitor.stop()
+
+
+def replay_scans(path: str, debounce: bool = True) -> dict:
+    """Rejoue tous les scans et mesure coût et délai de détection"""
+    backend = ReplayBackend(path)
+    detections = []
+    
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = SystemMonitor(lambda app, context: None, process_backend=backend)
+        monitor.timeline = UsageTimeline(directory)
+        if not debounce:
+            monitor.debouncer.dwell_time = 0
+        
+        cpu_total = wall_total = 0.0
+        while not backend.finished:
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            app_name, context = monitor._get_active_app_info()
+            monitor._handle_detection(app_name, context)
+            cpu_total += time.process_time() - cpu_start
+            wall_total += time.perf_counter() - wall_start
+            detections.append((backend.monotonic(), monitor.current_app))
+    
+    # Délai de détection par changement de fenêtre enregistré
+    delays, missed = [], 0
+    events = backend.focus_events
+    for i, event in enumerate(events):
+        expected = app_mapper.get_display_name(event['name'])
+        window_end = events[i + 1]['t'] if i + 1 < len(events) else float('inf')
+        delay = next((t - event['t'] for t, app in detections
+                      if event['t'] <= t < window_end and app == expected), None)
+        if delay is None:
+            missed += 1
+        else:
+            delays.append(delay)
+    
+    scans = len(detections)
+    return {
+        'scans': scans,
+        'scan_cpu_ms': cpu_total / scans * 1000 if scans else 0.0,
+        'scan_wall_ms': wall_total / scans * 1000 if scans else 0.0,
+        'focus_events': len(events),
+        'delays': sorted(delays),
+        'missed': missed,
+        'debounce': monitor.debouncer.get_stats()
+    }
+
+
+def replay_focus(path: str) -> dict:
+    """Rejoue les changements de fenêtre à vitesse maximale (débit des callbacks)"""
+    backend = ReplayBackend(path)
+    callbacks = []
+    
+    with tempfile.TemporaryDirectory() as directory:
+        monitor = SystemMonitor(lambda app, context: callbacks.append(app), process_backend=backend)
+        monitor.timeline = UsageTimeline(directory)
+        # Coût brut du chemin événement → callback, sans délai anti-rebond
+        monitor.debouncer.focus_dwell_time = 0
+        
+        start = time.perf_counter()
+        monitor.start()
+        if monitor.focus_watcher:
+            monitor.focus_watcher.thread.join()
+        elapsed = time.perf_counter() - start
+        monitor.stop()
+    
+    return {'callbacks': len(callbacks), 'per_second': len(callbacks) / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", help="Enregistre une session réelle dans ce fichier")
+    parser.add_argument("--replay", help="Rejoue ce fichier au lieu d'une session synthétique")
+    parser.add_argument("--duration", type=float, default=600)
+    parser.add_argument("--processes", type=int, default=400)
+    args = parser.parse_args()
+    
+    if args.record:
+        record_session(args.record, args.duration)
+        return
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.replay
+        if not path:
+            path = str(Path(directory) / "session.jsonl")
+            synthesize_session(path, int(args.duration), args.processes)
+            print(f"🧪 Session synthétique: {int(args.duration)} s, {args.processes + len(APPS)} processus")
+        
+        scans = replay_scans(path)
+        undebounced = replay_scans(path, debounce=False)
+        focus = replay_focus(path) if scans['focus_events'] else None
+    
+    print(f"{'Scans rejoués':<28}{scans['scans']:>10}")
+    print(f"{'Coût CPU par scan':<28}{scans['scan_cpu_ms']:>10.3f} ms")
+    print(f"{'Temps réel par scan':<28}{scans['scan_wall_ms']:>10.3f} ms")
+    print(f"{'Changements transmis':<28}{scans['debounce']['changes']:>10}"
+          f" ({scans['debounce']['suppressed']} rebonds évités, "
+          f"{undebounced['debounce']['changes']} sans anti-rebond)")
+    if scans['focus_events']:
+        delays = scans['delays']
+        if delays:
+            print(f"{'Délai de détection p50':<28}{delays[len(delays) // 2]:>10.2f} s")
+            print(f"{'Délai de détection max':<28}{delays[-1]:>10.2f} s")
+        print(f"{'Changements non détectés':<28}{scans['missed']:>10} / {scans['focus_events']}")
+        print(f"{'Callbacks focus':<28}{focus['per_second']:>10.0f} /s ({focus['callbacks']} rejoués)")
+
+
+if __name__ == "__main__":
+    main()
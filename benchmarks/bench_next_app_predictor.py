@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Évaluation hors ligne de la prédiction de la prochaine application
+
+Rejoue un historique de transitions dans l'ordre : les `--train` premiers
+pourcents servent d'apprentissage, puis chaque transition restante est
+d'abord prédite (top-1 / top-3) puis apprise, comme en fonctionnement réel.
+Compare les workflows pondérés (TransitionMatrix, ancien moteur des
+suggestions) au prédicteur de Markov, en précision et en latence de requête.
+
+Historique : chronologie enregistrée (`--timeline usage_timeline`) ou, par
+défaut, semaines synthétiques avec habitudes selon l'heure et enchaînements
+à deux applications.
+
+Usage: python benchmarks/bench_next_app_predictor.py [--timeline DIR] [--days 60] [--train 80]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.next_app_predictor import NextAppPredictor
+from src.core.transition_matrix import TransitionMatrix
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import WORKFLOW_HALF_LIFE_DAYS
+
+# Habitudes synthétiques : suivants probables selon le moment de la journée
+DAY_HABITS = {
+    "VS Code": ["Chrome", "Terminal", "Slack"],
+    "Chrome": ["VS Code", "Jira", "Slack"],
+    "Terminal": ["VS Code", "Chrome"],
+    "Slack": ["Chrome", "VS Code", "Outlook"],
+    "Jira": ["VS Code", "Slack"],
+    "Outlook": ["Slack", "Chrome"],
+}
+EVENING_HABITS = {
+    "VS Code": ["Spotify", "Chrome"],
+    "Chrome": ["YouTube", "Spotify"],
+    "Terminal": ["Spotify"],
+    "Slack": ["Chrome", "Spotify"],
+    "Spotify": ["Chrome", "YouTube"],
+    "YouTube": ["Spotify", "Chrome"],
+    "Jira": ["Chrome"],
+    "Outlook": ["Chrome"],
+}
+# Enchaînements dépendant de l'application précédente
+SEQUENCES = {("Slack", "Chrome"): "Jira", ("VS Code", "Chrome"): "VS Code", ("Terminal", "VS Code"): "Chrome"}
+
+
+def generate(days: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    transitions = []
+    first_day = datetime(2026, 1, 5)
+    for day in range(days):
+        t = (first_day + timedelta(days=day, hours=8)).timestamp()
+        day_end = t + 15 * 3600
+        previous, current = None, "Outlook"
+        while t < day_end:
+            evening = time.localtime(t).tm_hour >= 19
+            habits = (EVENING_HABITS if evening else DAY_HABITS).get(current, ["Chrome"])
+            following = SEQUENCES.get((previous, current)) if not evening else None
+            if following is None or rng.random() < 0.2:
+                following = rng.choice(habits) if rng.random() < 0.85 else rng.choice(list(EVENING_HABITS))
+            if following != current:
+                transitions.append((current, following, t))
+                previous, current = current, following
+            t += rng.expovariate(1 / 300)
+    return transitions
+
+
+def load_timeline(directory: str) -> list:
+    timeline = UsageTimeline(directory)
+    timeline.load()
+    return timeline.transitions()
+
+
+def evaluate(transitions: list, train_share: float) -> dict:
+    matrix = TransitionMatrix(WORKFLOW_HALF_LIFE_DAYS * 86400)
+    predictor = NextAppPredictor()
+    split = int(len(transitions) * train_share)
+    
+    results = {name: {'top1': 0, 'top3': 0, 'latency': []} for name in ("workflows", "markov")}
+    last_to = None
+    for index, (from_app, to_app, timestamp) in enumerate(transitions):
+        if last_to != from_app:
+            predictor.reset_context()  # Pause dans la chronologie
+        
+        if index >= split:
+            start = time.perf_counter()
+            by_weight = [app for app, _ in matrix.successors(from_app, timestamp)[:3]]
+            results['workflows']['latency'].append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            by_markov = [app for app, _ in predictor.predict(from_app, 3, timestamp)]
+            results['markov']['latency'].append(time.perf_counter() - start)
+            
+            for name, predicted in (("workflows", by_weight), ("markov", by_markov)):
+                results[name]['top1'] += predicted[:1] == [to_app]
+                results[name]['top3'] += to_app in predicted
+        
+        matrix.record(from_app, to_app, timestamp)
+        predictor.record(from_app, to_app, timestamp)
+        last_to = to_app
+    
+    results['evaluated'] = len(transitions) - split
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timeline", help="Dossier d'une chronologie enregistrée (UsageTimeline)")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--train", type=float, default=80, help="Pourcentage d'apprentissage initial")
+    args = parser.parse_args()
+    
+    transitions = load_timeline(args.timeline) if args.timeline else generate(args.days)
+    if len(transitions) < 10:
+        print("❌ Historique trop court pour évaluer")
+        return
+    
+    results = evaluate(transitions, args.train / 100)
+    evaluated = results['evaluated']
+    print(f"🧪 {len(transitions)} transitions, {evaluated} évaluées "
+          f"({'chronologie ' + args.timeline if args.timeline else 'synthétique'})")
+    print(f"{'Modèle':<28}{'top-1':>8}{'top-3':>8}{'p50 µs':>10}{'p99 µs':>10}")
+    for name, label in (("workflows", "Workflows pondérés"), ("markov", "Markov (heure, ordre 2)")):
+        result = results[name]
+        latency = sorted(result['latency'])
+        p50 = statistics.median(latency) * 1e6
+        p99 = latency[int(len(latency) * 0.99) - 1] * 1e6
+        print(f"{label:<28}{result['top1'] / evaluated:>8.1%}{result['top3'] / evaluated:>8.1%}"
+              f"{p50:>10.1f}{p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark du transport HTTP d'OllamaClient : session poolée vs connexion neuve
+
+Lance un faux serveur Ollama local (HTTP/1.1 keep-alive) et mesure la latence
+p50/p99 de generate_suggestion avec et sans réutilisation des connexions.
+
+Usage: python benchmarks/bench_ollama_pool.py [--requests 500]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import settings
+from src.core.ollama_client import OllamaClient, create_http_session
+
+# Mesurer le transport : chaque appel doit atteindre le serveur
+settings.ollama.cache_enabled = False
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Faux serveur Ollama : répond instantanément à /api/tags et /api/generate"""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def _send_json(self, data: dict):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self._send_json({"models": [{"name": "stub:latest"}]})
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._send_json({"response": "💡 Essaie Ctrl+Shift+T !", "done": True})
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Percentile simple (plus proche rang)"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_client(base_url: str, keep_alive: bool, count: int):
+    """Mesure la latence de `count` suggestions (en ms) et compte les échecs"""
+    session = create_http_session(keep_alive=keep_alive)
+    client = OllamaClient(base_url=base_url, model="stub", session=session)
+    
+    # Échauffement
+    for _ in range(10):
+        client.generate_suggestion("Chrome", "Navigation web")
+    
+    latencies = []
+    errors = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        client.generate_suggestion("Chrome", "Navigation web")
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        if client.available:
+            latencies.append(elapsed)
+        else:
+            # Connexion coupée par le serveur stub : on la compte et on se reconnecte
+            errors += 1
+            client.check_connection()
+    
+    session.close()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    print(f"🧪 Serveur stub: {base_url} - {args.requests} requêtes par mode")
+    print(f"{'Mode':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}{'moy (ms)':>10}{'erreurs':>9}")
+    
+    for label, keep_alive in (("Sans pool (close)", False), ("Pool keep-alive", True)):
+        latencies, errors = run_client(base_url, keep_alive, args.requests)
+        print(f"{label:<22}"
+              f"{percentile(latencies, 50):>10.3f}"
+              f"{percentile(latencies, 99):>10.3f}"
+              f"{statistics.mean(latencies):>10.3f}"
+              f"{errors:>9}")
+    
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark du scan des processus : balayage complet vs scanner incrémental
+
+Table de processus synthétique (600 processus, quelques créations/fins par
+passage). Chaque lecture d'attribut coûte `--read-us` microsecondes, pour
+simuler la lecture de /proc ou l'appel système correspondant.
+Avec `--real`, compare aussi les deux approches sur la table réelle (psutil).
+
+Usage: python benchmarks/bench_process_scan.py [--processes 600] [--scans 200] [--real]
+"""
+
+import argparse
+import contextlib
+import random
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import psutil
+
+from src.core.process_scanner import ProcessScanner
+from src.core.system_monitor import SystemMonitor
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+CpuTimes = namedtuple("CpuTimes", "user system")
+
+INTERESTING = ['chrome.exe', 'code.exe', 'slack.exe', 'spotify.exe', 'winword.exe']
+
+
+class SyntheticTable:
+    """Table de processus simulée, avec un coût fixe par lecture"""
+    
+    def __init__(self, size: int, read_us: float, seed: int = 42):
+        self.read_cost = read_us / 1e6
+        self.random = random.Random(seed)
+        self.next_pid = 1000
+        self.processes = {}
+        self.reads = 0
+        for i in range(size):
+            self.spawn(INTERESTING[i % len(INTERESTING)] if i % 40 == 0 else f"daemon{i}")
+    
+    def spawn(self, name: str):
+        self.processes[self.next_pid] = (name, time.time())
+        self.next_pid += 1
+    
+    def churn(self, count: int):
+        """Termine et crée `count` processus non intéressants"""
+        for pid in self.random.sample(list(self.processes), count):
+            if not self.processes[pid][0].endswith(".exe"):
+                del self.processes[pid]
+                self.spawn(f"worker{self.next_pid}")
+    
+    def read(self):
+        self.reads += 1
+        deadline = time.perf_counter() + self.read_cost
+        while time.perf_counter() < deadline:
+            pass
+    
+    def pids(self):
+        self.read()
+        return list(self.processes)
+    
+    def process(self, pid: int):
+        if pid not in self.processes:
+            raise psutil.NoSuchProcess(pid)
+        return SyntheticProcess(self, pid)
+
+
+class SyntheticProcess:
+    def __init__(self, table: SyntheticTable, pid: int):
+        self.table = table
+        self.pid = pid
+        self._create_time = table.processes[pid][1]
+    
+    def oneshot(self):
+        return contextlib.nullcontext()
+    
+    def name(self):
+        self.table.read()
+        return self.table.processes[self.pid][0]
+    
+    def create_time(self):
+        return self._create_time
+    
+    def memory_info(self):
+        self.table.read()
+        return MemoryInfo(200 * 1024 * 1024, 0)
+    
+    def cpu_times(self):
+        self.table.read()
+        return CpuTimes(0.0, 0.0)
+    
+    def is_running(self):
+        self.table.read()
+        current = self.table.processes.get(self.pid)
+        return current is not None and current[1] == self._create_time
+
+
+def full_sweep(table: SyntheticTable, should_monitor) -> list:
+    """Équivalent de l'ancien `psutil.process_iter([...])` : tout relire à chaque passage"""
+    results = []
+    for pid in table.pids():
+        process = table.process(pid)
+        name = process.name().lower()
+        table.read()  # create_time
+        table.read()  # cpu_percent
+        memory_info = process.memory_info()
+        if should_monitor(name):
+            results.append({'pid': pid, 'name': name, 'memory_info': memory_info})
+    return results
+
+
+def run_synthetic(processes: int, scans: int, read_us: float, churn: int):
+    should_monitor = SystemMonitor(lambda app, context: None)._should_monitor
+    
+    print(f"🧪 Table synthétique: {processes} processus, {scans} passages, "
+          f"{read_us:.0f} µs/lecture, {churn} processus remplacés par passage")
+    print(f"{'Mode':<14}{'ms/passage':>12}{'lectures/passage':>18}")
+    
+    for label in ("complet", "incrémental"):
+        table = SyntheticTable(processes, read_us)
+        scanner = ProcessScanner(should_monitor, pids_func=table.pids, process_factory=table.process)
+        found = 0
+        
+        start = time.perf_counter()
+        for _ in range(scans):
+            table.churn(churn)
+            if label == "complet":
+                found = len(full_sweep(table, should_monitor))
+            else:
+                found = len(scanner.scan())
+        elapsed = time.perf_counter() - start
+        
+        print(f"{label:<14}{elapsed / scans * 1000:>12.2f}{table.reads / scans:>18.1f}"
+              f"   ({found} processus intéressants)")
+
+
+def run_real(scans: int):
+    """Compare les deux approches sur la table de processus de cette machine"""
+    should_monitor = SystemMonitor(lambda app, context: None)._should_monitor
+    print(f"\n🖥️ Table réelle: {len(psutil.pids())} processus, {scans} passages")
+    
+    start = time.perf_counter()
+    for _ in range(scans):
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'create_time', 'memory_info']):
+            should_monitor((proc.info['name'] or "").lower())
+    print(f"{'process_iter':<14}{(time.perf_counter() - start) / scans * 1000:>12.2f} ms/passage")
+    
+    scanner = ProcessScanner(should_monitor)
+    start = time.perf_counter()
+    for _ in range(scans):
+        scanner.scan()
+    print(f"{'incrémental':<14}{(time.perf_counter() - start) / scans * 1000:>12.2f} ms/passage")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=600)
+    parser.add_argument("--scans", type=int, default=200)
+    parser.add_argument("--read-us", type=float, default=10.0)
+    parser.add_argument("--churn", type=int, default=3)
+    parser.add_argument("--real", action="store_true")
+    args = parser.parse_args()
+    
+    run_synthetic(args.processes, args.scans, args.read_us, args.churn)
+    if args.real:
+        run_real(args.scans)
+
+
+if __name__ == "__main__":
+    main()
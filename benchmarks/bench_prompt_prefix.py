@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'évaluation du prompt par Ollama (prompt_eval_count / prompt_eval_duration)
+
+Compare trois constructions du prompt sur une rotation d'applications :
+- ancien : application et contexte avant les exemples (préfixe variable)
+- préfixe : préfixe de catégorie stable, prompt complet (cache KV côté serveur)
+- context : préfixe amorcé une fois, seuls les tokens du suffixe sont envoyés
+
+Nécessite un serveur Ollama avec le modèle configuré.
+
+Usage: python benchmarks/bench_prompt_prefix.py [--rounds 5]
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config.settings import settings
+from src.core.ollama_client import CATEGORY_EXAMPLES, OllamaClient
+
+# Chaque appel doit atteindre Ollama
+settings.ollama.cache_enabled = False
+
+APPS = [
+    ("Chrome", "Navigation web"),
+    ("Firefox", "Recherche documentation"),
+    ("Code", "Édition Python"),
+    ("Word", "Rédaction rapport"),
+    ("Teams", "Réunion d'équipe"),
+]
+
+
+def legacy_prompt(app_name: str, context: str, category: str) -> str:
+    """Prompt avant restructuration (application en tête, puis exemples)"""
+    base_prompt = f"""Tu es un assistant de productivité qui aide l'utilisateur selon son contexte actuel.
+
+Application: {app_name}
+Catégorie: {category}
+Contexte: {context}
+
+Donne UN conseil pratique et spécifique (1-2 phrases maximum) pour cette situation.
+"""
+    return base_prompt + CATEGORY_EXAMPLES.get(category, "") + "\nRéponds avec un émoji et un conseil court:"
+
+
+def run_mode(label: str, rounds: int, legacy: bool, context_reuse: bool):
+    """Génère `rounds` fois pour chaque application et affiche les métriques de prompt"""
+    settings.ollama.prompt_context_reuse = context_reuse
+    client = OllamaClient()
+    if not client.available:
+        sys.exit("❌ Ollama non accessible - benchmark impossible")
+    
+    if legacy:
+        client._create_contextual_prompt = legacy_prompt
+    
+    client.warm_up()
+    # Amorçage hors mesure : on compare les générations à régime établi
+    for app_name, context in APPS:
+        client.generate_suggestion(app_name, context)
+    
+    client.prompt_stats.update(requests=0, prompt_eval_count=0, prompt_eval_ms=0.0)
+    latencies = []
+    for _ in range(rounds):
+        for app_name, context in APPS:
+            before = client.prompt_stats['prompt_eval_ms']
+            client.generate_suggestion(app_name, context)
+            latencies.append(client.prompt_stats['prompt_eval_ms'] - before)
+    
+    stats = client.prompt_stats
+    requests_count = max(stats['requests'], 1)
+    print(f"{label:<12}"
+          f"{stats['prompt_eval_count'] / requests_count:>14.1f}"
+          f"{stats['prompt_eval_ms'] / requests_count:>14.1f}"
+          f"{statistics.median(latencies):>14.1f}")
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"🧪 Modèle {settings.ollama.model} - {args.rounds} tours de {len(APPS)} applications")
+    print(f"{'Prompt':<12}{'tokens/appel':>14}{'moy (ms)':>14}{'médiane (ms)':>14}")
+    
+    run_mode("ancien", args.rounds, legacy=True, context_reuse=False)
+    run_mode("préfixe", args.rounds, legacy=False, context_reuse=False)
+    run_mode("context", args.rounds, legacy=False, context_reuse=True)
+
+
+if __name__ == "__main__":
+    main()
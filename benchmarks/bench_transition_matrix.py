@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark des requêtes de workflows : liste de transitions vs matrice incrémentale
+
+Compare l'ancien `get_common_workflows` (filtrage de toutes les transitions
+des 7 derniers jours puis comptage, à chaque appel) à la matrice de
+transitions pondérées de UserLearningEngine, sur `--transitions` transitions
+réparties sur 60 jours entre 30 applications.
+
+Usage: python benchmarks/bench_transition_matrix.py [--transitions 100000] [--queries 50]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+APPS = [f"App{i}" for i in range(30)]
+
+
+def legacy_get_common_workflows(app_transitions: list) -> dict:
+    """Ancienne implémentation de UserLearningEngine.get_common_workflows"""
+    workflows = {}
+    
+    week_ago = time.time() - (86400 * 7)
+    recent_transitions = [t for t in app_transitions 
+                        if t['timestamp'] > week_ago]
+    
+    for transition in recent_transitions:
+        from_app = transition['from']
+        to_app = transition['to']
+        
+        if from_app not in workflows:
+            workflows[from_app] = []
+        workflows[from_app].append(to_app)
+    
+    for app in list(workflows.keys()):
+        app_counts = {}
+        for target in workflows[app]:
+            app_counts[target] = app_counts.get(target, 0) + 1
+        
+        frequent_targets = [app for app, count in app_counts.items() if count >= 3]
+        if frequent_targets:
+            workflows[app] = frequent_targets
+        else:
+            del workflows[app]
+    
+    return workflows
+
+
+def generate(count: int, seed: int = 42) -> list:
+    """Transitions (depuis, vers, horodatage) : chaque application a quelques suites habituelles"""
+    rng = random.Random(seed)
+    habits = {app: rng.sample(APPS, 3) for app in APPS}
+    start = time.time() - 60 * 86400
+    step = 60 * 86400 / count
+    transitions, current = [], APPS[0]
+    for i in range(count):
+        following = rng.choice(habits[current]) if rng.random() < 0.8 else rng.choice(APPS)
+        if following != current:
+            transitions.append((current, following, start + i * step))
+            current = following
+    return transitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transitions", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    
+    transitions = generate(args.transitions)
+    legacy = [{'from': f, 'to': t, 'timestamp': ts, 'hour': time.localtime(ts).tm_hour}
+              for f, t, ts in transitions]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        timeline = UsageTimeline(directory, flush_every=10 ** 9, flush_age=float('inf'))
+        for from_app, to_app, timestamp in transitions:
+            timeline.record_focus(to_app, timestamp)
+        
+        start = time.perf_counter()
+        engine = UserLearningEngine(str(Path(directory) / "patterns.json"), timeline=timeline)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            legacy_get_common_workflows(legacy)
+        legacy_ms = (time.perf_counter() - start) * 1000 / args.queries
+        
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            engine.get_common_workflows()
+        workflows_ms = (time.perf_counter() - start) * 1000 / args.queries
+        
+        start = time.perf_counter()
+        for i in range(args.queries):
+            engine.get_next_apps(APPS[i % len(APPS)])
+        next_apps_us = (time.perf_counter() - start) * 1e6 / args.queries
+        
+        start = time.perf_counter()
+        for i in range(1000):
+            engine._count_transition(APPS[i % 30], APPS[(i + 1) % 30], time.time())
+        record_us = (time.perf_counter() - start) * 1e6 / 1000
+    
+    print(f"🧪 {len(transitions)} transitions, {len(APPS)} applications, {args.queries} requêtes")
+    print(f"{'Opération':<44}{'temps':>12}")
+    print(f"{'get_common_workflows (ancien, liste)':<44}{legacy_ms:>9.2f} ms")
+    print(f"{'get_common_workflows (matrice)':<44}{workflows_ms:>9.2f} ms")
+    print(f"{'get_next_apps (par changement d app)':<44}{next_apps_us:>9.1f} µs")
+    print(f"{'enregistrement d une transition':<44}{record_us:>9.1f} µs")
+    print(f"{'reconstruction au démarrage':<44}{rebuild_ms:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark des requêtes par plage de temps sur la chronologie d'utilisation
+
+Génère plusieurs mois d'intervalles de focus (journées de travail, changement
+d'application toutes les quelques minutes) puis compare « temps passé dans
+VS Code cette semaine » par parcours d'une liste de dicts (forme de l'ancien
+historique JSON) et par `UsageTimeline.time_in` (cumuls journaliers).
+
+Usage: python benchmarks/bench_usage_timeline.py [--days 180] [--queries 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter la racine du projet au path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.usage_timeline import UsageTimeline
+
+APPS = ["VS Code", "Chrome", "Slack", "Terminal", "Spotify", "Firefox", "Word"]
+
+
+def generate(timeline: UsageTimeline, days: int, seed: int = 42) -> list:
+    """Remplit la chronologie et retourne les mêmes intervalles sous forme de dicts"""
+    rng = random.Random(seed)
+    first_day = datetime(2026, 1, 5)
+    for day in range(days):
+        t = (first_day + timedelta(days=day, hours=8)).timestamp()
+        day_end = t + 9 * 3600
+        while t < day_end:
+            timeline.record_focus(rng.choice(APPS), t)
+            t += rng.expovariate(1 / 240)
+        timeline.close(t)
+    return [{'app': app, 'start': start, 'end': end} for app, start, end in timeline.intervals()]
+
+
+def legacy_time_in(records: list, app_name: str, start: float, end: float) -> float:
+    return sum(
+        max(0.0, min(end, r['end']) - max(start, r['start']))
+        for r in records if r['app'] == app_name
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        timeline = UsageTimeline(directory, flush_every=10 ** 9, flush_age=float('inf'))
+        records = generate(timeline, args.days)
+        
+        start = time.perf_counter()
+        timeline.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        reloaded = UsageTimeline(directory)
+        reloaded.load()
+        load_ms = (time.perf_counter() - start) * 1000
+        size = (Path(directory) / "timeline.bin").stat().st_size
+    
+    rng = random.Random(1)
+    first, last = records[0]['start'], records[-1]['end']
+    weeks = [rng.uniform(first, last - 7 * 86400) for _ in range(args.queries)]
+    
+    start = time.perf_counter()
+    expected = [legacy_time_in(records, "VS Code", w, w + 7 * 86400) for w in weeks]
+    legacy_ms = (time.perf_counter() - start) * 1000 / args.queries
+    
+    start = time.perf_counter()
+    results = [timeline.time_in("VS Code", w, w + 7 * 86400) for w in weeks]
+    timeline_ms = (time.perf_counter() - start) * 1000 / args.queries
+    
+    assert all(abs(a - b) < 1e-3 for a, b in zip(expected, results))
+    
+    print(f"🧪 {args.days} jours, {len(records)} intervalles "
+          f"({size / 1024:.0f} Ko sur disque, écriture {flush_ms:.1f} ms, chargement {load_ms:.1f} ms)")
+    print(f"{'Requête « VS Code cette semaine »':<36}{'ms/requête':>12}")
+    print(f"{'liste de dicts (ancien)':<36}{legacy_ms:>12.3f}")
+    print(f"{'UsageTimeline':<36}{timeline_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,9 @@ main_vocal.py - Assistant IA avec commandes vocales intégrées
 
 import sys
 import time
+import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Ajouter src au path
@@ -19,6 +21,7 @@ from vision.screen_capture import screen_capture
 from control.mouse_controller import mouse_controller
 from control.keyboard_controller import keyboard_controller
 from utils.voice_engine import voice_engine
+from utils.event_loop import shared_event_loop
 
 
 class VoiceAssistant:
@@ -29,20 +32,42 @@ class VoiceAssistant:
         self.voice_active = False
         self.command_history = []
         
+        # Les commandes (souris, clavier, capture : bloquantes) s'exécutent une par une,
+        # dans l'ordre de réception, sur un thread dédié coordonné par la boucle partagée
+        self._command_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-actions")
+        
         # Configuration vocale
         self.setup_voice_engine()
         print("🎤 Assistant vocal initialisé")
     
     def setup_voice_engine(self):
         """Configure le moteur de commandes vocales"""
-        voice_command_engine.command_callback = self.handle_voice_command
+        voice_command_engine.command_callback = self.dispatch_voice_command
         
         # Configuration personnalisée
         voice_command_engine.wake_word = "assistant"
         voice_command_engine.language = "fr-FR"
         voice_command_engine.timeout = 3
     
-    def handle_voice_command(self, command: str):
+    def dispatch_voice_command(self, command: str):
+        """Confie la commande à la boucle partagée (le thread de reconnaissance n'attend pas)"""
+        shared_event_loop.submit(
+            self._handle_voice_command_async(command),
+            lambda success: self._show_command_result(command, success)
+        )
+    
+    async def _handle_voice_command_async(self, command: str) -> bool:
+        """Exécute la commande sur le thread d'actions (pas de thread créé par commande)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._command_executor, self.handle_voice_command, command)
+    
+    def _show_command_result(self, command: str, success: bool):
+        """Affiche le résultat dans la bulle (appelé dans le thread Tk)"""
+        if self.main_window and self.main_window.speech_bubble:
+            status = "✅ Action réalisée" if success else "❌ Action non réalisée"
+            self.main_window.speech_bubble.update_text(f"🎤 {command}\n\n{status}")
+    
+    def handle_voice_command(self, command: str) -> bool:
         """Traite une commande vocale reconnue"""
         print(f"[ASSISTANT] 🎯 Commande reçue: '{command}'")
         
@@ -64,7 +89,7 @@ class VoiceAssistant:
             if voice_engine.available:
                 voice_engine.speak("Je n'ai pas compris cette commande")
             print("❌ Commande non reconnue")
-            return
+            return False
         
         # Prendre la meilleure action
         best_action = actions[0]
@@ -76,7 +101,7 @@ class VoiceAssistant:
             if voice_engine.available:
                 voice_engine.speak(f"Action non autorisée: {msg}")
             print(f"⚠️ Action bloquée: {msg}")
-            return
+            return False
         
         # Annoncer l'exécution
         if voice_engine.available:
@@ -93,6 +118,8 @@ class VoiceAssistant:
             if voice_engine.available:
                 voice_engine.speak("Échec de l'action")
             print("❌ Action échouée")
+        
+        return success
     
     def execute_action(self, action) -> bool:
         """Exécute une action parsée"""
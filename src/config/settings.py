@@ -3,7 +3,7 @@ Configuration settings for AI Assistant
 """
 
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 
@@ -15,6 +15,53 @@ class OllamaConfig:
     timeout: int = 15
     max_tokens: int = 100
     temperature: float = 0.7
+    stream: bool = True  # Affichage progressif de la réponse (NDJSON)
+    max_concurrent_generations: int = 1  # Générations simultanées envoyées à Ollama
+    prompt_context_reuse: bool = True  # Réutiliser les tokens `context` du préfixe de catégorie
+    
+    # Transport HTTP (session poolée avec keep-alive)
+    pool_connections: int = 2  # Nombre d'hôtes gardés en cache
+    pool_maxsize: int = 4  # Connexions réutilisables par hôte
+    http_keep_alive: bool = True
+    
+    # Timeouts par endpoint (secondes) - `timeout` reste celui de /api/generate
+    connect_timeout: float = 2.0
+    tags_timeout: float = 3.0
+    models_timeout: float = 5.0
+    test_timeout: float = 10.0
+    
+    # Timeout adaptatif de /api/generate : percentile des latences observées x facteur,
+    # borné entre `adaptive_timeout_min` et `timeout`
+    adaptive_timeout_enabled: bool = True
+    adaptive_timeout_min: float = 3.0
+    adaptive_timeout_percentile: float = 0.95
+    adaptive_timeout_factor: float = 2.0
+    
+    # Disjoncteur : échec immédiat quand Ollama est surchargé ou injoignable
+    breaker_failure_threshold: int = 3  # Échecs consécutifs avant ouverture
+    breaker_base_backoff: float = 2.0  # Premier délai avant nouvel essai (secondes)
+    breaker_max_backoff: float = 120.0  # Délai maximal (backoff exponentiel)
+    
+    # Cache des suggestions (clé: modèle, application, catégorie, version du prompt)
+    cache_enabled: bool = True
+    cache_max_entries: int = 128
+    cache_ttl: int = 3600  # secondes
+    cache_file: Optional[str] = "suggestion_cache.json"  # None = pas de persistance
+    
+    # Préchargement des suggestions pour les prochaines applications probables
+    prefetch_enabled: bool = True
+    prefetch_max_apps: int = 2
+    
+    # Chargement du modèle (warm-up au démarrage + ping keep-alive)
+    warmup_enabled: bool = True
+    keep_alive: str = "30m"  # Durée de maintien du modèle en mémoire côté Ollama
+    keepalive_ping_interval: int = 600  # secondes (0 = pas de ping)
+    active_hours_start: int = 8  # Heures actives par défaut (si rien n'a été appris)
+    active_hours_end: int = 19
+    
+    # Métriques des générations (fenêtre glissante, export JSON pour les tableaux de bord)
+    metrics_window: int = 200  # Dernières générations prises en compte par modèle
+    metrics_file: Optional[str] = "llm_metrics.json"  # None = pas d'export
 
 
 @dataclass
@@ -34,8 +81,42 @@ class UIConfig:
 @dataclass
 class MonitoringConfig:
     """Configuration surveillance système"""
-    check_interval: int = 5  # secondes
+    check_interval: int = 5  # secondes (intervalle fixe si adaptive_interval est désactivé)
+    
+    # Intervalle adaptatif : min_check_interval après un changement, puis x interval_backoff
+    # à chaque scan sans changement, jusqu'à max_check_interval. Sans X11, seul le
+    # polling voit un changement d'application : max_check_interval borne la latence
+    # de détection et ne doit pas dépasser l'ancien intervalle fixe (check_interval)
+    adaptive_interval: bool = True
+    min_check_interval: float = 0.5
+    max_check_interval: float = 5.0
+    interval_backoff: float = 1.5
+    
+    # Anti-rebond : un changement d'application n'est transmis que si la nouvelle
+    # application reste en tête debounce_dwell_time secondes, ou la dépasse d'au
+    # moins debounce_score_margin points de score
+    debounce_dwell_time: float = 1.5
+    # Fenêtre active X11 (événement certain) : délai court, contre les seuls Alt-Tab
+    debounce_focus_dwell_time: float = 0.2
+    debounce_score_margin: float = 15.0
     score_memory_threshold: int = 50  # MB pour le score
+    score_cpu_threshold: float = 20.0  # % CPU (entre deux scans) donnant le score CPU maximal
+    focus_backend: str = "auto"  # auto | x11 | psutil (x11 : fenêtre active, sans polling)
+    app_index_file: Optional[str] = None  # JSON de noms d'applications supplémentaires
+    history_max_pids: int = 256  # Processus gardés dans l'historique de score (éviction LRU)
+    history_ring_size: int = 10  # Passages mémorisés par processus
+    timeline_dir: str = "usage_timeline"  # Chronologie des intervalles de focus
+    record_file: Optional[str] = None  # Enregistre la session (JSONL rejouable par ReplayBackend)
+    
+    # Empreinte de l'assistant lui-même (échantillons gardés : samples x interval)
+    self_monitor_enabled: bool = True
+    self_monitor_interval: float = 5.0  # secondes
+    self_monitor_samples: int = 720  # 1 h
+    self_monitor_file: str = "self_monitor.json"
+    alarm_rss_mb: float = 300.0
+    alarm_cpu_percent: float = 25.0  # Moyenne entre deux échantillons
+    alarm_threads: int = 64
+    alarm_open_fds: int = 256
     
     # Processus à ignorer
     ignored_processes: List[str] = None
@@ -49,6 +130,24 @@ class MonitoringConfig:
             ]
 
 
+@dataclass
+class LearningConfig:
+    """Configuration apprentissage des habitudes"""
+    data_file: str = "user_patterns.json"  # Instantané (journal : user_patterns.journal)
+    snapshot_every: int = 500  # Événements journalisés entre deux instantanés
+    # json : données en mémoire (journal + instantané) ; sqlite : base user_patterns.db,
+    # historique complet en mémoire constante
+    backend: str = "json"
+    predictor_window_days: int = 90  # sqlite : historique agrégé pour le prédicteur au démarrage
+    
+    # Écritures disque en arrière-plan (thread learning-writer) : lot écrit dès
+    # writer_batch_size éléments ou après writer_flush_interval secondes ; au-delà
+    # de writer_queue_size éléments en attente, les écritures sont abandonnées
+    writer_queue_size: int = 1000
+    writer_batch_size: int = 100
+    writer_flush_interval: float = 1.0
+
+
 @dataclass
 class AppSettings:
     """Configuration principale de l'application"""
@@ -56,6 +155,7 @@ class AppSettings:
     ollama: OllamaConfig = None
     ui: UIConfig = None
     monitoring: MonitoringConfig = None
+    learning: LearningConfig = None
     
     # Paramètres généraux
     debug_mode: bool = False
@@ -69,6 +169,8 @@ class AppSettings:
             self.ui = UIConfig()
         if self.monitoring is None:
             self.monitoring = MonitoringConfig()
+        if self.learning is None:
+            self.learning = LearningConfig()
 
 
 # Instance globale des paramètres
@@ -81,6 +183,12 @@ def load_settings_from_env():
     settings.ollama.base_url = os.getenv("OLLAMA_BASE_URL", settings.ollama.base_url)
     settings.ollama.model = os.getenv("OLLAMA_MODEL", settings.ollama.model)
     settings.ollama.timeout = int(os.getenv("OLLAMA_TIMEOUT", settings.ollama.timeout))
+    settings.ollama.stream = os.getenv("OLLAMA_STREAM", str(settings.ollama.stream)).lower() == "true"
+    settings.ollama.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", settings.ollama.keep_alive)
+    settings.ollama.pool_maxsize = int(os.getenv("OLLAMA_POOL_MAXSIZE", settings.ollama.pool_maxsize))
+    settings.ollama.http_keep_alive = os.getenv(
+        "OLLAMA_HTTP_KEEP_ALIVE", str(settings.ollama.http_keep_alive)
+    ).lower() == "true"
     
     # UI
     settings.ui.window_width = int(os.getenv("UI_WINDOW_WIDTH", settings.ui.window_width))
@@ -88,6 +196,11 @@ def load_settings_from_env():
     
     # Monitoring
     settings.monitoring.check_interval = int(os.getenv("MONITOR_INTERVAL", settings.monitoring.check_interval))
+    settings.monitoring.focus_backend = os.getenv("MONITOR_FOCUS_BACKEND", settings.monitoring.focus_backend)
+    settings.monitoring.record_file = os.getenv("MONITOR_RECORD_FILE", settings.monitoring.record_file)
+    
+    # Apprentissage
+    settings.learning.backend = os.getenv("LEARNING_BACKEND", settings.learning.backend)
     
     # Debug
     settings.debug_mode = os.getenv("DEBUG", "false").lower() == "true"
@@ -0,0 +1,157 @@
+"""
+Anti-rebond des changements d'application (hystérésis entre détection et callback)
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class AppChangeDebouncer:
+    """
+    Filtre les changements d'application avant le callback de l'interface
+    
+    Chaque changement transmis déclenche une génération LLM, une phrase de
+    synthèse vocale et une transition d'apprentissage : une application qui
+    n'est en tête que le temps d'un scan ne doit pas passer.
+    
+    Une nouvelle application est retenue :
+    - immédiatement si son score dépasse celui de l'application courante d'au
+      moins `score_margin` (ou si l'application courante a disparu)
+    - sinon après être restée en tête pendant `dwell_time` secondes
+    
+    Les changements de fenêtre active (X11) ne sont pas des estimations de
+    score : ils n'attendent que `focus_dwell_time`, juste assez pour ignorer
+    les fenêtres traversées par Alt-Tab.
+    
+    Un candidat abandonné avant la fin du délai compte comme un rebond évité.
+    """
+    
+    def __init__(self, dwell_time: float, score_margin: float,
+                 focus_dwell_time: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.dwell_time = dwell_time
+        self.focus_dwell_time = dwell_time if focus_dwell_time is None else focus_dwell_time
+        self.score_margin = score_margin
+        self._clock = clock
+        
+        self.current: Optional[str] = None
+        self.pending: Optional[str] = None
+        self.pending_since = 0.0
+        
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        
+        self.stats = {
+            'observations': 0,
+            'changes': 0,
+            'immediate': 0,     # Changements retenus grâce à la marge de score
+            'after_dwell': 0,   # Changements retenus après le délai
+            'suppressed': 0     # Rebonds évités (autant d'appels LLM économisés)
+        }
+    
+    def observe(self, app_name: str, lead: Optional[float] = None, now: float = None) -> bool:
+        """
+        Application en tête au dernier scan
+        
+        Args:
+            app_name: Application détectée
+            lead: Avance de score sur l'application courante (inf si elle a
+                disparu, None si inconnue)
+        
+        Returns:
+            True si le changement doit être transmis au callback
+        """
+        now = self._clock() if now is None else now
+        with self._lock:
+            self.stats['observations'] += 1
+            
+            if app_name == self.current:
+                self._drop_pending()
+                return False
+            
+            if self.current is None or self.dwell_time <= 0:
+                return self._commit(app_name, None)
+            
+            if lead is not None and lead >= self.score_margin:
+                return self._commit(app_name, 'immediate')
+            
+            if app_name != self.pending:
+                self._drop_pending()
+                self.pending = app_name
+                self.pending_since = now
+            
+            if now - self.pending_since >= self.dwell_time:
+                return self._commit(app_name, 'after_dwell')
+            return False
+    
+    def defer(self, app_name: str, action: Callable[[], None]):
+        """
+        Variante événementielle (fenêtre active X11) : `action` est appelée si
+        `app_name` est toujours la dernière application signalée après `focus_dwell_time`
+        """
+        with self._lock:
+            self.stats['observations'] += 1
+            self._cancel_timer()
+            
+            if app_name == self.current:
+                self._drop_pending()
+                return
+            
+            if self.current is None or self.focus_dwell_time <= 0:
+                self._commit(app_name, None)
+                commit_now = True
+            else:
+                self._drop_pending()
+                self.pending = app_name
+                self.pending_since = self._clock()
+                self._timer = threading.Timer(self.focus_dwell_time, self._fire, args=(app_name, action))
+                self._timer.daemon = True
+                self._timer.start()
+                commit_now = False
+        
+        if commit_now:
+            action()
+    
+    def _fire(self, app_name: str, action: Callable[[], None]):
+        with self._lock:
+            if self.pending != app_name:
+                return
+            self._timer = None
+            self._commit(app_name, 'after_dwell')
+        action()
+    
+    def _commit(self, app_name: str, reason: Optional[str]) -> bool:
+        self.current = app_name
+        self.pending = None
+        self.stats['changes'] += 1
+        if reason:
+            self.stats[reason] += 1
+        return True
+    
+    def _drop_pending(self):
+        if self.pending is not None:
+            self.pending = None
+            self.stats['suppressed'] += 1
+    
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def cancel(self):
+        """Abandonne le changement en attente (arrêt de la surveillance)"""
+        with self._lock:
+            self._cancel_timer()
+            self.pending = None
+    
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            changes = self.stats['changes']
+            suppressed = self.stats['suppressed']
+            return {
+                **self.stats,
+                'pending': self.pending,
+                # Part des changements candidats qui étaient des rebonds
+                'flap_rate': suppressed / (changes + suppressed) if changes + suppressed else 0.0
+            }
@@ -0,0 +1,444 @@
+"""
+Client asyncio pour l'API Ollama (sans thread par requête)
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+from urllib.parse import urlsplit
+
+from ..config.settings import settings
+from ..utils.app_mapper import app_mapper
+from .ollama_client import OllamaClientBase
+from .suggestion_cache import SuggestionCache
+
+
+class AsyncHTTPError(Exception):
+    """Réponse HTTP invalide ou connexion interrompue"""
+
+
+class _AsyncResponse:
+    """Réponse HTTP/1.1 lue au fil de l'eau (Content-Length ou chunked)"""
+    
+    def __init__(self, client: "AsyncOllamaClient", reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                 read_timeout: float):
+        self._client = client
+        self._reader = reader
+        self._writer = writer
+        self.status = status
+        self.headers = headers
+        self._read_timeout = read_timeout
+        self._chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        self._remaining = int(headers.get("content-length", 0))
+        self._consumed = False
+        self._released = False
+    
+    async def _read(self, coro):
+        return await asyncio.wait_for(coro, self._read_timeout)
+    
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Itère sur le reste du corps de la réponse (reprend là où la lecture s'est arrêtée)"""
+        while not self._consumed:
+            if self._chunked:
+                size_line = await self._read(self._reader.readline())
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailers éventuels jusqu'à la ligne vide
+                    while (await self._read(self._reader.readline())).strip():
+                        pass
+                    self._consumed = True
+                    break
+                data = await self._read(self._reader.readexactly(size))
+                await self._read(self._reader.readexactly(2))
+            else:
+                if self._remaining <= 0:
+                    self._consumed = True
+                    break
+                data = await self._read(self._reader.read(min(self._remaining, 65536)))
+                if not data:
+                    raise AsyncHTTPError("Connexion fermée pendant la réponse")
+                self._remaining -= len(data)
+            yield data
+    
+    async def iter_lines(self) -> AsyncIterator[bytes]:
+        """Itère sur les lignes du corps (NDJSON)"""
+        buffer = b""
+        async for data in self.iter_chunks():
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line
+        if buffer:
+            yield buffer
+    
+    async def read(self) -> bytes:
+        return b"".join([data async for data in self.iter_chunks()])
+    
+    async def json(self) -> Any:
+        return json.loads(await self.read())
+    
+    def release(self):
+        """Rend la connexion au pool si la réponse a été lue entièrement"""
+        if self._released:
+            return
+        self._released = True
+        
+        reusable = self._consumed and self.headers.get("connection", "").lower() != "close"
+        self._client._release_connection(self._reader, self._writer, reusable)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class AsyncOllamaClient(OllamaClientBase):
+    """
+    Client asyncio pour Ollama, même interface que OllamaClient
+    
+    - connexions keep-alive réutilisées (pool de `pool_maxsize` connexions)
+    - au plus `max_concurrent_generations` générations simultanées (sémaphore)
+    - annuler la tâche qui attend une génération ferme la connexion, ce qui
+      interrompt la génération côté Ollama
+    
+    La connexion n'est pas vérifiée dans le constructeur : appeler
+    `await client.check_connection()`. Utilisé par l'interface sur la boucle
+    partagée (shared_event_loop), via GenerationScheduler.
+    """
+    
+    def __init__(self, base_url: str = None, model: str = None,
+                 cache: Optional[SuggestionCache] = None, max_concurrent: int = None):
+        super().__init__(base_url, model, cache)
+        
+        url = urlsplit(self.base_url)
+        self._host = url.hostname or "localhost"
+        self._port = url.port or (443 if url.scheme == "https" else 80)
+        self._ssl = url.scheme == "https"
+        
+        self.max_concurrent = max_concurrent or settings.ollama.max_concurrent_generations
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle_connections: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    
+    # === Transport HTTP ===
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Sémaphore de concurrence (créé dans la boucle qui l'utilise)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+    
+    async def _acquire_connection(self, reuse: bool = True) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Retourne (reader, writer, réutilisée) : connexion du pool ou nouvelle connexion"""
+        while reuse and self._idle_connections:
+            reader, writer = self._idle_connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port, ssl=self._ssl or None),
+            settings.ollama.connect_timeout
+        )
+        return reader, writer, False
+    
+    def _release_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             reusable: bool):
+        if reusable and len(self._idle_connections) < settings.ollama.pool_maxsize:
+            self._idle_connections.append((reader, writer))
+        else:
+            writer.close()
+    
+    async def _request(self, method: str, path: str, payload: Dict[str, Any] = None,
+                       read_timeout: float = None) -> _AsyncResponse:
+        """Envoie une requête HTTP/1.1 et lit les en-têtes de la réponse"""
+        read_timeout = read_timeout or settings.ollama.timeout
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self._host}:{self._port}",
+            "Accept: application/json",
+            f"Content-Length: {len(body)}"
+        ]
+        if payload is not None:
+            head.append("Content-Type: application/json")
+        if not settings.ollama.http_keep_alive:
+            head.append("Connection: close")
+        
+        request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+        
+        reader, writer, reused = await self._acquire_connection()
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), read_timeout)
+            
+            if not status_line and reused:
+                # Connexion keep-alive fermée par le serveur entre-temps : en ouvrir une neuve
+                writer.close()
+                reader, writer, _ = await self._acquire_connection(reuse=False)
+                writer.write(request)
+                await writer.drain()
+                status_line = await asyncio.wait_for(reader.readline(), read_timeout)
+            
+            if not status_line:
+                raise AsyncHTTPError("Connexion fermée par le serveur")
+            status = int(status_line.split()[1])
+            
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), read_timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            
+            return _AsyncResponse(self, reader, writer, status, headers, read_timeout)
+        
+        except BaseException:
+            writer.close()
+            raise
+    
+    async def aclose(self):
+        """Ferme les connexions du pool et persiste le cache"""
+        if self.cache is not None:
+            self.cache.save()
+        while self._idle_connections:
+            _, writer = self._idle_connections.pop()
+            writer.close()
+    
+    # === API Ollama ===
+    
+    async def check_connection(self) -> bool:
+        """Vérifie si Ollama est accessible"""
+        try:
+            async with await self._request("GET", "/api/tags",
+                                           read_timeout=settings.ollama.tags_timeout) as response:
+                await response.read()
+                self.available = response.status == 200
+            
+            if self.available:
+                print("✅ Ollama connecté !")
+                self.last_error = None
+            else:
+                self.last_error = f"HTTP {response.status}"
+                print(f"❌ Ollama non accessible: {self.last_error}")
+        
+        except asyncio.TimeoutError:
+            self.available = False
+            self.last_error = "Timeout de connexion"
+            print("❌ Ollama non accessible: timeout")
+        except (ConnectionError, OSError, AsyncHTTPError):
+            self.available = False
+            self.last_error = "Connexion refusée"
+            print("❌ Ollama non accessible: connexion refusée")
+        except Exception as e:
+            self.available = False
+            self.last_error = str(e)
+            print(f"❌ Erreur connexion Ollama: {e}")
+        
+        if self.available:
+            self.breaker.record_success()
+        else:
+            self._on_connection_lost(self.last_error)
+        
+        return self.available
+    
+    async def _acquire_circuit(self) -> bool:
+        """True si une génération peut être envoyée à Ollama"""
+        if not self.breaker.allow_request():
+            return False
+        
+        # Circuit semi-ouvert après une perte de connexion : vérifier avant de générer
+        return self.available or await self.check_connection()
+    
+    async def get_available_models(self) -> list:
+        """Récupère la liste des modèles disponibles"""
+        if not self.available:
+            return []
+        
+        try:
+            async with await self._request("GET", "/api/tags",
+                                           read_timeout=settings.ollama.models_timeout) as response:
+                data = await response.json()
+                if response.status == 200:
+                    return [model['name'] for model in data.get('models', [])]
+        except Exception as e:
+            print(f"Erreur récupération modèles: {e}")
+        
+        return []
+    
+    async def generate_suggestion(self, app_name: str, context: str) -> str:
+        """Génère une suggestion contextuelle"""
+        suggestion = ""
+        async for suggestion in self.stream_suggestion(app_name, context):
+            pass
+        return suggestion or "🤔 Pas de suggestion pour le moment"
+    
+    async def stream_suggestion(self, app_name: str, context: str) -> AsyncIterator[str]:
+        """
+        Génère une suggestion en streaming (texte nettoyé cumulé à chaque chunk)
+        
+        Annuler la tâche qui consomme l'itérateur ferme la connexion.
+        """
+        cached = self.get_cached_suggestion(app_name)
+        if cached:
+            yield cached
+            return
+        
+        text = ""
+        first_chunk = True
+        read_timeout = self._generation_timeout(stream=True)
+        async with self.semaphore:
+            try:
+                if not await self._acquire_circuit():
+                    yield self._unavailable_message()
+                    return
+                
+                await self.prime_prefix(app_mapper.get_app_category(app_name))
+                payload = self._build_generate_payload(app_name, context, stream=True)
+                
+                start = time.perf_counter()
+                async with await self._request("POST", "/api/generate", payload,
+                                               read_timeout=read_timeout) as response:
+                    if response.status != 200:
+                        await response.read()
+                        if response.status >= 500:
+                            self.breaker.record_failure()
+                        else:
+                            self.breaker.record_success()
+                        yield f"❌ Erreur Ollama: HTTP {response.status}"
+                        return
+                    
+                    async for line in response.iter_lines():
+                        if first_chunk:
+                            first_chunk = False
+                            self._record_generation_success(True, time.perf_counter() - start)
+                        
+                        if not line.strip():
+                            continue
+                        
+                        chunk = json.loads(line)
+                        delta = chunk.get("response", "")
+                        if delta:
+                            text += delta
+                            cleaned = self._clean_suggestion(text.strip())
+                            if cleaned:
+                                yield cleaned
+                        
+                        if chunk.get("done"):
+                            self._record_generation(chunk, start, reused="context" in payload)
+                            # Lire la fin du corps pour pouvoir réutiliser la connexion
+                            async for _ in response.iter_chunks():
+                                pass
+                            break
+                
+                if first_chunk:
+                    self.breaker.record_success()
+                
+                if not text.strip():
+                    yield "🤔 Pas de suggestion pour le moment"
+                elif self.cache is not None:
+                    self.cache.put(self._cache_key(app_name), self._clean_suggestion(text.strip()))
+            
+            except asyncio.CancelledError:
+                if first_chunk:
+                    # Génération annulée avant toute réponse : le test reste à faire
+                    self.breaker.abandon_probe()
+                raise
+            except asyncio.TimeoutError:
+                self._record_generation_timeout(True)
+                if not text.strip():
+                    yield "⏱️ Timeout - Ollama surchargé"
+            except (ConnectionError, OSError, AsyncHTTPError):
+                self._on_connection_lost()
+                if not text.strip():
+                    yield "🔌 Connexion perdue avec Ollama"
+            except Exception as e:
+                self.breaker.record_failure()
+                print(f"Erreur génération (async): {e}")
+                yield "🔄 Erreur lors de la génération"
+    
+    async def warm_up(self) -> bool:
+        """Charge le modèle dans Ollama sans générer de token"""
+        if not self.available:
+            return False
+        
+        try:
+            async with self.semaphore:
+                start = time.perf_counter()
+                payload = {"model": self.model, "keep_alive": settings.ollama.keep_alive}
+                async with await self._request("POST", "/api/generate", payload,
+                                               read_timeout=max(settings.ollama.timeout, 60)) as response:
+                    data = await response.json()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            if response.status != 200:
+                return False
+            
+            self._record_warmup(elapsed_ms, data.get("load_duration", 0) / 1e6)
+            return True
+        
+        except (ConnectionError, OSError, AsyncHTTPError):
+            self._on_connection_lost()
+            return False
+        except Exception as e:
+            print(f"Erreur warm-up (async): {e}")
+            return False
+    
+    async def prime_prefix(self, category: str) -> bool:
+        """
+        Fait évaluer une fois le préfixe d'une catégorie et garde ses tokens `context`
+        
+        Timeout et perte de connexion sont propagés à la génération appelante.
+        """
+        if not self._needs_priming(category):
+            return True
+        
+        async with await self._request("POST", "/api/generate", self._build_priming_payload(category),
+                                       read_timeout=self._generation_timeout(stream=False)) as response:
+            body = await response.read()
+        if response.status >= 500:
+            self.breaker.record_failure()
+        try:
+            if response.status == 200:
+                return self._store_prefix_context(category, json.loads(body))
+        except ValueError as e:
+            print(f"Erreur amorçage du prompt ({category}): {e}")
+        
+        return False
+    
+    async def test_model(self, test_prompt: str = "Dis bonjour en une phrase.") -> Dict[str, Any]:
+        """Teste le modèle avec un prompt simple"""
+        if not self.available:
+            return {"success": False, "error": "Ollama non disponible"}
+        
+        try:
+            payload = {
+                "model": self.model,
+                "prompt": test_prompt,
+                "stream": False,
+                "keep_alive": settings.ollama.keep_alive,
+                "options": {"num_predict": 50}
+            }
+            
+            async with self.semaphore:
+                async with await self._request("POST", "/api/generate", payload,
+                                               read_timeout=settings.ollama.test_timeout) as response:
+                    result = await response.json()
+            
+            if response.status == 200:
+                return {
+                    "success": True,
+                    "response": result.get("response", ""),
+                    "eval_count": result.get("eval_count", 0),
+                    "eval_duration": result.get("eval_duration", 0)
+                }
+            return {"success": False, "error": f"HTTP {response.status}"}
+        
+        except Exception as e:
+            return {"success": False, "error": str(e)}
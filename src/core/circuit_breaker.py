@@ -0,0 +1,156 @@
+"""
+Disjoncteur et timeouts adaptatifs pour le backend Ollama
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états
+    
+    - fermé : les requêtes passent ; `failure_threshold` échecs consécutifs l'ouvrent
+    - ouvert : échec immédiat jusqu'à la fin du délai d'attente
+    - semi-ouvert : une seule requête de test ; succès = fermé, échec = ouvert
+      avec un délai doublé (backoff exponentiel plafonné)
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 2.0,
+                 max_backoff: float = 120.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.backoff = base_backoff
+        self.retry_at = 0.0
+        
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'probes': 0
+        }
+    
+    def allow_request(self) -> bool:
+        """True si une requête peut partir (en semi-ouvert : une seule requête de test)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            
+            if self.state == self.OPEN and self._clock() >= self.retry_at:
+                self.state = self.HALF_OPEN
+                self.stats['probes'] += 1
+                return True
+            
+            self.stats['rejected'] += 1
+            return False
+    
+    def record_success(self):
+        """La requête a abouti : circuit fermé, backoff réinitialisé"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.backoff = self.base_backoff
+    
+    def record_failure(self):
+        """La requête a échoué (timeout, connexion, erreur serveur)"""
+        with self._lock:
+            self.consecutive_failures += 1
+            
+            if self.state == self.HALF_OPEN:
+                # Le test a échoué : attendre deux fois plus longtemps
+                self._open(min(self.backoff * 2, self.max_backoff))
+            elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open(self.base_backoff)
+    
+    def trip(self):
+        """Ouvre le circuit immédiatement (backend injoignable)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open(min(self.backoff * 2, self.max_backoff))
+            elif self.state == self.CLOSED:
+                self._open(self.base_backoff)
+    
+    def abandon_probe(self):
+        """La requête de test a été annulée sans résultat : la prochaine requête testera"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.retry_at = self._clock()
+    
+    def _open(self, backoff: float):
+        """Passe à l'état ouvert (verrou tenu)"""
+        self.state = self.OPEN
+        self.backoff = backoff
+        self.retry_at = self._clock() + backoff
+        self.stats['opened'] += 1
+    
+    def time_until_retry(self) -> float:
+        """Secondes avant la prochaine requête de test (0 si le circuit est fermé)"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.retry_at - self._clock())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'backoff': self.backoff
+            }
+
+
+class AdaptiveTimeout:
+    """
+    Timeout calé sur un percentile des latences observées récemment
+    
+    Après un timeout, le maximum est appliqué jusqu'à la prochaine réussite :
+    les latences récentes sont celles d'un modèle chargé, et un modèle déchargé
+    (keep_alive expiré) met plus longtemps à répondre la première fois.
+    """
+    
+    def __init__(self, max_timeout: float, min_timeout: float = 3.0, percentile: float = 0.95,
+                 factor: float = 2.0, window: int = 50, min_samples: int = 5):
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.percentile = percentile
+        self.factor = factor
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._widened = False
+        self._lock = threading.Lock()
+    
+    def record(self, latency: float):
+        """Enregistre une latence réussie (secondes)"""
+        with self._lock:
+            self._samples.append(latency)
+            self._widened = False
+    
+    def record_timeout(self):
+        """Le timeout a expiré : appliquer le maximum jusqu'à la prochaine réussite"""
+        with self._lock:
+            self._widened = True
+    
+    def current(self) -> float:
+        """Timeout à appliquer : percentile x facteur, borné à [min, max]"""
+        with self._lock:
+            if self._widened or len(self._samples) < self.min_samples:
+                return self.max_timeout
+            
+            ordered = sorted(self._samples)
+            index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+            timeout = ordered[index] * self.factor
+        
+        return max(self.min_timeout, min(self.max_timeout, timeout))
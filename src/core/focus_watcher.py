@@ -0,0 +1,189 @@
+"""
+Détection événementielle de la fenêtre active sous Linux (X11)
+"""
+
+import os
+import select
+import sys
+import threading
+from typing import Callable, Optional, Tuple
+
+import psutil
+
+# Import conditionnel : python-xlib n'est utile que sous Linux/X11
+try:
+    from Xlib import X, Xatom, display as xdisplay
+    from Xlib.error import XError
+    XLIB_AVAILABLE = True
+except ImportError:
+    XLIB_AVAILABLE = False
+
+
+def x11_focus_supported() -> bool:
+    """True si le suivi X11 est possible (Linux, python-xlib, DISPLAY défini)"""
+    return sys.platform.startswith("linux") and XLIB_AVAILABLE and bool(os.environ.get("DISPLAY"))
+
+
+class X11FocusWatcher:
+    """
+    Suivi de la fenêtre active via `_NET_ACTIVE_WINDOW`
+    
+    Abonné aux événements PropertyNotify de la fenêtre racine : le thread dort
+    dans select() tant que le focus ne change pas (aucun CPU au repos) et le
+    callback est appelé dès que le gestionnaire de fenêtres publie la nouvelle
+    fenêtre active. Le processus est résolu par `_NET_WM_PID`.
+    """
+    
+    kind = "x11"
+    
+    def __init__(self, on_focus: Callable[[Optional[int], str, str], None],
+                 on_lost: Optional[Callable[[], None]] = None, display_name: str = None):
+        """
+        Args:
+            on_focus: Appelé avec (pid, nom du processus, titre) à chaque changement
+            on_lost: Appelé si la connexion au serveur X est perdue
+            display_name: Affichage X (défaut: $DISPLAY)
+        """
+        self.on_focus = on_focus
+        self.on_lost = on_lost
+        self.display_name = display_name
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._display = None
+        self._wake_r, self._wake_w = None, None
+        self._last_window = None
+        
+        self.stats = {
+            'events': 0,
+            'focus_changes': 0,
+            'unresolved': 0  # Fenêtres sans _NET_WM_PID
+        }
+    
+    def start(self) -> bool:
+        """Se connecte au serveur X et démarre l'écoute (False si impossible)"""
+        if not XLIB_AVAILABLE or self.running:
+            return self.running
+        
+        try:
+            self._display = xdisplay.Display(self.display_name)
+            self._root = self._display.screen().root
+            self._atoms = {
+                name: self._display.intern_atom(name)
+                for name in ('_NET_ACTIVE_WINDOW', '_NET_WM_PID', '_NET_WM_NAME', 'UTF8_STRING')
+            }
+            self._root.change_attributes(event_mask=X.PropertyChangeMask)
+            self._display.flush()
+        except Exception as e:
+            print(f"⚠️ Suivi X11 indisponible: {e}")
+            self._display = None
+            return False
+        
+        self._wake_r, self._wake_w = os.pipe()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="x11-focus", daemon=True)
+        self.thread.start()
+        return True
+    
+    def stop(self):
+        """Arrête l'écoute et ferme la connexion X"""
+        if self._display is None:
+            return
+        
+        self.running = False
+        os.write(self._wake_w, b"x")
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        
+        for fd in (self._wake_r, self._wake_w):
+            os.close(fd)
+        self._wake_r = self._wake_w = None
+        
+        try:
+            self._display.close()
+        except Exception:
+            pass
+        self._display = None
+    
+    def _run(self):
+        """Boucle d'événements : bloque dans select() jusqu'au prochain événement"""
+        fileno = self._display.fileno()
+        try:
+            # Publier la fenêtre active au démarrage
+            self._handle_active_window_change()
+            
+            while self.running:
+                while self._display.pending_events():
+                    event = self._display.next_event()
+                    self.stats['events'] += 1
+                    if (event.type == X.PropertyNotify
+                            and event.atom == self._atoms['_NET_ACTIVE_WINDOW']):
+                        self._handle_active_window_change()
+                
+                if not self.running:
+                    break
+                readable, _, _ = select.select([fileno, self._wake_r], [], [])
+                if self._wake_r in readable:
+                    break
+        
+        except Exception as e:
+            if self.running:
+                print(f"❌ Connexion X11 perdue: {e}")
+                self.running = False
+                if self.on_lost:
+                    self.on_lost()
+    
+    def _handle_active_window_change(self):
+        """Résout la nouvelle fenêtre active et notifie si elle a changé"""
+        window = self.get_active_window()
+        window_id = window.id if window is not None else None
+        if window_id == self._last_window:
+            return
+        self._last_window = window_id
+        
+        if window is None:
+            return
+        
+        pid, name, title = self._describe_window(window)
+        if pid is None:
+            self.stats['unresolved'] += 1
+        self.stats['focus_changes'] += 1
+        self.on_focus(pid, name, title)
+    
+    def get_active_window(self):
+        """Fenêtre désignée par _NET_ACTIVE_WINDOW (None si aucune)"""
+        try:
+            prop = self._root.get_full_property(self._atoms['_NET_ACTIVE_WINDOW'], Xatom.WINDOW)
+        except XError:
+            return None
+        if not prop or not prop.value or not prop.value[0]:
+            return None
+        return self._display.create_resource_object('window', prop.value[0])
+    
+    def _describe_window(self, window) -> Tuple[Optional[int], str, str]:
+        """Retourne (pid, nom du processus, titre) d'une fenêtre"""
+        pid, name, title = None, "", ""
+        try:
+            prop = window.get_full_property(self._atoms['_NET_WM_PID'], Xatom.CARDINAL)
+            if prop and prop.value:
+                pid = int(prop.value[0])
+            
+            title_prop = window.get_full_property(self._atoms['_NET_WM_NAME'], self._atoms['UTF8_STRING'])
+            if title_prop and title_prop.value:
+                value = title_prop.value
+                title = value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+            
+            if pid is None:
+                # Pas de _NET_WM_PID : se rabattre sur la classe de la fenêtre
+                wm_class = window.get_wm_class()
+                if wm_class:
+                    name = wm_class[0].lower()
+        except XError:
+            pass
+        
+        if pid is not None:
+            try:
+                name = psutil.Process(pid).name().lower()
+            except psutil.Error:
+                pass
+        
+        return pid, name, title
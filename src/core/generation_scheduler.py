@@ -0,0 +1,224 @@
+"""
+Ordonnancement des générations LLM (single-flight, annulation, concurrence bornée)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from ..utils.event_loop import EventLoopThread, shared_event_loop
+from .llm_metrics import llm_metrics
+
+
+class GenerationJob:
+    """Génération soumise au scheduler (coroutine exécutée sur la boucle partagée)"""
+    
+    def __init__(self, key: Hashable, func: Callable[[], Awaitable[Any]],
+                 on_result: Optional[Callable[[Any], None]], seq: int, background: bool = False):
+        self.key = key
+        self.func = func
+        self.on_result = on_result
+        self.seq = seq
+        self.background = background
+        self.cancelled = False
+        self.started = False
+        self.future: Optional[Future] = None
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+    
+    def cancel(self):
+        """
+        Rend la génération obsolète (verrou du scheduler tenu)
+        
+        Une génération démarrée est interrompue par l'annulation de sa tâche
+        (le client ferme la connexion, Ollama arrête de générer) ; une
+        génération en attente ne démarrera pas, sauf si elle est redemandée.
+        """
+        self.cancelled = True
+        if self.started and self.future is not None:
+            self.future.cancel()
+    
+    @property
+    def queue_time(self) -> float:
+        """Temps passé en file d'attente (secondes)"""
+        if self.started_at is None:
+            return 0.0
+        return self.started_at - self.submitted_at
+
+
+class GenerationScheduler:
+    """
+    Scheduler single-flight pour les appels /api/generate
+    
+    - une seule génération par clé : une demande identique en cours est réutilisée
+    - une nouvelle demande rend les autres obsolètes : celles en attente sont
+      abandonnées, la tâche asyncio de celles en cours est annulée
+    - au plus `max_concurrent` générations en parallèle vers Ollama
+    - les tâches de fond (préchargement) ne passent que si le LLM est libre et
+      sont annulées dès qu'une vraie demande arrive
+    
+    Les générations sont des coroutines exécutées sur la boucle asyncio
+    partagée (aucun thread par génération) ; `on_result` est appelé dans le
+    thread de la boucle.
+    """
+    
+    def __init__(self, max_concurrent: int = 1, event_loop: EventLoopThread = None):
+        self.max_concurrent = max_concurrent
+        self.event_loop = event_loop or shared_event_loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, GenerationJob] = {}
+        self._latest_seq = 0
+        
+        self.stats = {
+            'submitted': 0,
+            'started': 0,
+            'completed': 0,
+            'coalesced': 0,   # Demandes fusionnées avec une génération identique en cours
+            'dropped': 0,     # Demandes obsolètes abandonnées avant de démarrer
+            'stale': 0,       # Générations démarrées dont le résultat a été ignoré
+            'errors': 0,
+            'background_submitted': 0,
+            'background_rejected': 0,   # Tâches de fond refusées (LLM occupé)
+            'background_cancelled': 0,  # Tâches de fond annulées par une vraie demande
+            'background_completed': 0
+        }
+    
+    def submit(self, key: Hashable, func: Callable[[], Awaitable[Any]],
+               on_result: Optional[Callable[[Any], None]] = None) -> GenerationJob:
+        """
+        Soumet une génération
+        
+        Args:
+            key: Identifiant de la demande (demandes identiques fusionnées)
+            func: Fonction async de génération (annulée si elle devient obsolète)
+            on_result: Appelé avec le résultat si la génération est toujours d'actualité
+        """
+        with self._lock:
+            self.stats['submitted'] += 1
+            self._latest_seq += 1
+            seq = self._latest_seq
+            
+            existing = self._inflight.get(key)
+            if existing and existing.background:
+                # Un préchargement ne remplace pas une vraie demande
+                existing.cancel()
+                existing = None
+            
+            # Les autres demandes deviennent obsolètes
+            for job in self._inflight.values():
+                if job is not existing:
+                    job.cancel()
+            
+            # Même demande en attente, ou en cours et non annulée : on la réutilise
+            if existing and (not existing.started or not existing.cancelled):
+                existing.cancelled = False
+                existing.seq = seq
+                self.stats['coalesced'] += 1
+                return existing
+            
+            job = GenerationJob(key, func, on_result, seq)
+            self._inflight[key] = job
+            self._schedule(job)
+        return job
+    
+    def submit_background(self, key: Hashable, func: Callable[[], Awaitable[Any]],
+                          on_result: Optional[Callable[[Any], None]] = None) -> Optional[GenerationJob]:
+        """
+        Soumet une tâche de fond basse priorité
+        
+        Refusée (None) si une vraie demande est en cours ; annulée par la
+        prochaine vraie demande.
+        """
+        with self._lock:
+            if any(not job.background for job in self._inflight.values()):
+                self.stats['background_rejected'] += 1
+                return None
+            
+            existing = self._inflight.get(key)
+            if existing:
+                return existing
+            
+            self.stats['background_submitted'] += 1
+            job = GenerationJob(key, func, on_result, self._latest_seq, background=True)
+            self._inflight[key] = job
+            self._schedule(job)
+        return job
+    
+    def _schedule(self, job: GenerationJob):
+        """Crée la tâche de la génération (verrou tenu : `job.future` est connu avant son démarrage)"""
+        job.future = self.event_loop.submit(self._run(job))
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Sémaphore de concurrence (créé dans la boucle qui l'utilise)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+    
+    async def _run(self, job: GenerationJob):
+        """Exécute une génération sur la boucle"""
+        result = None
+        failed = interrupted = False
+        async with self.semaphore:
+            with self._lock:
+                if job.cancelled:
+                    self._forget(job)
+                    self.stats['background_cancelled' if job.background else 'dropped'] += 1
+                    return
+                job.started = True
+                job.started_at = time.perf_counter()
+                if not job.background:
+                    self.stats['started'] += 1
+                    llm_metrics.record_queue_time(job.queue_time)
+            
+            try:
+                result = await job.func()
+            except asyncio.CancelledError:
+                interrupted = True
+            except Exception as e:
+                failed = True
+                print(f"[SCHEDULER] Erreur génération {job.key}: {e}")
+        
+        with self._lock:
+            self._forget(job)
+            stale = interrupted or job.cancelled or (not job.background and job.seq != self._latest_seq)
+            
+            if failed:
+                self.stats['errors'] += 1
+            elif job.background:
+                self.stats['background_cancelled' if stale else 'background_completed'] += 1
+            elif stale:
+                self.stats['stale'] += 1
+            else:
+                self.stats['completed'] += 1
+        
+        if not failed and not stale and job.on_result:
+            job.on_result(result)
+    
+    def _forget(self, job: GenerationJob):
+        """Retire un job de la table des générations en cours (verrou tenu)"""
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+    
+    def cancel_all(self):
+        """Annule toutes les générations en attente ou en cours"""
+        with self._lock:
+            for job in self._inflight.values():
+                job.cancel()
+    
+    def has_foreground_work(self) -> bool:
+        """True si une vraie demande (hors préchargement) est en attente ou en cours"""
+        with self._lock:
+            return any(not job.background for job in self._inflight.values())
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du scheduler"""
+        with self._lock:
+            return {**self.stats, 'inflight': len(self._inflight)}
+    
+    def shutdown(self):
+        """Arrête le scheduler (les générations en cours sont annulées)"""
+        self.cancel_all()
@@ -0,0 +1,133 @@
+"""
+Persistance des données d'apprentissage : journal en ajout seul + instantané
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+class LearningJournal:
+    """
+    Journal JSON-lines des événements d'apprentissage, compacté périodiquement
+    
+    Chaque événement (action, feedback) est ajouté en fin de journal avec son
+    numéro de séquence (attribué par l'appelant quand il l'applique en
+    mémoire) : l'écriture est proportionnelle à l'événement, pas à
+    l'historique. Tous les `snapshot_every` événements, l'état complet est
+    écrit dans l'instantané (fichier temporaire puis `os.replace`, donc jamais
+    à moitié écrit) avec la séquence du dernier événement qu'il contient, et
+    le journal est vidé.
+    
+    Au chargement, les événements du journal postérieurs à la séquence de
+    l'instantané sont rejoués : un arrêt entre le remplacement de l'instantané
+    et la remise à zéro du journal n'applique donc rien deux fois. Une ligne
+    tronquée en fin de journal (arrêt pendant l'écriture) est ignorée et retirée.
+    """
+    
+    def __init__(self, snapshot_path: str, journal_path: str = None, snapshot_every: int = 500):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = Path(journal_path) if journal_path else self.snapshot_path.with_suffix('.journal')
+        self.snapshot_every = snapshot_every
+        
+        self.seq = 0
+        self.pending = 0  # Événements du journal non compactés
+        self._file = None
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'appended': 0,
+            'bytes_written': 0,
+            'snapshots': 0,
+            'replayed': 0,
+            'truncated': 0
+        }
+    
+    def load(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Lit l'instantané et les événements à rejouer
+        
+        Returns:
+            (données de l'instantané, événements postérieurs dans l'ordre)
+        """
+        data: Dict[str, Any] = {}
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        snapshot_seq = data.pop('seq', 0)
+        self.seq = snapshot_seq
+        
+        events = []
+        if self.journal_path.exists():
+            valid_size = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("ligne incomplète")
+                        event = json.loads(line)
+                    except ValueError:
+                        self.stats['truncated'] += 1
+                        break
+                    valid_size += len(line)
+                    if event['seq'] > snapshot_seq:
+                        events.append(event)
+                        self.seq = event['seq']
+            
+            if self.stats['truncated']:
+                # Retirer la fin illisible pour que les prochains ajouts restent lisibles
+                os.truncate(self.journal_path, valid_size)
+                print(f"[LEARNING] Journal tronqué réparé ({valid_size} octets gardés)")
+        
+        self.pending = len(events)
+        self.stats['replayed'] += len(events)
+        return data, events
+    
+    def append(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Ajoute des événements (déjà numérotés, champ 'seq') au journal
+        
+        Returns:
+            True si un instantané est dû (`snapshot_every` événements en attente)
+        """
+        lines = "".join(json.dumps(event, separators=(',', ':')) + "\n" for event in events)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._file.write(lines)
+            self._file.flush()
+            
+            self.seq = max(self.seq, events[-1]['seq'])
+            self.pending += len(events)
+            self.stats['appended'] += len(events)
+            self.stats['bytes_written'] += len(lines)
+            return self.pending >= self.snapshot_every
+    
+    def snapshot(self, data: Dict[str, Any], seq: int):
+        """Écrit l'état complet jusqu'à `seq` (remplacement atomique) puis vide le journal"""
+        with self._lock:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({**data, 'seq': seq}, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self.stats['bytes_written'] += os.path.getsize(self.snapshot_path)
+            
+            # Les événements écrits jusqu'ici sont tous dans l'instantané (seq <= `seq`)
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.journal_path, 'w', encoding='utf-8')
+            self.pending = 0
+            self.stats['snapshots'] += 1
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'seq': self.seq, 'pending': self.pending}
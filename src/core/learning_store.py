@@ -0,0 +1,195 @@
+"""
+Stockage SQLite des données d'apprentissage (historique illimité, mémoire constante)
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..config.settings import settings
+from ..utils.batch_writer import BatchWriter
+from .next_app_predictor import HOUR_BUCKET
+
+# Au-delà de 10 demi-vies, le poids d'une transition est inférieur à 0,1 %
+DECAY_HORIZON_HALF_LIVES = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transitions (
+    from_app TEXT NOT NULL,
+    to_app TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    hour INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_from_time ON transitions (from_app, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transitions_hour ON transitions (hour);
+
+CREATE TABLE IF NOT EXISTS actions (
+    app TEXT NOT NULL,
+    action TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    hour INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_actions_app_time ON actions (app, timestamp);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    suggestion_id TEXT PRIMARY KEY,
+    score INTEGER NOT NULL
+);
+"""
+
+INSERT_TRANSITION = "INSERT INTO transitions (from_app, to_app, timestamp, hour) VALUES (?, ?, ?, ?)"
+INSERT_ACTION = "INSERT INTO actions (app, action, timestamp, hour) VALUES (?, ?, ?, ?)"
+UPSERT_FEEDBACK = ("INSERT INTO feedback (suggestion_id, score) VALUES (?, ?) "
+                   "ON CONFLICT (suggestion_id) DO UPDATE SET score = score + excluded.score")
+
+
+class SQLiteLearningStore:
+    """
+    Transitions, actions et feedback dans une base SQLite en mode WAL
+    
+    Les écritures passent par un BatchWriter (thread "learning-writer", file
+    bornée) et chaque lot est inséré dans une seule transaction : le thread
+    appelant (callback de surveillance) ne touche jamais au disque. Les
+    lectures passent par une connexion séparée (WAL : lecture pendant
+    l'écriture) et les agrégations (poids décroissants des transitions,
+    heures actives) sont faites en SQL.
+    
+    Les écritures en file ne sont visibles qu'après leur lot ; `flush()`
+    attend qu'elles soient dans la base.
+    """
+    
+    def __init__(self, path: str, half_life: float):
+        self.path = path
+        self.half_life = half_life
+        decay_rate = math.log(2) / half_life
+        
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._reader.execute("PRAGMA journal_mode=WAL")
+        self._reader.executescript(SCHEMA)
+        self._reader.create_function(
+            "decay", 1, lambda age: math.exp(-decay_rate * max(0.0, age)), deterministic=True
+        )
+        self._read_lock = threading.Lock()
+        
+        # Connexion d'écriture : thread learning-writer (ou import au démarrage)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA synchronous=NORMAL")  # Suffisant en WAL
+        self._write_lock = threading.Lock()
+        
+        config = settings.learning
+        self.writer = BatchWriter(
+            "learning-writer", self._write_batch,
+            max_queue=config.writer_queue_size,
+            batch_size=config.writer_batch_size,
+            flush_interval=config.writer_flush_interval
+        )
+    
+    # --- Écriture ---------------------------------------------------------
+    
+    def add_transition(self, from_app: str, to_app: str, timestamp: float):
+        self.writer.submit((INSERT_TRANSITION, (from_app, to_app, timestamp, time.localtime(timestamp).tm_hour)))
+    
+    def add_action(self, app_name: str, action: str, timestamp: float):
+        self.writer.submit((INSERT_ACTION, (app_name, action, timestamp, time.localtime(timestamp).tm_hour)))
+    
+    def add_feedback(self, suggestion_id: str, delta: int):
+        self.writer.submit((UPSERT_FEEDBACK, (suggestion_id, delta)))
+    
+    def import_data(self, transitions: Iterable[Tuple[str, str, float]],
+                    actions: Iterable[Tuple[str, str, float]], feedback: Iterable[Tuple[str, int]]) -> int:
+        """Écriture directe en une transaction (reprise de données au démarrage, hors file)"""
+        writes = [(INSERT_TRANSITION, (from_app, to_app, timestamp, time.localtime(timestamp).tm_hour))
+                  for from_app, to_app, timestamp in transitions]
+        writes += [(INSERT_ACTION, (app_name, action, timestamp, time.localtime(timestamp).tm_hour))
+                   for app_name, action, timestamp in actions]
+        writes += [(UPSERT_FEEDBACK, (suggestion_id, score)) for suggestion_id, score in feedback]
+        self._write_batch(writes)
+        return len(writes)
+    
+    def _write_batch(self, writes: List[Tuple[str, tuple]]):
+        with self._write_lock, self._connection:
+            # Requêtes identiques consécutives groupées, ordre conservé
+            start = 0
+            for index in range(1, len(writes) + 1):
+                if index == len(writes) or writes[index][0] != writes[start][0]:
+                    self._connection.executemany(writes[start][0], [params for _, params in writes[start:index]])
+                    start = index
+    
+    def flush(self):
+        """Attend que toutes les écritures en file soient dans la base"""
+        self.writer.flush()
+    
+    def close(self):
+        """Écrit les lots restants et ferme la base"""
+        self.writer.close()
+        with self._write_lock:
+            self._connection.close()
+        with self._read_lock:
+            self._reader.close()
+    
+    # --- Lecture ----------------------------------------------------------
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+    
+    def is_empty(self) -> bool:
+        return not self._query(
+            "SELECT 1 FROM transitions UNION ALL SELECT 1 FROM actions "
+            "UNION ALL SELECT 1 FROM feedback LIMIT 1"
+        )
+    
+    def successors(self, from_app: str, now: float, min_weight: float = 0.0) -> List[Tuple[str, float]]:
+        """(application, poids décroissant) suivant `from_app` (index from_app, timestamp)"""
+        return self._query(
+            "SELECT to_app, SUM(decay(? - timestamp)) AS weight FROM transitions "
+            "WHERE from_app = ? AND timestamp > ? "
+            "GROUP BY to_app HAVING weight >= ? ORDER BY weight DESC",
+            (now, from_app, now - DECAY_HORIZON_HALF_LIVES * self.half_life, min_weight)
+        )
+    
+    def workflows(self, now: float, min_weight: float) -> Dict[str, List[str]]:
+        """Successeurs fréquents de chaque application (plus fréquent d'abord)"""
+        rows = self._query(
+            "SELECT from_app, to_app, SUM(decay(? - timestamp)) AS weight FROM transitions "
+            "WHERE timestamp > ? GROUP BY from_app, to_app HAVING weight >= ? "
+            "ORDER BY from_app, weight DESC",
+            (now, now - DECAY_HORIZON_HALF_LIVES * self.half_life, min_weight)
+        )
+        workflows: Dict[str, List[str]] = {}
+        for from_app, to_app, _ in rows:
+            workflows.setdefault(from_app, []).append(to_app)
+        return workflows
+    
+    def transition_counts(self, since: float) -> List[Tuple[str, str, int, int]]:
+        """(depuis, vers, tranche horaire, nombre) des transitions après `since`"""
+        return self._query(
+            "SELECT from_app, to_app, hour / ? AS bucket, COUNT(*) FROM transitions "
+            "WHERE timestamp > ? GROUP BY from_app, to_app, bucket",
+            (HOUR_BUCKET, since)
+        )
+    
+    def count_transitions(self) -> int:
+        return self._query("SELECT COUNT(*) FROM transitions")[0][0]
+    
+    def hour_counts(self) -> List[int]:
+        """Transitions par heure de la journée (index hour)"""
+        counts = [0] * 24
+        for hour, count in self._query("SELECT hour, COUNT(*) FROM transitions GROUP BY hour"):
+            counts[hour] = count
+        return counts
+    
+    def recent_actions(self, app_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT action, timestamp, hour FROM actions WHERE app = ? ORDER BY timestamp DESC LIMIT ?",
+            (app_name, limit)
+        )
+        return [{'action': action, 'timestamp': timestamp, 'hour': hour} for action, timestamp, hour in reversed(rows)]
+    
+    def feedback_scores(self) -> Dict[str, int]:
+        return dict(self._query("SELECT suggestion_id, score FROM feedback"))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return self.writer.get_stats()
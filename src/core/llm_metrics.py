@@ -0,0 +1,185 @@
+"""
+Métriques de latence et de débit des générations LLM (à partir des réponses Ollama)
+"""
+
+import json
+import os
+import platform
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+
+# Bornes supérieures (ms) des classes de l'histogramme de latence de bout en bout
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Percentile simple (plus proche rang), None si pas d'échantillon"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def _mean(samples: List[float]) -> Optional[float]:
+    return sum(samples) / len(samples) if samples else None
+
+
+class ModelMetrics:
+    """Métriques d'un modèle : fenêtre glissante + histogramme cumulé"""
+    
+    def __init__(self, window: int):
+        self.generations = 0
+        self.tokens = 0
+        self.tokens_per_s = deque(maxlen=window)
+        self.prompt_eval_ms = deque(maxlen=window)
+        self.prompt_tokens = deque(maxlen=window)
+        self.load_ms = deque(maxlen=window)
+        self.total_ms = deque(maxlen=window)  # Durée côté serveur (total_duration)
+        self.latency_ms = deque(maxlen=window)
+        # Dernière classe = au-delà de la plus grande borne
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    
+    def record(self, data: Dict[str, Any], latency_ms: float):
+        self.generations += 1
+        
+        eval_count = data.get("eval_count", 0)
+        eval_duration = data.get("eval_duration", 0)
+        self.tokens += eval_count
+        if eval_count and eval_duration:
+            self.tokens_per_s.append(eval_count / (eval_duration / 1e9))
+        
+        if "prompt_eval_duration" in data:
+            self.prompt_eval_ms.append(data["prompt_eval_duration"] / 1e6)
+        if "prompt_eval_count" in data:
+            self.prompt_tokens.append(data["prompt_eval_count"])
+        if "load_duration" in data:
+            self.load_ms.append(data["load_duration"] / 1e6)
+        if "total_duration" in data:
+            self.total_ms.append(data["total_duration"] / 1e6)
+        
+        self.latency_ms.append(latency_ms)
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+    
+    def _cumulative_histogram(self) -> Dict[str, int]:
+        """Générations de latence ≤ chaque borne (comme un histogramme Prometheus)"""
+        histogram = {}
+        total = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram):
+            total += count
+            histogram[f"le_{bound}"] = total
+        histogram['le_inf'] = total + self.histogram[-1]
+        return histogram
+    
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = list(self.latency_ms)
+        return {
+            'generations': self.generations,
+            'tokens': self.tokens,
+            'tokens_per_s': _mean(list(self.tokens_per_s)),
+            'prompt_eval_ms': _mean(list(self.prompt_eval_ms)),
+            'prompt_tokens': _mean(list(self.prompt_tokens)),
+            'load_ms': _mean(list(self.load_ms)),
+            'server_ms': _mean(list(self.total_ms)),
+            'latency_ms': {
+                'p50': _percentile(latencies, 50),
+                'p95': _percentile(latencies, 95),
+                'p99': _percentile(latencies, 99),
+                'max': max(latencies) if latencies else None
+            },
+            'histogram': self._cumulative_histogram()
+        }
+
+
+class LLMMetrics:
+    """
+    Registre des métriques LLM
+    
+    Alimenté par les réponses finales d'Ollama (`eval_count`, `eval_duration`,
+    `prompt_eval_count`, `prompt_eval_duration`, `load_duration`,
+    `total_duration`), la latence mesurée côté client et le temps d'attente
+    dans le scheduler de générations.
+    """
+    
+    def __init__(self, window: int = None):
+        self.window = window or settings.ollama.metrics_window
+        self._lock = threading.Lock()
+        self._models: Dict[str, ModelMetrics] = {}
+        self._queue_ms = deque(maxlen=self.window)
+        self.started_at = time.time()
+    
+    def record_generation(self, model: str, data: Dict[str, Any], latency: float):
+        """
+        Enregistre une génération terminée
+        
+        Args:
+            model: Nom du modèle
+            data: Réponse finale d'Ollama (dernier chunk en streaming)
+            latency: Latence de bout en bout mesurée par le client (secondes)
+        """
+        with self._lock:
+            metrics = self._models.get(model)
+            if metrics is None:
+                metrics = self._models[model] = ModelMetrics(self.window)
+            metrics.record(data, latency * 1000)
+    
+    def record_queue_time(self, seconds: float):
+        """Enregistre le temps passé en file d'attente avant la génération"""
+        with self._lock:
+            self._queue_ms.append(seconds * 1000)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Retourne toutes les métriques (sérialisables en JSON)"""
+        with self._lock:
+            queue = list(self._queue_ms)
+            return {
+                'host': platform.node(),
+                'timestamp': time.time(),
+                'uptime_s': time.time() - self.started_at,
+                'window': self.window,
+                'queue_ms': {
+                    'p50': _percentile(queue, 50),
+                    'p95': _percentile(queue, 95),
+                    'mean': _mean(queue)
+                },
+                'models': {model: metrics.snapshot() for model, metrics in self._models.items()}
+            }
+    
+    def get_model_summary(self, model: str) -> Optional[Dict[str, Any]]:
+        """Métriques d'un modèle (None s'il n'a rien généré)"""
+        with self._lock:
+            metrics = self._models.get(model)
+            return metrics.snapshot() if metrics else None
+    
+    def export_json(self, path: str = None) -> bool:
+        """Écrit un instantané des métriques en JSON (écriture atomique)"""
+        path = path or settings.ollama.metrics_file
+        if not path:
+            return False
+        
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            print(f"[METRICS] Erreur export métriques LLM: {e}")
+            return False
+    
+    def reset(self):
+        """Vide le registre"""
+        with self._lock:
+            self._models.clear()
+            self._queue_ms.clear()
+            self.started_at = time.time()
+
+
+# Instance globale
+llm_metrics = LLMMetrics()
@@ -0,0 +1,75 @@
+"""
+Warm-up du modèle Ollama et ping keep-alive pendant les heures actives
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future
+from typing import Optional, Set
+
+from ..config.settings import settings
+from ..utils.event_loop import EventLoopThread, shared_event_loop
+
+
+class ModelWarmer:
+    """Garde le modèle chargé dans Ollama pendant que l'utilisateur travaille (client asyncio)"""
+    
+    def __init__(self, ollama_client, learning_engine=None, event_loop: EventLoopThread = None):
+        self.ollama_client = ollama_client
+        self.learning_engine = learning_engine
+        self.event_loop = event_loop or shared_event_loop
+        self.future: Optional[Future] = None
+        
+        self.stats = {
+            'pings': 0,
+            'skipped_inactive': 0
+        }
+    
+    def start(self):
+        """Warm-up immédiat puis pings périodiques (tâche de la boucle partagée)"""
+        if not settings.ollama.warmup_enabled or (self.future and not self.future.done()):
+            return
+        
+        self.future = self.event_loop.submit(self._warmup_loop())
+    
+    def stop(self):
+        """Arrête les pings keep-alive"""
+        if self.future:
+            self.future.cancel()
+    
+    def get_active_hours(self) -> Set[int]:
+        """Heures actives apprises, ou plage configurée par défaut"""
+        if self.learning_engine:
+            learned_hours = self.learning_engine.get_active_hours()
+            if learned_hours:
+                return learned_hours
+        
+        start, end = settings.ollama.active_hours_start, settings.ollama.active_hours_end
+        if start <= end:
+            return set(range(start, end + 1))
+        return set(range(start, 24)) | set(range(0, end + 1))
+    
+    def is_active_time(self, timestamp: float = None) -> bool:
+        """True si l'heure donnée fait partie des heures actives"""
+        hour = time.localtime(timestamp).tm_hour
+        return hour in self.get_active_hours()
+    
+    async def _warmup_loop(self):
+        """Charge le modèle puis le maintient en mémoire pendant les heures actives"""
+        await self.ollama_client.warm_up()
+        
+        interval = settings.ollama.keepalive_ping_interval
+        if interval <= 0:
+            return
+        
+        while True:
+            await asyncio.sleep(interval)
+            if not self.is_active_time():
+                self.stats['skipped_inactive'] += 1
+                continue
+            
+            if await self.ollama_client.warm_up():
+                self.stats['pings'] += 1
+                if settings.debug_mode:
+                    warm_ms = self.ollama_client.latency_stats['warm_ms']
+                    print(f"[WARMUP] Ping keep-alive ({warm_ms:.0f} ms)")
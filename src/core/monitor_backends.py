@@ -0,0 +1,399 @@
+"""
+Sources de données de SystemMonitor : système réel, enregistrement et rejeu
+"""
+
+import contextlib
+import json
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+from ..config.settings import settings
+from .focus_watcher import X11FocusWatcher, x11_focus_supported
+
+RECORDING_VERSION = 1
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+CpuTimes = namedtuple("CpuTimes", "user system")
+
+# Exceptions psutil reproduites au rejeu
+_ERRORS = {
+    'NoSuchProcess': psutil.NoSuchProcess,
+    'AccessDenied': psutil.AccessDenied
+}
+
+FocusCallback = Callable[[Optional[int], str, str], None]
+
+
+class MonitorBackend(ABC):
+    """
+    Interface d'énumération des processus et de détection du focus
+    
+    `pids()` est appelé une fois par scan (ProcessScanner), `process(pid)`
+    retourne un objet compatible `psutil.Process` (oneshot, name, create_time,
+    memory_info, cpu_times, is_running).
+    """
+    
+    @abstractmethod
+    def pids(self) -> Iterable[int]:
+        """Pid présents (un appel par scan)"""
+    
+    @abstractmethod
+    def process(self, pid: int) -> Any:
+        """Processus `pid` (psutil.NoSuchProcess / AccessDenied comme psutil)"""
+    
+    def time(self) -> float:
+        """Horloge murale (date de création des processus, statistiques)"""
+        return time.time()
+    
+    def monotonic(self) -> float:
+        """Horloge monotone (calcul du % CPU entre deux scans)"""
+        return time.monotonic()
+    
+    def create_focus_watcher(self, on_focus: FocusCallback, on_lost: Callable[[], None]):
+        """Suivi événementiel de la fenêtre active, ou None (polling)"""
+        return None
+    
+    def close(self):
+        pass
+
+
+class PsutilBackend(MonitorBackend):
+    """Système réel : psutil, et X11 pour la fenêtre active si disponible"""
+    
+    def pids(self) -> Iterable[int]:
+        return psutil.pids()
+    
+    def process(self, pid: int) -> Any:
+        return psutil.Process(pid)
+    
+    def create_focus_watcher(self, on_focus: FocusCallback, on_lost: Callable[[], None]):
+        backend = settings.monitoring.focus_backend
+        if backend == "psutil" or (backend == "auto" and not x11_focus_supported()):
+            return None
+        return X11FocusWatcher(on_focus, on_lost=on_lost)
+
+
+class RecordingBackend(MonitorBackend):
+    """
+    Enregistre une session réelle dans un fichier JSONL rejouable
+    
+    Chaque scan produit une ligne {"type": "scan"} avec les pid présents et les
+    attributs lus pendant ce scan (valeurs ou exception psutil) ; chaque
+    changement de fenêtre active une ligne {"type": "focus"}.
+    """
+    
+    def __init__(self, inner: MonitorBackend, path: str):
+        self.inner = inner
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._frame: Optional[Dict[str, Any]] = None
+        self._started = inner.monotonic()
+        self.stats = {'scans': 0, 'focus_events': 0}
+        self._write({'type': 'header', 'version': RECORDING_VERSION, 'wall': inner.time()})
+    
+    def _write(self, record: Dict[str, Any]):
+        if self._file.closed:
+            # Enregistrement terminé (surveillance arrêtée)
+            return
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+    
+    def _flush_frame(self):
+        if self._frame is not None:
+            self._write(self._frame)
+            self._frame = None
+    
+    def pids(self) -> Iterable[int]:
+        pids = list(self.inner.pids())
+        with self._lock:
+            self._flush_frame()
+            self._frame = {
+                'type': 'scan',
+                't': self.inner.monotonic() - self._started,
+                'wall': self.inner.time(),
+                'pids': pids,
+                'procs': {}
+            }
+            self.stats['scans'] += 1
+        return pids
+    
+    def process(self, pid: int) -> Any:
+        try:
+            return RecordingProcess(self, pid, self.inner.process(pid))
+        except psutil.Error as e:
+            self.record_value(pid, 'process', e)
+            raise
+    
+    def record_value(self, pid: int, attribute: str, value: Any):
+        """Mémorise un attribut lu (ou l'exception levée) dans le scan en cours"""
+        if isinstance(value, psutil.Error):
+            value = {'error': type(value).__name__}
+        elif hasattr(value, '_asdict'):
+            value = list(value)[:2]
+        with self._lock:
+            if self._frame is not None:
+                self._frame['procs'].setdefault(str(pid), {})[attribute] = value
+    
+    def time(self) -> float:
+        return self.inner.time()
+    
+    def monotonic(self) -> float:
+        return self.inner.monotonic()
+    
+    def create_focus_watcher(self, on_focus: FocusCallback, on_lost: Callable[[], None]):
+        def recording_on_focus(pid, name, title):
+            with self._lock:
+                self._flush_frame()
+                self._write({
+                    'type': 'focus',
+                    't': self.inner.monotonic() - self._started,
+                    'wall': self.inner.time(),
+                    'pid': pid, 'name': name, 'title': title
+                })
+                self.stats['focus_events'] += 1
+            on_focus(pid, name, title)
+        
+        return self.inner.create_focus_watcher(recording_on_focus, on_lost)
+    
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_frame()
+            self._file.close()
+        self.inner.close()
+        print(f"🎞️ Session enregistrée: {self.path} ({self.stats['scans']} scans, "
+              f"{self.stats['focus_events']} changements de fenêtre)")
+
+
+class RecordingProcess:
+    """psutil.Process dont les lectures sont enregistrées"""
+    
+    def __init__(self, backend: RecordingBackend, pid: int, process):
+        self.backend = backend
+        self.pid = pid
+        self._process = process
+    
+    def oneshot(self):
+        return self._process.oneshot()
+    
+    def _read(self, attribute: str):
+        try:
+            value = getattr(self._process, attribute)()
+        except psutil.Error as e:
+            self.backend.record_value(self.pid, attribute, e)
+            raise
+        self.backend.record_value(self.pid, attribute, value)
+        return value
+    
+    def name(self):
+        return self._read('name')
+    
+    def create_time(self):
+        return self._read('create_time')
+    
+    def memory_info(self):
+        return self._read('memory_info')
+    
+    def cpu_times(self):
+        return self._read('cpu_times')
+    
+    def is_running(self):
+        return self._read('is_running')
+
+
+class ReplayBackend(MonitorBackend):
+    """
+    Rejoue une session enregistrée par RecordingBackend
+    
+    Chaque appel à `pids()` (donc chaque scan) passe à l'enregistrement de scan
+    suivant, et les horloges retournent les temps enregistrés : le résultat est
+    déterministe quelle que soit la machine. Les changements de fenêtre
+    enregistrés (si un ReplayFocusWatcher est démarré) sont délivrés dans ce
+    même pas, avant le scan, dans l'ordre de leur temps `t` : la séquence
+    focus / scan est toujours celle de l'enregistrement. Avec `speed` > 0, les
+    scans sont espacés comme à l'enregistrement (divisé par `speed`) ; avec 0,
+    le rejeu va aussi vite que possible.
+    """
+    
+    def __init__(self, path: str, speed: float = 0.0):
+        self.path = path
+        self.speed = speed
+        self.frames: List[Dict[str, Any]] = []
+        self.focus_events: List[Dict[str, Any]] = []
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record['type'] == 'header' and record.get('version') != RECORDING_VERSION:
+                    raise ValueError(f"Version d'enregistrement non supportée: {record.get('version')}")
+                if record['type'] == 'scan':
+                    self.frames.append(record)
+                elif record['type'] == 'focus':
+                    self.focus_events.append(record)
+        
+        self.index = -1
+        self.current_pids: set = set()
+        self.state: Dict[int, Dict[str, Any]] = {}  # Derniers attributs connus par pid
+        self._frame_values: Dict[int, Dict[str, Any]] = {}
+        self._t = 0.0
+        self._wall = self.frames[0]['wall'] if self.frames else time.time()
+        self._replay_start: Optional[float] = None
+        
+        # Changements de fenêtre : délivrés par pids() (ReplayFocusWatcher démarré)
+        self.on_focus: Optional[FocusCallback] = None
+        self.focus_index = 0
+    
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.frames) - 1
+    
+    def pids(self) -> Iterable[int]:
+        if not self.finished:
+            self.index += 1
+            frame = self.frames[self.index]
+            self._wait_until(frame['t'])
+            self.deliver_focus(frame['t'])
+            self._t, self._wall = frame['t'], frame['wall']
+            self.current_pids = set(frame['pids'])
+            self._frame_values = {int(pid): values for pid, values in frame['procs'].items()}
+            for pid, values in self._frame_values.items():
+                self.state.setdefault(pid, {}).update(values)
+        return list(self.current_pids)
+    
+    def deliver_focus(self, until: float = float('inf')):
+        """Délivre les changements de fenêtre enregistrés jusqu'au temps `until` inclus"""
+        if self.on_focus is None:
+            return
+        while self.focus_index < len(self.focus_events) and self.focus_events[self.focus_index]['t'] <= until:
+            event = self.focus_events[self.focus_index]
+            self.focus_index += 1
+            self._t, self._wall = event['t'], event['wall']
+            self.on_focus(event['pid'], event['name'], event['title'])
+    
+    def _wait_until(self, t: float):
+        """Respecte le rythme de l'enregistrement (speed > 0)"""
+        if self.speed <= 0:
+            return
+        if self._replay_start is None:
+            self._replay_start = time.monotonic() - t / self.speed
+        delay = self._replay_start + t / self.speed - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def process(self, pid: int) -> Any:
+        values = self._frame_values.get(pid, {})
+        if 'process' in values:
+            raise _ERRORS[values['process']['error']](pid)
+        if pid not in self.current_pids:
+            raise psutil.NoSuchProcess(pid)
+        return ReplayProcess(self, pid)
+    
+    def value(self, pid: int, attribute: str) -> Any:
+        """Attribut enregistré (le plus récent), ou exception enregistrée"""
+        frame_values = self._frame_values.get(pid, {})
+        if attribute == 'is_running' and attribute not in frame_values:
+            return pid in self.current_pids
+        
+        value = frame_values.get(attribute, self.state.get(pid, {}).get(attribute))
+        if value is None:
+            raise psutil.NoSuchProcess(pid)
+        if isinstance(value, dict) and 'error' in value:
+            raise _ERRORS[value['error']](pid)
+        return value
+    
+    def time(self) -> float:
+        return self._wall
+    
+    def monotonic(self) -> float:
+        return self._t
+    
+    def create_focus_watcher(self, on_focus: FocusCallback, on_lost: Callable[[], None]):
+        if not self.focus_events:
+            return None
+        return ReplayFocusWatcher(self, on_focus)
+
+
+class ReplayProcess:
+    """psutil.Process reconstitué à partir de l'enregistrement"""
+    
+    def __init__(self, backend: ReplayBackend, pid: int):
+        self.backend = backend
+        self.pid = pid
+    
+    def oneshot(self):
+        return contextlib.nullcontext()
+    
+    def name(self):
+        return self.backend.value(self.pid, 'name')
+    
+    def create_time(self):
+        return self.backend.value(self.pid, 'create_time')
+    
+    def memory_info(self):
+        return MemoryInfo(*self.backend.value(self.pid, 'memory_info'))
+    
+    def cpu_times(self):
+        return CpuTimes(*self.backend.value(self.pid, 'cpu_times'))
+    
+    def is_running(self):
+        return self.backend.value(self.pid, 'is_running')
+
+
+class ReplayFocusWatcher:
+    """
+    Rejoue les changements de fenêtre active enregistrés (même interface qu'X11FocusWatcher)
+    
+    SystemMonitor ne scanne pas quand un suivi de fenêtre est actif : le thread
+    du watcher fait alors avancer le rejeu scan par scan, et les changements
+    de fenêtre sont délivrés par `ReplayBackend.pids()` entre les scans.
+    """
+    
+    kind = "replay"
+    
+    def __init__(self, backend: ReplayBackend, on_focus: FocusCallback):
+        self.backend = backend
+        self.on_focus = on_focus
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.stats = {'focus_changes': 0}
+    
+    def start(self) -> bool:
+        self.backend.on_focus = self._deliver
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="replay-focus", daemon=True)
+        self.thread.start()
+        return True
+    
+    def _deliver(self, pid: Optional[int], name: str, title: str):
+        self.stats['focus_changes'] += 1
+        self.on_focus(pid, name, title)
+    
+    def _run(self):
+        while not self.backend.finished and not self._stop_event.is_set():
+            self.backend.pids()
+        if not self._stop_event.is_set():
+            # Changements postérieurs au dernier scan
+            self.backend.deliver_focus()
+        self.running = False
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+        self.backend.on_focus = None
+
+
+def create_backend() -> MonitorBackend:
+    """Source de données configurée (système réel, éventuellement enregistré)"""
+    backend = PsutilBackend()
+    if settings.monitoring.record_file:
+        backend = RecordingBackend(backend, settings.monitoring.record_file)
+        print(f"🎞️ Enregistrement de la session dans {settings.monitoring.record_file}")
+    return backend
@@ -0,0 +1,149 @@
+"""
+Prédiction de la prochaine application (chaîne de Markov selon l'heure)
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Tranches horaires (l'heure exacte rendrait les comptes trop clairsemés)
+HOUR_BUCKET = 3
+
+
+def hour_bucket(timestamp: float) -> int:
+    return time.localtime(timestamp).tm_hour // HOUR_BUCKET
+
+
+class _Counts:
+    """Suivants observés après un contexte : comptes, total, suivants distincts"""
+    
+    __slots__ = ('followers', 'total')
+    
+    def __init__(self):
+        self.followers: Dict[str, int] = {}
+        self.total = 0
+    
+    def add(self, app_name: str, count: int = 1):
+        self.followers[app_name] = self.followers.get(app_name, 0) + count
+        self.total += count
+
+
+class NextAppPredictor:
+    """
+    Modèle de Markov clairsemé d'ordre 1 et 2, conditionné par la tranche horaire
+    
+    Quatre niveaux de contexte, du plus général au plus précis :
+    fréquence globale → application courante → application courante + tranche
+    horaire → deux dernières applications. Chaque niveau est lissé par
+    interpolation de Witten-Bell avec le précédent :
+        
+        P(a | ctx) = (c(ctx, a) + T(ctx) · P(a | ctx moins précis)) / (c(ctx) + T(ctx))
+    
+    où T(ctx) est le nombre de suivants distincts : un contexte peu observé ou
+    très dispersé s'appuie davantage sur le niveau inférieur.
+    
+    Mise à jour en O(1) par transition ; une requête top-k ne parcourt que les
+    suivants déjà observés dans ces contextes. Mises à jour (thread de
+    surveillance / d'écriture) et requêtes (préchargement) sont protégées par
+    un verrou.
+    """
+    
+    def __init__(self):
+        self.stats = {'updates': 0, 'queries': 0}
+        self._lock = threading.Lock()
+        self.clear()
+    
+    def clear(self):
+        with self._lock:
+            self.unigram = _Counts()
+            self.first: Dict[str, _Counts] = {}
+            self.first_hour: Dict[Tuple[str, int], _Counts] = {}
+            self.second: Dict[Tuple[str, str], _Counts] = {}
+            
+            # Dernière transition : contexte d'ordre 2 de la suivante
+            self._last: Optional[Tuple[str, str]] = None
+    
+    def record(self, from_app: str, to_app: str, timestamp: float):
+        """Ajoute une transition (dans l'ordre chronologique)"""
+        bucket = hour_bucket(timestamp)
+        with self._lock:
+            self.unigram.add(to_app)
+            self.first.setdefault(from_app, _Counts()).add(to_app)
+            self.first_hour.setdefault((from_app, bucket), _Counts()).add(to_app)
+            if self._last is not None and self._last[1] == from_app:
+                self.second.setdefault((self._last[0], from_app), _Counts()).add(to_app)
+            self._last = (from_app, to_app)
+            self.stats['updates'] += 1
+    
+    def add_counts(self, from_app: str, to_app: str, bucket: int, count: int):
+        """
+        Ajoute `count` transitions agrégées (from_app, to_app, tranche horaire)
+        
+        Entraînement depuis une agrégation SQL : les contextes d'ordre 2 ne se
+        remplissent qu'avec les transitions enregistrées ensuite.
+        """
+        with self._lock:
+            self.unigram.add(to_app, count)
+            self.first.setdefault(from_app, _Counts()).add(to_app, count)
+            self.first_hour.setdefault((from_app, bucket), _Counts()).add(to_app, count)
+            self.stats['updates'] += count
+    
+    def reset_context(self):
+        """Coupe le contexte d'ordre 2 (pause, reprise après arrêt)"""
+        with self._lock:
+            self._last = None
+    
+    def predict(self, app_name: str, k: int = 3, timestamp: float = None,
+                previous: str = None) -> List[Tuple[str, float]]:
+        """
+        Applications les plus probables après `app_name`
+        
+        Args:
+            app_name: Application courante
+            k: Nombre de prédictions
+            timestamp: Moment de la prédiction (tranche horaire), maintenant par défaut
+            previous: Application avant `app_name` ; par défaut celle de la
+                dernière transition enregistrée si elle menait à `app_name`
+        
+        Returns:
+            Jusqu'à k (application, probabilité), la plus probable d'abord
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        bucket = hour_bucket(timestamp)
+        with self._lock:
+            self.stats['queries'] += 1
+            if previous is None and self._last is not None and self._last[1] == app_name:
+                previous = self._last[0]
+            
+            contexts = [
+                self.first.get(app_name),
+                self.first_hour.get((app_name, bucket)),
+                self.second.get((previous, app_name)) if previous else None
+            ]
+            contexts = [counts for counts in contexts if counts is not None]
+            if not contexts:
+                return []
+            
+            # Candidats : suivants observés (les autres n'ont que la part globale)
+            candidates = set()
+            for counts in contexts:
+                candidates.update(counts.followers)
+            candidates.discard(app_name)
+            
+            scored = [(self._probability(candidate, contexts), candidate) for candidate in candidates]
+        return [(candidate, probability) for probability, candidate in heapq.nlargest(k, scored)]
+    
+    def _probability(self, app_name: str, contexts: List[_Counts]) -> float:
+        probability = self.unigram.followers.get(app_name, 0) / self.unigram.total
+        for counts in contexts:
+            distinct = len(counts.followers)
+            probability = ((counts.followers.get(app_name, 0) + distinct * probability)
+                           / (counts.total + distinct))
+        return probability
+    
+    def observations(self, app_name: str) -> int:
+        """Transitions observées depuis `app_name`"""
+        with self._lock:
+            counts = self.first.get(app_name)
+            return counts.total if counts else 0
@@ -3,28 +3,360 @@ Client pour communiquer avec Ollama
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple, Iterator
 from ..config.settings import settings
 from ..utils.app_mapper import app_mapper
+from .suggestion_cache import SuggestionCache
+from .circuit_breaker import CircuitBreaker, AdaptiveTimeout
+from .llm_metrics import llm_metrics
 
+# À incrémenter à chaque modification du prompt (invalide le cache et les tokens de préfixe)
+PROMPT_TEMPLATE_VERSION = 2
 
-class OllamaClient:
-    """Client pour l'API Ollama"""
+# Exemples de conseils par catégorie (partie stable du prompt)
+CATEGORY_EXAMPLES = {
+    'Navigation': """
+Exemples de conseils pour navigateurs:
+- "Essaie Ctrl+Shift+T pour rouvrir un onglet fermé !"
+- "Utilise Ctrl+L pour aller directement à la barre d'adresse."
+- "Ctrl+Shift+N pour ouvrir une fenêtre de navigation privée."
+""",
+    'Développement': """
+Exemples de conseils pour développement:
+- "N'oublie pas Ctrl+Shift+P pour la palette de commandes !"
+- "Utilise Ctrl+` pour ouvrir/fermer le terminal intégré."
+- "F12 pour déboguer ton code pas à pas."
+""",
+    'Bureautique': """
+Exemples de conseils pour bureautique:
+- "Ctrl+S pour sauvegarder régulièrement ton travail !"
+- "F7 pour vérifier l'orthographe de ton document."
+- "Utilise les styles pour une mise en forme cohérente."
+""",
+    'Système': """
+Exemples de conseils pour système:
+- "Tape 'cls' pour nettoyer l'écran."
+- "Utilise Tab pour l'autocomplétion."
+- "Flèche haut pour rappeler la dernière commande."
+""",
+    'Communication': """
+Exemples de conseils pour communication:
+- "Utilise @nom pour mentionner quelqu'un."
+- "Ctrl+Shift+M pour couper/remettre le micro."
+- "Organise tes conversations avec des dossiers."
+"""
+}
+
+
+def create_http_session(pool_connections: int = None, pool_maxsize: int = None,
+                        keep_alive: bool = None) -> requests.Session:
+    """Crée une session HTTP poolée (connexions TCP réutilisées entre les appels)"""
+    pool_connections = pool_connections or settings.ollama.pool_connections
+    pool_maxsize = pool_maxsize or settings.ollama.pool_maxsize
+    if keep_alive is None:
+        keep_alive = settings.ollama.http_keep_alive
     
-    def __init__(self, base_url: str = None, model: str = None):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    if not keep_alive:
+        # Une connexion neuve par requête (comportement de requests.get/post)
+        session.headers["Connection"] = "close"
+    
+    return session
+
+
+class OllamaClientBase:
+    """Partie commune aux clients Ollama (prompts, nettoyage, cache, statistiques)"""
+    
+    def __init__(self, base_url: str = None, model: str = None,
+                 cache: Optional[SuggestionCache] = None):
         self.base_url = base_url or settings.ollama.base_url
         self.model = model or settings.ollama.model
         self.available = False
         self.last_error = None
         
+        # Latence de chargement du modèle (cold start) vs modèle déjà chargé
+        self.latency_stats: Dict[str, Any] = {
+            'cold_start_ms': None,
+            'cold_load_ms': None,
+            'warm_ms': None,
+            'warmups': 0
+        }
+        
+        # Cache des suggestions (les changements d'app répétés ne relancent pas le LLM)
+        if cache is None and settings.ollama.cache_enabled:
+            cache = SuggestionCache(
+                max_entries=settings.ollama.cache_max_entries,
+                ttl=settings.ollama.cache_ttl,
+                cache_file=settings.ollama.cache_file
+            )
+        self.cache = cache
+        
+        # Disjoncteur : échec immédiat tant qu'Ollama est surchargé ou injoignable
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.ollama.breaker_failure_threshold,
+            base_backoff=settings.ollama.breaker_base_backoff,
+            max_backoff=settings.ollama.breaker_max_backoff
+        )
+        
+        # Timeouts de génération calés sur les latences observées
+        # (réponse complète, ou premier chunk en streaming)
+        self.adaptive_timeouts = {
+            mode: AdaptiveTimeout(
+                max_timeout=settings.ollama.timeout,
+                min_timeout=settings.ollama.adaptive_timeout_min,
+                percentile=settings.ollama.adaptive_timeout_percentile,
+                factor=settings.ollama.adaptive_timeout_factor
+            )
+            for mode in ('generate', 'stream')
+        }
+        
+        # Tokens `context` renvoyés par Ollama pour chaque préfixe de catégorie
+        self._prefix_contexts: Dict[Tuple[str, str, int], list] = {}
+        self.prompt_stats = {
+            'requests': 0,
+            'prompt_eval_count': 0,   # Tokens de prompt évalués par Ollama
+            'prompt_eval_ms': 0.0,
+            'context_reused': 0,      # Générations qui n'ont envoyé que le suffixe
+            'primed': 0               # Préfixes de catégorie amorcés
+        }
+    
+    def _generation_timeout(self, stream: bool) -> float:
+        """Timeout de lecture pour /api/generate"""
+        if not settings.ollama.adaptive_timeout_enabled:
+            return settings.ollama.timeout
+        return self.adaptive_timeouts['stream' if stream else 'generate'].current()
+    
+    def _record_generation_success(self, stream: bool, latency: float):
+        """Ollama a répondu : fermer le circuit et alimenter le timeout adaptatif"""
+        self.breaker.record_success()
+        self.adaptive_timeouts['stream' if stream else 'generate'].record(latency)
+    
+    def _record_generation_timeout(self, stream: bool):
+        """
+        Timeout de génération : échec pour le disjoncteur
+        
+        Les générations suivantes ont le timeout maximal (`settings.ollama.timeout`)
+        jusqu'à la prochaine réussite : modèle probablement en cours de chargement.
+        """
+        self.breaker.record_failure()
+        self.adaptive_timeouts['stream' if stream else 'generate'].record_timeout()
+    
+    def _on_connection_lost(self, error: str = "Connexion perdue"):
+        """Ollama injoignable : ouvrir le circuit"""
+        self.available = False
+        self.last_error = error
+        self.breaker.trip()
+    
+    def _unavailable_message(self) -> str:
+        """Message affiché quand le disjoncteur refuse une génération"""
+        retry = self.breaker.time_until_retry()
+        retry_text = f" - nouvel essai dans {retry:.0f}s" if retry > 0 else ""
+        if not self.available:
+            return f"🔌 Ollama non connecté ({self.last_error or 'Inconnu'}){retry_text}"
+        return f"⏱️ Ollama surchargé{retry_text}"
+    
+    def _cache_key(self, app_name: str):
+        """Clé de cache d'une suggestion pour cette application"""
+        category = app_mapper.get_app_category(app_name)
+        return SuggestionCache.make_key(self.model, app_name, category, PROMPT_TEMPLATE_VERSION)
+    
+    def get_cached_suggestion(self, app_name: str) -> Optional[str]:
+        """Retourne la suggestion en cache pour cette application (ou None)"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(app_name))
+    
+    def is_cached(self, app_name: str) -> bool:
+        """True si une suggestion valide est en cache (sans compter de hit)"""
+        return self.cache is not None and self._cache_key(app_name) in self.cache
+    
+    def _record_warmup(self, elapsed_ms: float, load_ms: float):
+        """Enregistre la latence d'un warm-up (le premier = cold start)"""
+        if self.latency_stats['cold_start_ms'] is None:
+            self.latency_stats['cold_start_ms'] = elapsed_ms
+            self.latency_stats['cold_load_ms'] = load_ms
+            print(f"🔥 Modèle {self.model} chargé en {elapsed_ms / 1000:.1f}s")
+        else:
+            self.latency_stats['warm_ms'] = elapsed_ms
+        self.latency_stats['warmups'] += 1
+    
+    def _build_generate_payload(self, app_name: str, context: str, stream: bool) -> Dict[str, Any]:
+        """
+        Construit la requête /api/generate pour une suggestion
+        
+        Si les tokens `context` du préfixe de la catégorie sont connus, seul le
+        suffixe (application + contexte) est envoyé : Ollama n'évalue que lui.
+        Sinon le prompt complet commence par le préfixe, identique d'un appel à
+        l'autre, ce qui permet au serveur de réutiliser son cache KV.
+        """
+        # Obtenir la catégorie de l'application
+        app_category = app_mapper.get_app_category(app_name)
+        
+        payload = {
+            "model": self.model,
+            "stream": stream,
+            "keep_alive": settings.ollama.keep_alive,
+            "options": {
+                "temperature": settings.ollama.temperature,
+                "num_predict": settings.ollama.max_tokens
+            }
+        }
+        
+        prefix_context = self._prefix_contexts.get(self._prefix_key(app_category))
+        if prefix_context and settings.ollama.prompt_context_reuse:
+            payload["prompt"] = self._prompt_suffix(app_name, context)
+            payload["context"] = prefix_context
+        else:
+            payload["prompt"] = self._create_contextual_prompt(app_name, context, app_category)
+        
+        return payload
+    
+    def _create_contextual_prompt(self, app_name: str, context: str, category: str) -> str:
+        """Crée un prompt adapté au contexte (préfixe stable + suffixe variable)"""
+        return self._prompt_prefix(category) + self._prompt_suffix(app_name, context)
+    
+    def _prompt_prefix(self, category: str) -> str:
+        """Partie du prompt commune à toutes les applications d'une catégorie (octet pour octet)"""
+        # Prompts spécialisés par catégorie
+        category_specific = CATEGORY_EXAMPLES.get(category, "")
+        
+        return f"""Tu es un assistant de productivité qui aide l'utilisateur selon son contexte actuel.
+Pour chaque situation, donne UN conseil pratique et spécifique (1-2 phrases maximum).
+
+Catégorie: {category}
+{category_specific}"""
+
+    def _prompt_suffix(self, app_name: str, context: str) -> str:
+        """Partie du prompt propre à l'application et au contexte"""
+        return f"""
+Application: {app_name}
+Contexte: {context}
+
+Réponds avec un émoji et un conseil court:"""
+
+    def _prefix_key(self, category: str) -> Tuple[str, str, int]:
+        """Clé des tokens de préfixe mémorisés (modèle, catégorie, version du prompt)"""
+        return (self.model, category, PROMPT_TEMPLATE_VERSION)
+    
+    def _needs_priming(self, category: str) -> bool:
+        """True si le préfixe de cette catégorie n'a pas encore été évalué par Ollama"""
+        return (settings.ollama.prompt_context_reuse
+                and self._prefix_key(category) not in self._prefix_contexts)
+    
+    def _build_priming_payload(self, category: str) -> Dict[str, Any]:
+        """
+        Requête qui fait évaluer le préfixe seul et renvoie ses tokens `context`
+        
+        Préfixe nu et aucun token généré : le contexte mémorisé est exactement
+        le début du prompt complet, sans consigne ni réponse ajoutées.
+        """
+        return {
+            "model": self.model,
+            "prompt": self._prompt_prefix(category),
+            "stream": False,
+            "keep_alive": settings.ollama.keep_alive,
+            "options": {"temperature": 0, "num_predict": 0}
+        }
+    
+    def _store_prefix_context(self, category: str, data: Dict[str, Any]) -> bool:
+        """Mémorise les tokens `context` renvoyés par la requête d'amorçage"""
+        # Liste vide si le serveur ne renvoie pas `context` : prompt complet, sans nouvel essai
+        tokens = data.get("context") or []
+        self._prefix_contexts[self._prefix_key(category)] = tokens
+        if not tokens:
+            return False
+        
+        self.prompt_stats['primed'] += 1
+        self._record_prompt_eval(data, reused=False)
+        return True
+    
+    def _record_generation(self, data: Dict[str, Any], start: float, reused: bool):
+        """Enregistre les métriques de la réponse finale d'une génération"""
+        self._record_prompt_eval(data, reused)
+        llm_metrics.record_generation(self.model, data, time.perf_counter() - start)
+    
+    def _record_prompt_eval(self, data: Dict[str, Any], reused: bool):
+        """Cumule prompt_eval_count / prompt_eval_duration d'une réponse finale d'Ollama"""
+        self.prompt_stats['requests'] += 1
+        self.prompt_stats['prompt_eval_count'] += data.get("prompt_eval_count", 0)
+        self.prompt_stats['prompt_eval_ms'] += data.get("prompt_eval_duration", 0) / 1e6
+        if reused:
+            self.prompt_stats['context_reused'] += 1
+    
+    def _clean_suggestion(self, suggestion: str) -> str:
+        """Nettoie la réponse de l'IA"""
+        # Supprimer les préfixes courants
+        prefixes_to_remove = [
+            "Voici un conseil :",
+            "Conseil :",
+            "Astuce :",
+            "💡",
+            "Suggestion :"
+        ]
+        
+        cleaned = suggestion
+        for prefix in prefixes_to_remove:
+            if cleaned.startswith(prefix):
+                cleaned = cleaned[len(prefix):].strip()
+        
+        # Limiter la longueur
+        if len(cleaned) > 200:
+            cleaned = cleaned[:197] + "..."
+        
+        return cleaned
+
+
+class OllamaClient(OllamaClientBase):
+    """Client pour l'API Ollama"""
+    
+    def __init__(self, base_url: str = None, model: str = None,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[SuggestionCache] = None):
+        super().__init__(base_url, model, cache)
+        
+        # Session partagée par tous les appels (keep-alive vers localhost:11434)
+        self._owns_session = session is None
+        self.session = session or create_http_session()
+        
+        # Reconnexion en arrière-plan (backoff exponentiel du disjoncteur)
+        self._reconnect_timer: Optional[threading.Timer] = None
+        self._reconnect_lock = threading.Lock()
+        self._closed = False
+        
         # Vérifier la connexion au démarrage
         self.check_connection()
     
+    def _timeout(self, read_timeout: float) -> Tuple[float, float]:
+        """Timeout (connexion, lecture) pour un endpoint"""
+        return (settings.ollama.connect_timeout, read_timeout)
+    
+    def close(self):
+        """Ferme les connexions du pool et persiste le cache"""
+        with self._reconnect_lock:
+            self._closed = True
+            if self._reconnect_timer:
+                self._reconnect_timer.cancel()
+        
+        if self.cache is not None:
+            self.cache.save()
+        if self._owns_session:
+            self.session.close()
+    
     def check_connection(self) -> bool:
         """Vérifie si Ollama est accessible"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=3)
+            response = self.session.get(
+                f"{self.base_url}/api/tags",
+                timeout=self._timeout(settings.ollama.tags_timeout)
+            )
             self.available = response.status_code == 200
             
             if self.available:
@@ -33,7 +365,7 @@ class OllamaClient:
             else:
                 self.last_error = f"HTTP {response.status_code}"
                 print(f"❌ Ollama non accessible: {self.last_error}")
-                
+        
         except requests.exceptions.ConnectionError:
             self.available = False
             self.last_error = "Connexion refusée"
@@ -47,15 +379,62 @@ class OllamaClient:
             self.last_error = str(e)
             print(f"❌ Erreur connexion Ollama: {e}")
         
+        if self.available:
+            self.breaker.record_success()
+        else:
+            self._on_connection_lost(self.last_error)
+        
         return self.available
     
+    def _on_connection_lost(self, error: str = "Connexion perdue"):
+        """Ollama injoignable : ouvrir le circuit et planifier une reconnexion"""
+        super()._on_connection_lost(error)
+        self._schedule_reconnect()
+    
+    def _schedule_reconnect(self):
+        """Planifie une tentative de reconnexion à la fin du délai du disjoncteur"""
+        with self._reconnect_lock:
+            if self._closed or self._reconnect_timer is not None:
+                return
+            
+            self._reconnect_timer = threading.Timer(self.breaker.time_until_retry(), self._reconnect)
+            self._reconnect_timer.daemon = True
+            self._reconnect_timer.start()
+    
+    def _reconnect(self):
+        """Tentative de reconnexion (thread du timer, jamais un thread de génération)"""
+        with self._reconnect_lock:
+            self._reconnect_timer = None
+            if self._closed:
+                return
+        
+        if self.available:
+            return
+        
+        if self.breaker.allow_request():
+            # Échec : check_connection rouvre le circuit et replanifie
+            self.check_connection()
+        elif self.breaker.state == CircuitBreaker.OPEN:
+            self._schedule_reconnect()
+    
+    def _acquire_circuit(self) -> bool:
+        """True si une génération peut être envoyée à Ollama"""
+        if not self.breaker.allow_request():
+            return False
+        
+        # Circuit semi-ouvert après une perte de connexion : vérifier avant de générer
+        return self.available or self.check_connection()
+    
     def get_available_models(self) -> list:
         """Récupère la liste des modèles disponibles"""
         if not self.available:
             return []
         
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(
+                f"{self.base_url}/api/tags",
+                timeout=self._timeout(settings.ollama.models_timeout)
+            )
             if response.status_code == 200:
                 data = response.json()
                 return [model['name'] for model in data.get('models', [])]
@@ -66,122 +445,216 @@ class OllamaClient:
     
     def generate_suggestion(self, app_name: str, context: str) -> str:
         """Génère une suggestion contextuelle"""
-        if not self.available:
-            return f"🔌 Ollama non connecté ({self.last_error or 'Inconnu'})"
-        
-        # Obtenir la catégorie de l'application
-        app_category = app_mapper.get_app_category(app_name)
+        cached = self.get_cached_suggestion(app_name)
+        if cached:
+            return cached
         
-        # Créer un prompt adapté
-        prompt = self._create_contextual_prompt(app_name, context, app_category)
+        if not self._acquire_circuit():
+            return self._unavailable_message()
         
+        read_timeout = self._generation_timeout(stream=False)
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": settings.ollama.temperature,
-                    "num_predict": settings.ollama.max_tokens
-                }
-            }
+            # Timeout ou connexion perdue pendant l'amorçage : traités comme pour la génération
+            self.prime_prefix(app_mapper.get_app_category(app_name))
+            payload = self._build_generate_payload(app_name, context, stream=False)
             
-            response = requests.post(
+            start = time.perf_counter()
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=settings.ollama.timeout
+                timeout=self._timeout(read_timeout)
             )
             
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self._record_generation_success(False, time.perf_counter() - start)
+            
             if response.status_code == 200:
                 result = response.json()
+                self._record_generation(result, start, reused="context" in payload)
                 suggestion = result.get("response", "").strip()
                 
                 if suggestion:
-                    return self._clean_suggestion(suggestion)
+                    cleaned = self._clean_suggestion(suggestion)
+                    if self.cache is not None:
+                        self.cache.put(self._cache_key(app_name), cleaned)
+                    return cleaned
                 else:
                     return "🤔 Pas de suggestion pour le moment"
             else:
                 return f"❌ Erreur Ollama: HTTP {response.status_code}"
-                
+        
         except requests.exceptions.Timeout:
+            self._record_generation_timeout(False)
             return "⏱️ Timeout - Ollama surchargé"
         except requests.exceptions.ConnectionError:
-            self.available = False
+            self._on_connection_lost()
             return "🔌 Connexion perdue avec Ollama"
         except Exception as e:
+            self.breaker.record_failure()
             print(f"Erreur génération: {e}")
             return "🔄 Erreur lors de la génération"
     
-    def _create_contextual_prompt(self, app_name: str, context: str, category: str) -> str:
-        """Crée un prompt adapté au contexte"""
-        base_prompt = f"""Tu es un assistant de productivité qui aide l'utilisateur selon son contexte actuel.
-
-Application: {app_name}
-Catégorie: {category}
-Contexte: {context}
-
-Donne UN conseil pratique et spécifique (1-2 phrases maximum) pour cette situation.
-"""
+    def stream_suggestion(self, app_name: str, context: str,
+                          cancel_event: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Génère une suggestion en streaming
         
-        # Prompts spécialisés par catégorie
-        category_prompts = {
-            'Navigation': """
-Exemples de conseils pour navigateurs:
-- "Essaie Ctrl+Shift+T pour rouvrir un onglet fermé !"
-- "Utilise Ctrl+L pour aller directement à la barre d'adresse."
-- "Ctrl+Shift+N pour ouvrir une fenêtre de navigation privée."
-""",
-            'Développement': """
-Exemples de conseils pour développement:
-- "N'oublie pas Ctrl+Shift+P pour la palette de commandes !"
-- "Utilise Ctrl+` pour ouvrir/fermer le terminal intégré."
-- "F12 pour déboguer ton code pas à pas."
-""",
-            'Bureautique': """
-Exemples de conseils pour bureautique:
-- "Ctrl+S pour sauvegarder régulièrement ton travail !"
-- "F7 pour vérifier l'orthographe de ton document."
-- "Utilise les styles pour une mise en forme cohérente."
-""",
-            'Système': """
-Exemples de conseils pour système:
-- "Tape 'cls' pour nettoyer l'écran."
-- "Utilise Tab pour l'autocomplétion."
-- "Flèche haut pour rappeler la dernière commande."
-""",
-            'Communication': """
-Exemples de conseils pour communication:
-- "Utilise @nom pour mentionner quelqu'un."
-- "Ctrl+Shift+M pour couper/remettre le micro."
-- "Organise tes conversations avec des dossiers."
-"""
-        }
+        Lit les chunks NDJSON d'Ollama au fil de l'eau et produit à chaque
+        chunk le texte nettoyé cumulé (le dernier élément est la suggestion finale).
+        Si `cancel_event` est levé, la connexion est fermée (Ollama arrête la
+        génération) et rien n'est mis en cache.
+        """
+        cached = self.get_cached_suggestion(app_name)
+        if cached:
+            yield cached
+            return
         
-        category_specific = category_prompts.get(category, "")
+        if not self._acquire_circuit():
+            yield self._unavailable_message()
+            return
+        
+        text = ""
+        read_timeout = self._generation_timeout(stream=True)
+        try:
+            # Timeout ou connexion perdue pendant l'amorçage : traités comme pour la génération
+            self.prime_prefix(app_mapper.get_app_category(app_name))
+            if cancel_event is not None and cancel_event.is_set():
+                # Annulée avant d'envoyer la génération : le test reste à faire
+                self.breaker.abandon_probe()
+                return
+            payload = self._build_generate_payload(app_name, context, stream=True)
+            
+            start = time.perf_counter()
+            first_chunk = True
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=self._timeout(read_timeout),
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    if response.status_code >= 500:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    yield f"❌ Erreur Ollama: HTTP {response.status_code}"
+                    return
+                
+                for line in response.iter_lines():
+                    if first_chunk:
+                        # Le timeout de lecture porte sur l'attente entre deux chunks :
+                        # on mesure l'attente du premier (chargement + prompt)
+                        first_chunk = False
+                        self._record_generation_success(True, time.perf_counter() - start)
+                    
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    
+                    if not line:
+                        continue
+                    
+                    chunk = json.loads(line)
+                    delta = chunk.get("response", "")
+                    if delta:
+                        text += delta
+                        cleaned = self._clean_suggestion(text.strip())
+                        if cleaned:
+                            yield cleaned
+                    
+                    if chunk.get("done"):
+                        # Le dernier chunk porte les métriques de la génération
+                        self._record_generation(chunk, start, reused="context" in payload)
+                        break
+            
+            if first_chunk:
+                # Réponse vide : Ollama a tout de même répondu
+                self.breaker.record_success()
+            
+            if not text.strip():
+                yield "🤔 Pas de suggestion pour le moment"
+            elif self.cache is not None:
+                self.cache.put(self._cache_key(app_name), self._clean_suggestion(text.strip()))
         
-        return base_prompt + category_specific + "\nRéponds avec un émoji et un conseil court:"
+        except requests.exceptions.Timeout:
+            self._record_generation_timeout(True)
+            # Garder le texte déjà affiché s'il y en a
+            if not text.strip():
+                yield "⏱️ Timeout - Ollama surchargé"
+        except requests.exceptions.ConnectionError:
+            self._on_connection_lost()
+            if not text.strip():
+                yield "🔌 Connexion perdue avec Ollama"
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"Erreur génération (stream): {e}")
+            yield "🔄 Erreur lors de la génération"
     
-    def _clean_suggestion(self, suggestion: str) -> str:
-        """Nettoie la réponse de l'IA"""
-        # Supprimer les préfixes courants
-        prefixes_to_remove = [
-            "Voici un conseil :",
-            "Conseil :",
-            "Astuce :",
-            "💡",
-            "Suggestion :"
-        ]
+    def warm_up(self) -> bool:
+        """
+        Charge le modèle dans Ollama sans générer de token
         
-        cleaned = suggestion
-        for prefix in prefixes_to_remove:
-            if cleaned.startswith(prefix):
-                cleaned = cleaned[len(prefix):].strip()
+        Une requête /api/generate sans prompt charge le modèle et (re)lance son
+        délai `keep_alive`. Le premier appel mesure le cold start, les suivants
+        la latence à chaud.
+        """
+        if not self.available:
+            return False
         
-        # Limiter la longueur
-        if len(cleaned) > 200:
-            cleaned = cleaned[:197] + "..."
+        try:
+            start = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": settings.ollama.keep_alive},
+                # Le chargement initial peut être bien plus long qu'une génération
+                timeout=self._timeout(max(settings.ollama.timeout, 60))
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            if response.status_code != 200:
+                print(f"❌ Warm-up Ollama: HTTP {response.status_code}")
+                return False
+            
+            load_ms = response.json().get("load_duration", 0) / 1e6
+            self._record_warmup(elapsed_ms, load_ms)
+            return True
         
-        return cleaned
+        except requests.exceptions.ConnectionError:
+            self._on_connection_lost()
+            return False
+        except Exception as e:
+            print(f"Erreur warm-up: {e}")
+            return False
+    
+    def prime_prefix(self, category: str) -> bool:
+        """
+        Fait évaluer une fois le préfixe d'une catégorie et garde ses tokens `context`
+        
+        Les générations suivantes de la catégorie n'envoient que le suffixe.
+        En cas d'échec, elles envoient le prompt complet.
+        
+        Timeout et perte de connexion sont propagés : la génération appelante
+        les signale au disjoncteur et au timeout adaptatif et s'arrête sans
+        attendre une seconde fois.
+        """
+        if not self._needs_priming(category):
+            return True
+        
+        response = self.session.post(
+            f"{self.base_url}/api/generate",
+            json=self._build_priming_payload(category),
+            timeout=self._timeout(self._generation_timeout(stream=False))
+        )
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        try:
+            if response.status_code == 200:
+                return self._store_prefix_context(category, response.json())
+        except ValueError as e:
+            print(f"Erreur amorçage du prompt ({category}): {e}")
+        
+        return False
     
     def test_model(self, test_prompt: str = "Dis bonjour en une phrase.") -> Dict[str, Any]:
         """Teste le modèle avec un prompt simple"""
@@ -193,13 +666,14 @@ Exemples de conseils pour communication:
                 "model": self.model,
                 "prompt": test_prompt,
                 "stream": False,
+                "keep_alive": settings.ollama.keep_alive,
                 "options": {"num_predict": 50}
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=10
+                timeout=self._timeout(settings.ollama.test_timeout)
             )
             
             if response.status_code == 200:
@@ -212,6 +686,6 @@ Exemples de conseils pour communication:
                 }
             else:
                 return {"success": False, "error": f"HTTP {response.status_code}"}
-                
+        
         except Exception as e:
             return {"success": False, "error": str(e)}
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Historique borné des processus observés par SystemMonitor
+"""
+
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+
+class TimestampRing:
+    """Derniers horodatages d'un processus dans un tampon circulaire compact (array('d'))"""
+    
+    __slots__ = ('create_time', 'values', 'next_index', 'count')
+    
+    def __init__(self, capacity: int, create_time: float):
+        self.create_time = create_time
+        self.values = array('d', bytes(8 * capacity))
+        self.next_index = 0
+        self.count = 0
+    
+    def append(self, timestamp: float):
+        self.values[self.next_index] = timestamp
+        self.next_index = (self.next_index + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+    
+    def latest(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self.values[self.next_index - 1]
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def footprint(self) -> int:
+        """Taille mémoire approximative (octets)"""
+        return sys.getsizeof(self) + sys.getsizeof(self.values)
+
+
+class ProcessHistory:
+    """
+    Historique des scans par pid, borné en mémoire
+    
+    - au plus `ring_size` horodatages par processus (tampon circulaire)
+    - au plus `max_pids` processus : le moins récemment vu est évincé (LRU)
+    - les pid morts sont retirés à partir de l'ensemble des pid vivants que le
+      scan connaît déjà
+    - un pid réattribué (date de création différente) repart d'un historique vide
+    """
+    
+    def __init__(self, max_pids: int = 256, ring_size: int = 10):
+        self.max_pids = max_pids
+        self.ring_size = ring_size
+        self._entries: "OrderedDict[int, TimestampRing]" = OrderedDict()
+        
+        self.stats = {
+            'evicted': 0,  # Évincés par la limite LRU
+            'reaped': 0    # Retirés car le processus est mort
+        }
+    
+    def record(self, pid: int, create_time: float, timestamp: float) -> int:
+        """Ajoute un passage et retourne le nombre de passages connus pour ce processus"""
+        ring = self._entries.get(pid)
+        if ring is None or ring.create_time != create_time:
+            ring = TimestampRing(self.ring_size, create_time)
+            self._entries[pid] = ring
+        
+        self._entries.move_to_end(pid)
+        ring.append(timestamp)
+        
+        while len(self._entries) > self.max_pids:
+            self._entries.popitem(last=False)
+            self.stats['evicted'] += 1
+        
+        return len(ring)
+    
+    def count(self, pid: int, create_time: float = None) -> int:
+        """Nombre de passages connus pour ce processus (0 si inconnu)"""
+        ring = self._entries.get(pid)
+        if ring is None or (create_time is not None and ring.create_time != create_time):
+            return 0
+        return len(ring)
+    
+    def discard(self, pids: Iterable[int]) -> int:
+        """Retire des pid (processus terminés)"""
+        removed = 0
+        for pid in pids:
+            if self._entries.pop(pid, None) is not None:
+                removed += 1
+        self.stats['reaped'] += removed
+        return removed
+    
+    def reap(self, live_pids: set) -> int:
+        """Retire tous les pid absents de l'ensemble des pid vivants"""
+        return self.discard([pid for pid in self._entries if pid not in live_pids])
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def memory_footprint(self) -> int:
+        """Taille mémoire approximative de l'historique (octets)"""
+        return sys.getsizeof(self._entries) + sum(ring.footprint() for ring in self._entries.values())
@@ -0,0 +1,189 @@
+"""
+Scan incrémental de la table des processus
+"""
+
+import time
+import psutil
+from typing import Callable, Dict, Iterable, List, Optional, Any
+
+
+class ProcessEntry:
+    """Processus connu du scanner (nom et date de création lus une seule fois)"""
+    
+    __slots__ = ('pid', 'name', 'create_time', 'process', 'interesting', 'cpu_time', 'sampled_at')
+    
+    def __init__(self, pid: int, name: str, create_time: float, process, interesting: bool):
+        self.pid = pid
+        self.name = name
+        self.create_time = create_time
+        self.process = process
+        self.interesting = interesting
+        
+        # Dernier échantillon CPU (user + system) pour le calcul par différence
+        self.cpu_time: Optional[float] = None
+        self.sampled_at = 0.0
+    
+    def sample_cpu(self, cpu_times, now: float) -> Optional[float]:
+        """
+        Enregistre un échantillon cpu_times() et retourne le % CPU depuis le précédent
+        
+        Sans intervalle bloquant (contrairement à `cpu_percent(interval=...)`) :
+        le premier échantillon d'un processus retourne None.
+        """
+        cpu_time = cpu_times.user + cpu_times.system
+        previous, previous_at = self.cpu_time, self.sampled_at
+        self.cpu_time, self.sampled_at = cpu_time, now
+        
+        if previous is None or now <= previous_at:
+            return None
+        return max(0.0, (cpu_time - previous) / (now - previous_at) * 100)
+
+
+class ProcessScanner:
+    """
+    Scanner incrémental des processus
+    
+    Au lieu de relire nom, date de création et mémoire de tous les processus à
+    chaque passage (`psutil.process_iter`), le scanner garde un cache
+    pid → (nom, date de création) :
+    - seuls les nouveaux pid sont lus
+    - les pid disparus sont oubliés
+    - la mémoire et les temps CPU ne sont relus que pour les processus
+      intéressants, après avoir vérifié que le pid n'a pas été réattribué
+      (date de création inchangée) ; le % CPU est calculé par différence
+      entre deux passages sur le même objet `psutil.Process`
+    
+    Un pid réattribué à un processus non intéressant entre deux passages n'est
+    pas détecté : tout le cache est donc revalidé tous les `full_rescan_every`
+    passages.
+    
+    Les pid de `exclude_pids` (l'assistant lui-même) ne sont jamais lus.
+    """
+    
+    def __init__(self, is_interesting: Callable[[str], bool],
+                 pids_func: Callable[[], Iterable[int]] = psutil.pids,
+                 process_factory: Callable[[int], Any] = psutil.Process,
+                 full_rescan_every: int = 60,
+                 clock: Callable[[], float] = time.monotonic,
+                 exclude_pids: Iterable[int] = ()):
+        self.is_interesting = is_interesting
+        self.exclude_pids = frozenset(exclude_pids)
+        self._pids_func = pids_func
+        self._process_factory = process_factory
+        self._clock = clock
+        self.full_rescan_every = full_rescan_every
+        self._entries: Dict[int, ProcessEntry] = {}
+        self.last_reaped: List[int] = []  # Pid disparus lors du dernier passage
+        
+        self.stats = {
+            'scans': 0,
+            'full_rescans': 0,
+            'stat_calls': 0,        # Processus lus (nom + date de création)
+            'memory_refreshes': 0,
+            'reaped': 0,            # Pid disparus retirés du cache
+            'reused_pids': 0        # Pid réattribués à un autre processus
+        }
+    
+    def scan(self) -> List[Dict[str, Any]]:
+        """
+        Met à jour le cache et retourne les processus intéressants
+        
+        Returns:
+            Liste de dicts {'pid', 'name', 'create_time', 'memory_info', 'cpu_percent'}
+            (même forme que `proc.info` de psutil ; cpu_percent vaut None au
+            premier passage d'un processus)
+        """
+        self.stats['scans'] += 1
+        full_rescan = self.full_rescan_every and self.stats['scans'] % self.full_rescan_every == 0
+        if full_rescan:
+            self.stats['full_rescans'] += 1
+        
+        current_pids = set(self._pids_func()) - self.exclude_pids
+        now = self._clock()
+        
+        # Oublier les processus terminés
+        self.last_reaped = list(self._entries.keys() - current_pids)
+        for pid in self.last_reaped:
+            del self._entries[pid]
+        self.stats['reaped'] += len(self.last_reaped)
+        
+        results = []
+        for pid in current_pids:
+            entry = self._entries.get(pid)
+            
+            if entry is None or (full_rescan and not self._is_same_process(entry)):
+                entry = self._stat(pid)
+                if entry is None:
+                    continue
+            
+            if not entry.interesting:
+                continue
+            
+            try:
+                if not full_rescan and not self._is_same_process(entry):
+                    # Pid réattribué : relire le nouveau processus
+                    entry = self._stat(pid)
+                    if entry is None or not entry.interesting:
+                        continue
+                
+                with entry.process.oneshot():
+                    memory_info = entry.process.memory_info()
+                    cpu_percent = entry.sample_cpu(entry.process.cpu_times(), now)
+                self.stats['memory_refreshes'] += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            
+            results.append({
+                'pid': pid,
+                'name': entry.name,
+                'create_time': entry.create_time,
+                'memory_info': memory_info,
+                'cpu_percent': cpu_percent
+            })
+        
+        return results
+    
+    def _stat(self, pid: int) -> Optional[ProcessEntry]:
+        """Lit nom et date de création d'un processus et l'ajoute au cache"""
+        previous = self._entries.pop(pid, None)
+        if previous is not None and previous.process is not None:
+            self.stats['reused_pids'] += 1
+        
+        self.stats['stat_calls'] += 1
+        try:
+            process = self._process_factory(pid)
+            with process.oneshot():
+                name = (process.name() or "").lower()
+                create_time = process.create_time()
+        except psutil.AccessDenied:
+            # Processus protégé : le mémoriser pour ne pas le relire à chaque passage
+            self._entries[pid] = ProcessEntry(pid, "", 0.0, None, False)
+            return None
+        except psutil.NoSuchProcess:
+            return None
+        
+        entry = ProcessEntry(pid, name, create_time, process, self.is_interesting(name))
+        self._entries[pid] = entry
+        return entry
+    
+    def _is_same_process(self, entry: ProcessEntry) -> bool:
+        """True si le pid désigne toujours le processus mis en cache"""
+        if entry.process is None:
+            # Processus protégé : relu à chaque revalidation complète
+            return False
+        try:
+            # is_running() compare la date de création du pid à celle mémorisée
+            return entry.process.is_running()
+        except psutil.Error:
+            return False
+    
+    def known_pids(self) -> set:
+        """Pid présents au dernier passage"""
+        return set(self._entries)
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'cached': len(self._entries)}
+    
+    def clear(self):
+        """Vide le cache (le prochain passage relit tous les processus)"""
+        self._entries.clear()
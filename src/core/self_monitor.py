@@ -0,0 +1,227 @@
+"""
+Empreinte de l'assistant lui-même : mémoire, CPU, threads, descripteurs
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from ..config.settings import settings
+
+# Sous-système d'un thread, d'après son nom (préfixe)
+SUBSYSTEM_THREADS = {
+    'MainThread': 'tk',
+    'system-monitor': 'monitor',
+    'x11-focus': 'monitor',
+    'voice-': 'voice',
+    'asyncio-loop': 'llm',  # Générations, préchargements et warm-up (boucle partagée)
+    'learning-writer': 'learning',
+    'timeline-writer': 'learning',
+    'self-monitor': 'self'
+}
+
+
+def thread_subsystem(thread_name: str) -> str:
+    """Sous-système auquel attribuer le CPU d'un thread"""
+    for prefix, subsystem in SUBSYSTEM_THREADS.items():
+        if thread_name.startswith(prefix):
+            return subsystem
+    return 'other'
+
+
+class SelfMonitor:
+    """
+    Échantillonnage périodique des ressources du processus de l'assistant
+    
+    Chaque échantillon (RSS, CPU, threads, descripteurs ouverts, CPU cumulé par
+    sous-système) est gardé dans un tampon circulaire exportable. Le CPU des
+    threads est attribué d'après leur nom ; le travail exécuté dans un thread
+    quelconque peut aussi être attribué explicitement avec `track()` (OCR) ;
+    il reste alors aussi compté dans le sous-système de son thread.
+    
+    Une alarme est levée quand un seuil de `MonitoringConfig` est franchi, et
+    levée de nouveau seulement après être repassée sous le seuil.
+    """
+    
+    def __init__(self, process: psutil.Process = None, clock: Callable[[], float] = time.monotonic):
+        config = settings.monitoring
+        self.process = process or psutil.Process()
+        self.interval = config.self_monitor_interval
+        self.samples = deque(maxlen=config.self_monitor_samples)
+        self._clock = clock
+        
+        self.thresholds = {
+            'rss_mb': config.alarm_rss_mb,
+            'cpu_percent': config.alarm_cpu_percent,
+            'threads': config.alarm_threads,
+            'open_fds': config.alarm_open_fds
+        }
+        self.active_alarms: Dict[str, float] = {}
+        self.alarm_callbacks: List[Callable[[str, float, float], None]] = []
+        
+        # CPU attribué explicitement (secondes de CPU du thread appelant)
+        self.tracked: Dict[str, float] = {}
+        self._local = threading.local()
+        
+        self._previous_cpu: Optional[float] = None
+        self._previous_at = 0.0
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        
+        self.stats = {
+            'samples': 0,
+            'alarms': 0,
+            'errors': 0
+        }
+    
+    def start(self):
+        """Démarre l'échantillonnage périodique"""
+        if not settings.monitoring.self_monitor_enabled or (self.thread and self.thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="self-monitor", daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=2)
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except psutil.Error as e:
+                self.stats['errors'] += 1
+                print(f"[SELF] Erreur échantillonnage: {e}")
+            self._stop_event.wait(self.interval)
+    
+    @contextmanager
+    def track(self, subsystem: str):
+        """Attribue à `subsystem` le CPU consommé par le thread courant dans le bloc"""
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                # Blocs imbriqués : seul le plus externe est compté
+                elapsed = time.thread_time() - start
+                with self._lock:
+                    self.tracked[subsystem] = self.tracked.get(subsystem, 0.0) + elapsed
+    
+    def sample(self) -> Dict[str, Any]:
+        """Prend un échantillon, vérifie les seuils et le retourne"""
+        now = self._clock()
+        with self.process.oneshot():
+            memory = self.process.memory_info()
+            cpu_times = self.process.cpu_times()
+            threads = self.process.threads()
+            open_fds = self.process.num_fds() if hasattr(self.process, 'num_fds') else self.process.num_handles()
+        
+        cpu_total = cpu_times.user + cpu_times.system
+        cpu_percent = None
+        if self._previous_cpu is not None and now > self._previous_at:
+            cpu_percent = (cpu_total - self._previous_cpu) / (now - self._previous_at) * 100
+        self._previous_cpu, self._previous_at = cpu_total, now
+        
+        sample = {
+            'timestamp': time.time(),
+            'rss_mb': memory.rss / (1024 * 1024),
+            'cpu_s': cpu_total,
+            'cpu_percent': cpu_percent,
+            'threads': len(threads),
+            'open_fds': open_fds,
+            'subsystems_cpu_s': self._subsystem_cpu(threads)
+        }
+        
+        with self._lock:
+            self.samples.append(sample)
+            self.stats['samples'] += 1
+        self._check_thresholds(sample)
+        return sample
+    
+    def _subsystem_cpu(self, threads) -> Dict[str, float]:
+        """CPU cumulé par sous-système (threads vivants + blocs suivis)"""
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+        per_subsystem: Dict[str, float] = {}
+        for thread in threads:
+            subsystem = thread_subsystem(names.get(thread.id, ''))
+            per_subsystem[subsystem] = per_subsystem.get(subsystem, 0.0) + thread.user_time + thread.system_time
+        
+        with self._lock:
+            for subsystem, cpu in self.tracked.items():
+                per_subsystem[subsystem] = per_subsystem.get(subsystem, 0.0) + cpu
+        return per_subsystem
+    
+    def _check_thresholds(self, sample: Dict[str, Any]):
+        for name, threshold in self.thresholds.items():
+            value = sample.get(name)
+            if value is None or not threshold:
+                continue
+            
+            if value >= threshold and name not in self.active_alarms:
+                self.active_alarms[name] = value
+                self.stats['alarms'] += 1
+                print(f"⚠️ [SELF] Seuil dépassé: {name} = {value:.1f} (seuil {threshold})")
+                for callback in self.alarm_callbacks:
+                    try:
+                        callback(name, value, threshold)
+                    except Exception as e:
+                        print(f"[SELF] Erreur callback alarme: {e}")
+            elif value < threshold and name in self.active_alarms:
+                del self.active_alarms[name]
+    
+    def on_alarm(self, callback: Callable[[str, float, float], None]):
+        """Enregistre un callback appelé avec (mesure, valeur, seuil)"""
+        self.alarm_callbacks.append(callback)
+    
+    def latest(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Résumé + échantillons du tampon (format de l'export JSON)"""
+        with self._lock:
+            samples = list(self.samples)
+        rss = [s['rss_mb'] for s in samples]
+        cpu = [s['cpu_percent'] for s in samples if s['cpu_percent'] is not None]
+        return {
+            'pid': self.process.pid,
+            'interval_s': self.interval,
+            'thresholds': self.thresholds,
+            'active_alarms': dict(self.active_alarms),
+            'summary': {
+                'rss_mb_max': max(rss) if rss else None,
+                'cpu_percent_mean': sum(cpu) / len(cpu) if cpu else None,
+                'cpu_percent_max': max(cpu) if cpu else None
+            },
+            'stats': dict(self.stats),
+            'samples': samples
+        }
+    
+    def export_json(self, path: str = None) -> Optional[str]:
+        """Écrit le tampon dans un fichier JSON (remplacement atomique)"""
+        path = path or settings.monitoring.self_monitor_file
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            print(f"[SELF] Erreur export: {e}")
+            return None
+
+
+# Instance globale
+self_monitor = SelfMonitor()
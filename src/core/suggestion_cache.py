@@ -0,0 +1,131 @@
+"""
+Cache des suggestions IA (LRU + expiration)
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+CacheKey = Tuple[str, str, str, int]
+
+
+class SuggestionCache:
+    """Cache borné des suggestions, indexé par (modèle, application, catégorie, version du prompt)"""
+    
+    def __init__(self, max_entries: int = 128, ttl: float = 3600, cache_file: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_file = Path(cache_file) if cache_file else None
+        
+        # clé -> (suggestion, date de création) ; ordre = du moins au plus récemment utilisé
+        self._entries: "OrderedDict[CacheKey, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+        
+        if self.cache_file:
+            self.load()
+    
+    @staticmethod
+    def make_key(model: str, app_name: str, category: str, template_version: int) -> CacheKey:
+        """Construit la clé de cache d'une suggestion"""
+        return (model, app_name, category, template_version)
+    
+    def get(self, key: CacheKey) -> Optional[str]:
+        """Retourne la suggestion en cache (None si absente ou expirée)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            suggestion, created_at = entry
+            if time.time() - created_at > self.ttl:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return suggestion
+    
+    def put(self, key: CacheKey, suggestion: str, created_at: float = None):
+        """Ajoute une suggestion (évince la moins récemment utilisée si plein)"""
+        with self._lock:
+            self._entries[key] = (suggestion, created_at or time.time())
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def __contains__(self, key: CacheKey) -> bool:
+        """Présence d'une entrée valide (sans toucher aux compteurs ni à l'ordre LRU)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.time() - entry[1] <= self.ttl
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+            }
+    
+    def load(self):
+        """Charge le cache persisté (en ignorant les entrées expirées)"""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            now = time.time()
+            loaded = 0
+            for key, suggestion, created_at in data.get('entries', []):
+                if now - created_at <= self.ttl:
+                    self.put(tuple(key), suggestion, created_at)
+                    loaded += 1
+            
+            print(f"[CACHE] {loaded} suggestions chargées")
+        except Exception as e:
+            print(f"[CACHE] Erreur chargement cache: {e}")
+    
+    def save(self):
+        """Persiste le cache sur disque (ordre LRU conservé)"""
+        if not self.cache_file:
+            return
+        
+        try:
+            with self._lock:
+                entries = [[list(key), suggestion, created_at]
+                           for key, (suggestion, created_at) in self._entries.items()]
+            
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'entries': entries}, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"[CACHE] Erreur sauvegarde cache: {e}")
@@ -0,0 +1,128 @@
+"""
+Préchargement des suggestions pour les applications probables suivantes
+"""
+
+import threading
+import time
+from typing import Dict, List, Any
+
+from ..config.settings import settings
+from ..utils.app_mapper import app_mapper
+
+
+class SuggestionPrefetcher:
+    """Remplit le cache de suggestions pendant que le LLM est libre"""
+    
+    def __init__(self, ollama_client, scheduler, learning_engine):
+        self.ollama_client = ollama_client
+        self.scheduler = scheduler
+        self.learning_engine = learning_engine
+        
+        # Préchargements terminés en attente d'utilisation : application -> date
+        # (prédictions du dernier changement d'application seulement)
+        self._pending: Dict[str, float] = {}
+        self._round = 0  # Incrémenté à chaque changement d'application réel
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'predicted': 0,
+            'issued': 0,
+            'completed': 0,
+            'hits': 0,     # Changement prédit effectivement survenu
+            'wasted': 0    # Préchargement jamais utilisé avant expiration
+        }
+    
+    def predict_next_apps(self, app_name: str) -> List[str]:
+        """Applications les plus probables après `app_name` (prédicteur de Markov)"""
+        if not self.learning_engine:
+            return []
+        
+        return self.learning_engine.predict_next_apps(app_name, k=settings.ollama.prefetch_max_apps)
+    
+    def prefetch_after(self, app_name: str):
+        """Lance le préchargement des suggestions probables après `app_name`"""
+        if not settings.ollama.prefetch_enabled or not self.ollama_client.available:
+            return
+        if self.scheduler.has_foreground_work():
+            # Une vraie demande attend déjà le LLM : ne pas prédire pour rien
+            return
+        
+        prediction_round = self._round
+        for next_app in self.predict_next_apps(app_name):
+            if next_app == app_name or self.ollama_client.is_cached(next_app):
+                continue
+            
+            self.stats['predicted'] += 1
+            job = self.scheduler.submit_background(
+                ("prefetch", next_app),
+                self._make_prefetch(next_app),
+                lambda _, app=next_app: self._on_prefetched(app, prediction_round)
+            )
+            if job is None:
+                # Une vraie demande est arrivée entre-temps
+                break
+            self.stats['issued'] += 1
+            
+            if settings.debug_mode:
+                print(f"[PREFETCH] {app_name} → {next_app}")
+    
+    def _make_prefetch(self, app_name: str):
+        """Tâche de fond : génère la suggestion pour la mettre en cache (annulée avec sa tâche)"""
+        context = app_mapper.get_context(app_name)
+        
+        async def prefetch() -> str:
+            suggestion = ""
+            async for suggestion in self.ollama_client.stream_suggestion(app_name, context):
+                pass
+            return suggestion
+        
+        return prefetch
+    
+    def _on_prefetched(self, app_name: str, prediction_round: int):
+        """Préchargement terminé (suggestion en cache)"""
+        if not self.ollama_client.is_cached(app_name):
+            return  # Erreur de génération : rien n'a été mis en cache
+        
+        with self._lock:
+            self.stats['completed'] += 1
+            if prediction_round != self._round:
+                # L'utilisateur a changé d'application avant la fin : trop tard
+                self.stats['wasted'] += 1
+                return
+            self._pending[app_name] = time.time()
+    
+    def record_switch(self, app_name: str):
+        """
+        À appeler à chaque changement d'application réel
+        
+        Les prédictions en attente sont réglées tout de suite : hit pour
+        l'application atteinte, préchargement inutile pour les autres.
+        """
+        with self._lock:
+            self._expire_pending()
+            if self._pending.pop(app_name, None) is not None:
+                # Entrée évincée du cache entre-temps : le préchargement n'a servi à rien
+                hit = self.ollama_client.is_cached(app_name)
+                self.stats['hits' if hit else 'wasted'] += 1
+            self.stats['wasted'] += len(self._pending)
+            self._pending.clear()
+            self._round += 1
+    
+    def _expire_pending(self):
+        """Les préchargements plus vieux que le TTL du cache sont perdus (verrou tenu)"""
+        deadline = time.time() - settings.ollama.cache_ttl
+        for app_name in [app for app, done_at in self._pending.items() if done_at < deadline]:
+            del self._pending[app_name]
+            self.stats['wasted'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs et précision du préchargement"""
+        with self._lock:
+            self._expire_pending()
+            resolved = self.stats['hits'] + self.stats['wasted']
+            return {
+                **self.stats,
+                'cancelled': self.scheduler.get_stats()['background_cancelled'],
+                'pending': len(self._pending),
+                'precision': self.stats['hits'] / resolved if resolved else 0.0
+            }
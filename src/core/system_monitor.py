@@ -2,28 +2,81 @@
 Surveillance du système et détection d'activité
 """
 
+import os
 import threading
 import time
-import psutil
 from typing import Callable, Dict, List, Tuple, Optional
 from ..config.settings import settings
-from ..utils.app_mapper import app_mapper
+from ..utils.app_mapper import app_mapper, normalize_process_name
+from .process_scanner import ProcessScanner
+from .process_history import ProcessHistory
+from .usage_timeline import usage_timeline
+from .monitor_backends import MonitorBackend, create_backend
+from .app_debouncer import AppChangeDebouncer
 
 
 class SystemMonitor:
     """Surveillance intelligente des processus système"""
     
-    def __init__(self, callback: Callable[[str, str], None]):
+    def __init__(self, callback: Callable[[str, str], None], process_backend: MonitorBackend = None):
+        """
+        Args:
+            callback: Appelé avec (application, contexte) à chaque changement
+            process_backend: Source des processus et du focus (défaut: système
+                réel, enregistré si `monitoring.record_file` est défini)
+        """
         self.callback = callback
+        self.process_backend = process_backend or create_backend()
         self.current_app = ""
         self.current_context = ""
         self.running = False
         self.thread: Optional[threading.Thread] = None
         
-        # Historique pour améliorer la détection
-        self.process_history: Dict[int, Dict] = {}
+        # Historique pour améliorer la détection (borné, pid morts retirés à chaque scan)
+        self.process_history = ProcessHistory(
+            max_pids=settings.monitoring.history_max_pids,
+            ring_size=settings.monitoring.history_ring_size
+        )
         self.app_usage_time: Dict[str, float] = {}
         self.last_detection_time = time.time()
+        self.timeline = usage_timeline  # Intervalles de focus persistés
+        
+        self.ignored_processes = frozenset(
+            normalize_process_name(name) for name in settings.monitoring.ignored_processes
+        )
+        
+        # Cache pid → (nom, date de création) : seuls les nouveaux processus sont lus
+        self.scanner = ProcessScanner(
+            self._should_monitor,
+            pids_func=self.process_backend.pids,
+            process_factory=self.process_backend.process,
+            clock=self.process_backend.monotonic,
+            # L'assistant (python) est une application connue : ne pas se détecter soi-même
+            exclude_pids=(os.getpid(),)
+        )
+        
+        # Intervalle adaptatif : court après un changement, puis backoff exponentiel
+        self.current_interval = settings.monitoring.min_check_interval
+        self._wake_event = threading.Event()
+        self.poll_stats = {
+            'polls': 0,
+            'changes': 0,
+            'activity_wakeups': 0
+        }
+        
+        # Anti-rebond entre la détection et le callback (chaque changement = un appel LLM)
+        self.debouncer = AppChangeDebouncer(
+            settings.monitoring.debounce_dwell_time,
+            settings.monitoring.debounce_score_margin,
+            focus_dwell_time=settings.monitoring.debounce_focus_dwell_time,
+            clock=self.process_backend.monotonic
+        )
+        self.last_scores: Dict[str, float] = {}  # Meilleur score par application au dernier scan
+        
+        # Suivi événementiel de la fenêtre active (Linux/X11), sinon polling psutil
+        self.focus_watcher = None
+        self.backend = "psutil"
+        self._lock = threading.Lock()
     
     def start(self):
         """Démarre la surveillance"""
@@ -31,66 +84,165 @@ class SystemMonitor:
             return
         
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        
+        if self._start_focus_watcher():
+            self.backend = self.focus_watcher.kind
+            print(f"🔍 Surveillance système démarrée (fenêtre active {self.backend})")
+            return
+        
+        self._start_polling()
         print("🔍 Surveillance système démarrée")
     
+    def _start_focus_watcher(self) -> bool:
+        """Démarre le suivi X11 si la configuration et la plateforme le permettent"""
+        self.focus_watcher = self.process_backend.create_focus_watcher(
+            self._on_focus_change, self._on_focus_lost
+        )
+        if self.focus_watcher and self.focus_watcher.start():
+            return True
+        
+        self.focus_watcher = None
+        return False
+    
+    def _start_polling(self):
+        """Démarre la boucle de polling (score psutil)"""
+        self.backend = "psutil"
+        self.thread = threading.Thread(target=self._monitor_loop, name="system-monitor", daemon=True)
+        self.thread.start()
+    
     def stop(self):
         """Arrête la surveillance"""
         self.running = False
+        self._wake_event.set()
+        self.debouncer.cancel()
+        if self.focus_watcher:
+            self.focus_watcher.stop()
+            self.focus_watcher = None
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2)
+        self.process_backend.close()
         print("⏹️ Surveillance système arrêtée")
     
+    def _on_focus_change(self, pid: Optional[int], proc_name: str, title: str):
+        """Nouvelle fenêtre active signalée par le serveur X"""
+        if not proc_name or pid == os.getpid():
+            # Fenêtre inconnue, ou fenêtre de l'assistant lui-même
+            return
+        
+        app_name = app_mapper.get_display_name(proc_name)
+        context = app_mapper.get_context(app_name)
+        
+        if settings.debug_mode:
+            print(f"[DEBUG] Fenêtre active: {app_name} (pid {pid}) - {title}")
+        
+        # Transmis seulement si la fenêtre garde le focus pendant le délai anti-rebond
+        self.debouncer.defer(app_name, lambda: self._notify_app(app_name, context))
+    
+    def _on_focus_lost(self):
+        """Connexion X perdue : revenir au polling psutil"""
+        self.focus_watcher = None
+        if self.running:
+            print("🔁 Retour à la détection par score (psutil)")
+            self._start_polling()
+    
+    def _notify_app(self, app_name: str, context: str) -> bool:
+        """Signale un changement d'application à l'UI (True si l'application a changé)"""
+        with self._lock:
+            if app_name == self.current_app:
+                return False
+            self._log_app_change(self.current_app, app_name)
+            self.current_app = app_name
+            self.current_context = context
+        
+        # Callback vers l'UI
+        self.callback(app_name, context)
+        return True
+    
+    def notify_activity(self):
+        """
+        Activité utilisateur détectée (ex: la fenêtre de l'assistant perd le focus)
+        
+        Relance un scan immédiat et repasse à l'intervalle minimal.
+        """
+        self.current_interval = settings.monitoring.min_check_interval
+        self.poll_stats['activity_wakeups'] += 1
+        self._wake_event.set()
+    
+    def _next_interval(self, changed: bool) -> float:
+        """Intervalle avant le prochain scan"""
+        config = settings.monitoring
+        if not config.adaptive_interval:
+            return config.check_interval
+        
+        if changed:
+            return config.min_check_interval
+        return min(config.max_check_interval, self.current_interval * config.interval_backoff)
+    
     def _monitor_loop(self):
         """Boucle principale de surveillance"""
         while self.running:
             try:
                 app_name, context = self._get_active_app_info()
+                self.poll_stats['polls'] += 1
                 
                 # Détecter seulement les vrais changements d'application
-                if app_name != self.current_app:
-                    self._log_app_change(self.current_app, app_name)
-                    self.current_app = app_name
-                    self.current_context = context
-                    
-                    # Callback vers l'UI
-                    self.callback(app_name, context)
+                changed = self._handle_detection(app_name, context)
+                if changed:
+                    self.poll_stats['changes'] += 1
                 
-                time.sleep(settings.monitoring.check_interval)
+                # Changement en attente de confirmation : garder l'intervalle court
+                self.current_interval = self._next_interval(changed or self.debouncer.pending is not None)
                 
+                # Attente interruptible (notify_activity, stop)
+                self._wake_event.wait(self.current_interval)
+                self._wake_event.clear()
+            
             except Exception as e:
                 print(f"Erreur dans la boucle de surveillance: {e}")
-                time.sleep(5)
+                self._wake_event.wait(5)
+                self._wake_event.clear()
+    
+    def _handle_detection(self, app_name: str, context: str) -> bool:
+        """Passe la détection d'un scan par l'anti-rebond (True si l'application a changé)"""
+        if not self.debouncer.observe(app_name, self._score_lead(app_name)):
+            return False
+        return self._notify_app(app_name, context)
+    
+    def _score_lead(self, app_name: str) -> Optional[float]:
+        """Avance de score de `app_name` sur l'application courante au dernier scan"""
+        if app_name not in self.last_scores:
+            return None
+        if self.current_app not in self.last_scores:
+            # L'application courante n'est plus détectée (fermée)
+            return float('inf')
+        return self.last_scores[app_name] - self.last_scores[self.current_app]
     
     def _get_active_app_info(self) -> Tuple[str, str]:
         """Analyse les processus pour déterminer l'application active"""
         try:
-            current_time = time.time()
+            current_time = self.process_backend.time()
             scored_apps = []
             
-            # Récupérer tous les processus intéressants
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'create_time', 'memory_info']):
-                try:
-                    proc_info = proc.info
-                    proc_name = proc_info['name'].lower()
-                    
-                    # Ignorer les processus système
-                    if proc_name in settings.monitoring.ignored_processes:
-                        continue
-                    
-                    # Filtrer les applications intéressantes
-                    if self._is_interesting_app(proc_name):
-                        score = self._calculate_app_score(proc_info, current_time)
-                        if score > 0:
-                            scored_apps.append({
-                                'name': proc_name,
-                                'score': score,
-                                'proc_info': proc_info
-                            })
-                
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            # Récupérer les processus intéressants (scan incrémental)
+            processes = self.scanner.scan()
+            
+            # Le scan connaît déjà les pid terminés : les retirer de l'historique
+            if self.scanner.last_reaped:
+                self.process_history.discard(self.scanner.last_reaped)
+            
+            for proc_info in processes:
+                score = self._calculate_app_score(proc_info, current_time)
+                if score > 0:
+                    scored_apps.append({
+                        'name': proc_info['name'],
+                        'score': score,
+                        'proc_info': proc_info
+                    })
+            
+            self.last_scores = {}
+            for app in scored_apps:
+                display_name = app_mapper.get_display_name(app['name'])
+                self.last_scores[display_name] = max(app['score'], self.last_scores.get(display_name, 0.0))
             
             # Trier par score et sélectionner le meilleur
             if scored_apps:
@@ -106,43 +258,19 @@ class SystemMonitor:
                 return app_display_name, context
             
             return "Système", "Activité de base"
-            
+        
         except Exception as e:
             print(f"[ERROR] Analyse processus: {e}")
             return "Inconnu", "Erreur de détection"
     
+    def _should_monitor(self, proc_name: str) -> bool:
+        """Processus à suivre : intéressant et non ignoré"""
+        return (normalize_process_name(proc_name) not in self.ignored_processes
+                and self._is_interesting_app(proc_name))
+    
     def _is_interesting_app(self, proc_name: str) -> bool:
         """Détermine si un processus est intéressant à surveiller"""
-        interesting_patterns = [
-            # Navigateurs
-            'chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe',
-            
-            # Éditeurs
-            'notepad.exe', 'notepad++.exe', 'code.exe', 'sublime_text.exe',
-            'atom.exe', 'vim.exe', 'emacs.exe',
-            
-            # Suite Office
-            'winword.exe', 'excel.exe', 'powerpnt.exe', 'outlook.exe',
-            
-            # Développement
-            'python.exe', 'node.exe', 'java.exe', 'javaw.exe',
-            'pycharm64.exe', 'idea64.exe', 'devenv.exe',
-            
-            # Communication
-            'discord.exe', 'slack.exe', 'teams.exe', 'zoom.exe',
-            'telegram.exe', 'whatsapp.exe',
-            
-            # Multimédia
-            'spotify.exe', 'vlc.exe', 'photoshop.exe', 'gimp.exe',
-            
-            # Gaming
-            'steam.exe', 'origin.exe', 'epicgameslauncher.exe',
-            
-            # Système (si pas dans ignored)
-            'cmd.exe', 'powershell.exe', 'explorer.exe'
-        ]
-        
-        return proc_name in interesting_patterns
+        return app_mapper.is_interesting(proc_name)
     
     def _calculate_app_score(self, proc_info: Dict, current_time: float) -> float:
         """Calcule un score d'activité pour un processus"""
@@ -159,25 +287,21 @@ class SystemMonitor:
             memory_mb = memory_info.rss / (1024 * 1024) if memory_info else 0
             memory_score = min(50, memory_mb / settings.monitoring.score_memory_threshold * 50)
             
+            # Score basé sur l'activité CPU depuis le scan précédent (absent au premier scan)
+            cpu_percent = proc_info.get('cpu_percent') or 0.0
+            cpu_score = min(30, cpu_percent / settings.monitoring.score_cpu_threshold * 30)
+            
             # Bonus pour les applications qu'on suit depuis longtemps
-            history_bonus = 0
-            if pid in self.process_history:
-                history_bonus = min(20, len(self.process_history[pid]) * 2)
+            history_bonus = min(20, self.process_history.count(pid, create_time) * 2)
             
             # Score total
-            total_score = recency_score + memory_score + history_bonus
+            total_score = recency_score + memory_score + cpu_score + history_bonus
             
-            # Mettre à jour l'historique
-            if pid not in self.process_history:
-                self.process_history[pid] = []
-            self.process_history[pid].append(current_time)
-            
-            # Nettoyer l'historique (garder seulement les 10 dernières entrées)
-            if len(self.process_history[pid]) > 10:
-                self.process_history[pid] = self.process_history[pid][-10:]
+            # Mettre à jour l'historique (tampon circulaire des derniers passages)
+            self.process_history.record(pid, create_time, current_time)
             
             return total_score
-            
+        
         except Exception as e:
             print(f"Erreur calcul score: {e}")
             return 0
@@ -195,26 +319,33 @@ class SystemMonitor:
                 self.app_usage_time[old_app] = usage_time
         
         self.last_detection_time = current_time
+        self.timeline.record_focus(new_app, current_time)
         
         if settings.debug_mode and old_app and new_app != old_app:
             print(f"[CHANGEMENT] {old_app} → {new_app}")
     
     def get_usage_stats(self) -> Dict[str, float]:
         """Retourne les statistiques d'utilisation des applications"""
+        stats = self.app_usage_time.copy()
+        
         # Ajouter le temps de l'app actuelle
         if self.current_app:
             current_time = time.time()
             additional_time = current_time - self.last_detection_time
             
-            stats = self.app_usage_time.copy()
             if self.current_app in stats:
                 stats[self.current_app] += additional_time
             else:
                 stats[self.current_app] = additional_time
-            
-            return stats
         
-        return self.app_usage_time.copy()
+        return stats
+    
+    def get_memory_stats(self) -> Dict[str, int]:
+        """Taille de l'historique des processus (nombre de pid suivis, octets approximatifs)"""
+        return {
+            'process_history_pids': len(self.process_history),
+            'process_history_bytes': self.process_history.memory_footprint()
+        }
     
     def reset_stats(self):
         """Remet à zéro les statistiques"""
@@ -224,12 +355,12 @@ class SystemMonitor:
         print("📊 Statistiques remises à zéro")
     
     def cleanup_old_processes(self):
-            """Nettoie l'historique des processus morts"""
-            current_pids = set(proc.info['pid'] for proc in psutil.process_iter(['pid']))
-            old_pids = set(self.process_history.keys()) - current_pids
-            
-            for pid in old_pids:
-                del self.process_history[pid]
-            
-            if old_pids and settings.debug_mode:
-                print(f"[CLEANUP] {len(old_pids)} processus morts nettoyés")
\ No newline at end of file
+        """
+        Nettoie l'historique des processus morts
+        
+        Fait automatiquement à chaque scan ; utile en mode X11 (pas de scan).
+        """
+        removed = self.process_history.reap(set(self.process_backend.pids()))
+        
+        if removed and settings.debug_mode:
+            print(f"[CLEANUP] {removed} processus morts nettoyés")
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Matrice de transitions entre applications, mise à jour incrémentalement
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+
+class TransitionMatrix:
+    """
+    Comptes depuis → vers pondérés par ancienneté
+    
+    Chaque arête garde (poids, date de mise à jour) : le poids est divisé par
+    deux tous les `half_life` secondes. Une transition se met à jour en O(1)
+    (décroissance paresseuse de la seule arête concernée) et les successeurs
+    d'une application se lisent en O(nombre de successeurs).
+    """
+    
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self._decay_rate = math.log(2) / half_life
+        self.edges: Dict[str, Dict[str, List[float]]] = {}
+        self.total = 0
+    
+    def _decayed(self, weight: float, updated_at: float, now: float) -> float:
+        return weight * math.exp(-self._decay_rate * max(0.0, now - updated_at))
+    
+    def record(self, from_app: str, to_app: str, timestamp: float):
+        """Ajoute une transition (poids 1 à `timestamp`)"""
+        targets = self.edges.setdefault(from_app, {})
+        edge = targets.get(to_app)
+        if edge is None:
+            targets[to_app] = [1.0, timestamp]
+        else:
+            # Transitions rejouées dans le désordre : vieillir la nouvelle plutôt que l'existante
+            if timestamp >= edge[1]:
+                edge[0] = self._decayed(edge[0], edge[1], timestamp) + 1.0
+                edge[1] = timestamp
+            else:
+                edge[0] += self._decayed(1.0, timestamp, edge[1])
+        self.total += 1
+    
+    def successors(self, from_app: str, now: float, min_weight: float = 0.0) -> List[Tuple[str, float]]:
+        """(application, poids actuel) suivant `from_app`, du plus fréquent au moins fréquent"""
+        weighted = [
+            (to_app, self._decayed(weight, updated_at, now))
+            for to_app, (weight, updated_at) in self.edges.get(from_app, {}).items()
+        ]
+        weighted = [(app, weight) for app, weight in weighted if weight >= min_weight]
+        weighted.sort(key=lambda item: item[1], reverse=True)
+        return weighted
+    
+    def clear(self):
+        self.edges.clear()
+        self.total = 0
@@ -0,0 +1,326 @@
+"""
+Chronologie fine de l'utilisation des applications (intervalles de focus)
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.batch_writer import BatchWriter
+
+# Enregistrement binaire d'un intervalle : id application, début, fin (secondes epoch)
+RECORD = struct.Struct("<Idd")
+
+
+def _day_ordinal(timestamp: float) -> int:
+    """Jour local (ordinal) contenant l'horodatage"""
+    return datetime.fromtimestamp(timestamp).toordinal()
+
+
+def _day_start(ordinal: int) -> float:
+    """Horodatage de minuit (heure locale) du jour donné"""
+    return datetime.combine(date.fromordinal(ordinal), datetime.min.time()).timestamp()
+
+
+class UsageTimeline:
+    """
+    Intervalles de focus (application, début, fin), en ajout seul
+    
+    Stockage en colonnes (`array`) : 20 octets par intervalle en mémoire comme
+    sur disque. Les intervalles sont triés et disjoints, une requête par plage
+    de temps se fait donc par recherche dichotomique ; les cumuls par jour
+    évitent de parcourir les jours entièrement couverts.
+    
+    Fichiers (dans `directory`) :
+    - timeline.bin : enregistrements `RECORD` ajoutés en fin de fichier
+    - apps.json : noms des applications (indice = id)
+    
+    Les intervalles sont ajoutés sur disque tous les `flush_every` intervalles,
+    ou dès que le plus ancien non écrit a plus de `flush_age` secondes : un
+    arrêt brutal ne perd jamais plus que ces intervalles récents.
+    
+    Avec `background`, ces écritures sont faites par le thread
+    "timeline-writer" : `record_focus` (surveillance) n'écrit jamais.
+    """
+    
+    def __init__(self, directory: str, flush_every: int = 20, flush_age: float = 60.0,
+                 background: bool = False):
+        self.directory = Path(directory)
+        self.flush_every = flush_every
+        self.flush_age = flush_age
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # Écritures disque, hors du verrou des données
+        # Mêmes seuils côté thread : lot de flush_every intervalles ou attente de flush_age
+        self.writer = BatchWriter(
+            "timeline-writer", lambda _: self.flush(), batch_size=flush_every, flush_interval=flush_age
+        ) if background else None
+        self._shut_down = False
+        self._reset()
+    
+    def _reset(self):
+        self.apps: List[str] = []
+        self.app_ids: Dict[str, int] = {}
+        self.app_column = array('I')
+        self.start_column = array('d')
+        self.end_column = array('d')
+        
+        # Cumuls journaliers : jour → {id application: secondes}
+        self.daily: Dict[int, Dict[int, float]] = {}
+        self._day_bounds = (0, 0.0, 0.0)  # Dernier jour utilisé : (jour, minuit, minuit suivant)
+        
+        # Intervalle en cours (application au premier plan)
+        self.open_app: Optional[str] = None
+        self.open_start = 0.0
+        
+        self._flushed = 0
+        self._apps_flushed = 0
+    
+    # --- Écriture ---------------------------------------------------------
+    
+    def record_focus(self, app_name: str, timestamp: float = None):
+        """L'application passe au premier plan : ferme l'intervalle en cours"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if app_name == self.open_app:
+                return
+            self.close(timestamp)
+            self.open_app = app_name
+            self.open_start = timestamp
+    
+    def close(self, timestamp: float = None):
+        """Ferme l'intervalle en cours (mise en veille, arrêt)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self.open_app is not None:
+                self.add_interval(self.open_app, self.open_start, timestamp)
+            self.open_app = None
+    
+    def add_interval(self, app_name: str, start: float, end: float):
+        """Ajoute un intervalle terminé (tronqué pour rester après le précédent)"""
+        with self._lock:
+            if self.end_column:
+                start = max(start, self.end_column[-1])
+            if end <= start:
+                return
+            
+            app_id = self._intern(app_name)
+            self._append(app_id, start, end)
+            
+            if self.writer is not None:
+                self.writer.submit(end)
+            elif (len(self.app_column) - self._flushed >= self.flush_every
+                  or end - self.end_column[self._flushed] >= self.flush_age):
+                self.flush()
+    
+    def _intern(self, app_name: str) -> int:
+        app_id = self.app_ids.get(app_name)
+        if app_id is None:
+            app_id = len(self.apps)
+            self.apps.append(app_name)
+            self.app_ids[app_name] = app_id
+        return app_id
+    
+    def _append(self, app_id: int, start: float, end: float):
+        self.app_column.append(app_id)
+        self.start_column.append(start)
+        self.end_column.append(end)
+        
+        # Répartir l'intervalle sur les jours qu'il couvre
+        while start < end:
+            day, day_start, next_day_start = self._day_bounds
+            if not day_start <= start < next_day_start:
+                day = _day_ordinal(start)
+                day_start, next_day_start = _day_start(day), _day_start(day + 1)
+                self._day_bounds = (day, day_start, next_day_start)
+            
+            day_end = min(end, next_day_start)
+            totals = self.daily.setdefault(day, {})
+            totals[app_id] = totals.get(app_id, 0.0) + (day_end - start)
+            start = day_end
+    
+    # --- Requêtes ---------------------------------------------------------
+    
+    def totals(self, start: float, end: float) -> Dict[str, float]:
+        """Secondes passées dans chaque application sur [start, end)"""
+        with self._lock:
+            seconds: Dict[int, float] = {}
+            
+            first_day = _day_ordinal(start)
+            if _day_start(first_day) < start:
+                first_day += 1
+            last_day = _day_ordinal(end)  # Jour (partiel) contenant la fin
+            
+            if first_day < last_day:
+                # Jours entiers : cumuls journaliers, bords : intervalles
+                for day in range(first_day, last_day):
+                    for app_id, value in self.daily.get(day, {}).items():
+                        seconds[app_id] = seconds.get(app_id, 0.0) + value
+                self._scan(start, _day_start(first_day), seconds)
+                self._scan(_day_start(last_day), end, seconds)
+            else:
+                self._scan(start, end, seconds)
+            
+            result = {self.apps[app_id]: value for app_id, value in seconds.items()}
+            
+            # Intervalle en cours
+            if self.open_app is not None:
+                overlap = min(end, time.time()) - max(start, self.open_start)
+                if overlap > 0:
+                    result[self.open_app] = result.get(self.open_app, 0.0) + overlap
+            
+            return result
+    
+    def time_in(self, app_name: str, start: float, end: float = None) -> float:
+        """Secondes passées dans une application sur [start, end) (ex: VS Code cette semaine)"""
+        end = time.time() if end is None else end
+        return self.totals(start, end).get(app_name, 0.0)
+    
+    def _scan(self, start: float, end: float, seconds: Dict[int, float]):
+        """Ajoute le chevauchement des intervalles terminés avec [start, end)"""
+        if end <= start:
+            return
+        # Intervalles disjoints et triés : les fins sont croissantes
+        index = bisect_right(self.end_column, start)
+        count = len(self.start_column)
+        while index < count and self.start_column[index] < end:
+            overlap = min(end, self.end_column[index]) - max(start, self.start_column[index])
+            if overlap > 0:
+                app_id = self.app_column[index]
+                seconds[app_id] = seconds.get(app_id, 0.0) + overlap
+            index += 1
+    
+    def intervals(self, start: float = 0.0, end: float = None) -> List[Tuple[str, float, float]]:
+        """Intervalles terminés chevauchant [start, end)"""
+        with self._lock:
+            end = float('inf') if end is None else end
+            index = bisect_right(self.end_column, start)
+            result = []
+            while index < len(self.start_column) and self.start_column[index] < end:
+                result.append((self.apps[self.app_column[index]],
+                               self.start_column[index], self.end_column[index]))
+                index += 1
+            return result
+    
+    def transitions(self, since: float = 0.0, max_gap: float = 300.0) -> List[Tuple[str, str, float]]:
+        """
+        Passages d'une application à une autre : (depuis, vers, horodatage)
+        
+        Deux intervalles séparés de plus de `max_gap` secondes (arrêt, veille)
+        ne forment pas une transition.
+        """
+        with self._lock:
+            index = max(1, bisect_right(self.end_column, since))
+            result = []
+            
+            for i in range(index, len(self.app_column)):
+                previous, current = self.app_column[i - 1], self.app_column[i]
+                if previous != current and self.start_column[i] - self.end_column[i - 1] <= max_gap:
+                    result.append((self.apps[previous], self.apps[current], self.start_column[i]))
+            
+            # Transition vers l'application au premier plan
+            if (self.open_app is not None and self.app_column
+                    and self.apps[self.app_column[-1]] != self.open_app
+                    and self.open_start - self.end_column[-1] <= max_gap
+                    and self.open_start >= since):
+                result.append((self.apps[self.app_column[-1]], self.open_app, self.open_start))
+            
+            return result
+    
+    def __len__(self) -> int:
+        return len(self.app_column)
+    
+    # --- Persistance ------------------------------------------------------
+    
+    def load(self):
+        """Charge la chronologie depuis le disque (remplace le contenu en mémoire)"""
+        with self._lock:
+            self._reset()
+            apps_file = self.directory / "apps.json"
+            data_file = self.directory / "timeline.bin"
+            if not apps_file.exists() or not data_file.exists():
+                return
+            
+            try:
+                with open(apps_file, 'r', encoding='utf-8') as f:
+                    for name in json.load(f):
+                        self._intern(name)
+                
+                raw = data_file.read_bytes()
+                # Ignorer un éventuel enregistrement tronqué (arrêt pendant l'écriture)
+                raw = raw[:len(raw) - len(raw) % RECORD.size]
+                for app_id, start, end in RECORD.iter_unpack(raw):
+                    if app_id < len(self.apps):
+                        self._append(app_id, start, end)
+                
+                self._flushed = len(self.app_column)
+                self._apps_flushed = len(self.apps)
+                print(f"[TIMELINE] {len(self.app_column)} intervalles chargés")
+            except Exception as e:
+                print(f"[TIMELINE] Erreur chargement: {e}")
+    
+    def flush(self):
+        """Ajoute sur disque les intervalles pas encore écrits"""
+        with self._flush_lock:
+            # Copie sous verrou, écriture hors verrou : record_focus n'attend pas le disque
+            with self._lock:
+                count = len(self.app_column)
+                apps = list(self.apps) if self._apps_flushed != len(self.apps) else None
+                if self._flushed == count and apps is None:
+                    return
+                records = b"".join(
+                    RECORD.pack(self.app_column[i], self.start_column[i], self.end_column[i])
+                    for i in range(self._flushed, count)
+                )
+            
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                
+                # Les noms d'abord : un enregistrement ne référence jamais un id inconnu
+                if apps is not None:
+                    tmp_path = self.directory / "apps.json.tmp"
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(apps, f, ensure_ascii=False)
+                    os.replace(tmp_path, self.directory / "apps.json")
+                    self._apps_flushed = len(apps)
+                
+                with open(self.directory / "timeline.bin", 'ab') as f:
+                    f.write(records)
+                self._flushed = count
+            except Exception as e:
+                print(f"[TIMELINE] Erreur sauvegarde: {e}")
+    
+    def shutdown(self, timestamp: float = None):
+        """
+        Ferme l'intervalle en cours, arrête l'écriture en arrière-plan et écrit
+        le reste (fermeture de l'application, appelée une seule fois par la
+        fenêtre principale ; les appels suivants sont sans effet)
+        """
+        with self._lock:
+            if self._shut_down:
+                return
+            self._shut_down = True
+            self.close(timestamp)
+        if self.writer is not None:
+            self.writer.close()
+        self.flush()
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'intervals': len(self.app_column),
+            'apps': len(self.apps),
+            'days': len(self.daily),
+            'unflushed': len(self.app_column) - self._flushed,
+            'bytes': RECORD.size * len(self.app_column)
+        }
+
+
+# Instance globale (chargée au démarrage de l'interface)
+usage_timeline = UsageTimeline(settings.monitoring.timeline_dir, background=True)
@@ -2,50 +2,202 @@
 Système d'apprentissage des habitudes utilisateur
 """
 
-import json
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
+
+from ..config.settings import settings
+from ..utils.batch_writer import BatchWriter
+from .learning_journal import LearningJournal
+from .learning_store import SQLiteLearningStore
+from .next_app_predictor import NextAppPredictor
+from .transition_matrix import TransitionMatrix
+from .usage_timeline import UsageTimeline, usage_timeline
+
+# Poids d'une transition divisé par deux chaque semaine ; un workflow est
+# retenu à partir d'un poids équivalent à ~3 transitions récentes
+WORKFLOW_HALF_LIFE_DAYS = 7.0
+WORKFLOW_MIN_WEIGHT = 2.5
+
+# Prédiction de la prochaine application : probabilité et historique minimaux
+PREDICTION_MIN_PROBABILITY = 0.25
+PREDICTION_MIN_OBSERVATIONS = 3
 
 
 class UserLearningEngine:
-    """Apprend des habitudes utilisateur pour améliorer les suggestions"""
+    """
+    Apprend des habitudes utilisateur pour améliorer les suggestions
+    
+    Deux stockages (settings.learning.backend) : "json" garde tout en mémoire
+    (actions limitées à 50 par application), "sqlite" écrit tout l'historique
+    dans une base à côté de `data_file` et agrège en SQL.
+    
+    Les écritures disque des deux stockages passent par un BatchWriter : les
+    méthodes appelées depuis la surveillance ou l'interface ne font que
+    modifier la mémoire et mettre en file.
+    """
     
-    def __init__(self, data_file: str = "user_patterns.json"):
-        self.data_file = Path(data_file)
+    def __init__(self, data_file: str = None, timeline: UsageTimeline = None, backend: str = None):
+        self.data_file = Path(data_file or settings.learning.data_file)
+        # Actions et feedback : journal en ajout seul, compacté dans data_file
+        self.journal = LearningJournal(str(self.data_file), snapshot_every=settings.learning.snapshot_every)
         self.user_patterns: Dict[str, Any] = {}
         self.suggestion_feedback: Dict[str, int] = {}
-        self.app_transitions: List[Dict] = []
+        self._seq = 0  # Dernier événement appliqué en mémoire
+        # Protège aussi les comptes de transitions (écrits par la surveillance,
+        # lus par l'interface et le préchargement)
+        self._lock = threading.Lock()
+        # Les transitions entre applications sont lues dans la chronologie de focus
+        self.timeline = timeline if timeline is not None else usage_timeline
+        
+        # Comptes depuis → vers et transitions par heure, tenus à jour à chaque transition
+        self.transitions = TransitionMatrix(WORKFLOW_HALF_LIFE_DAYS * 86400)
+        self.hour_counts = [0] * 24
+        self.predictor = NextAppPredictor()
+        
+        self.store: Optional[SQLiteLearningStore] = None
+        if (backend or settings.learning.backend) == "sqlite":
+            self.store = SQLiteLearningStore(str(self.data_file.with_suffix('.db')), self.transitions.half_life)
+        self.writer = self.store.writer if self.store else BatchWriter(
+            "learning-writer", self._write_events,
+            max_queue=settings.learning.writer_queue_size,
+            batch_size=settings.learning.writer_batch_size,
+            flush_interval=settings.learning.writer_flush_interval
+        )
+        
         self.load_data()
+        if self.store:
+            self._migrate_to_store()
+        self._rebuild_transitions()
     
     def load_data(self):
-        """Charge les données d'apprentissage existantes"""
-        if self.data_file.exists():
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.user_patterns = data.get('patterns', {})
-                    self.suggestion_feedback = data.get('feedback', {})
-                    self.app_transitions = data.get('transitions', [])
-                print(f"[LEARNING] Données chargées: {len(self.app_transitions)} transitions")
-            except Exception as e:
-                print(f"[LEARNING] Erreur chargement données: {e}")
+        """Charge l'instantané puis rejoue les événements journalisés depuis"""
+        try:
+            data, events = self.journal.load()
+            self.user_patterns = data.get('patterns', {})
+            self.suggestion_feedback = data.get('feedback', {})
+            self._import_legacy_transitions(data.get('transitions', []))
+            for event in events:
+                self._apply(event)
+            self._seq = self.journal.seq
+            if data or events:
+                print(f"[LEARNING] Données chargées: {len(self.user_patterns)} applications "
+                      f"({len(events)} événements rejoués)")
+        except Exception as e:
+            print(f"[LEARNING] Erreur chargement données: {e}")
     
     def save_data(self):
-        """Sauvegarde les données d'apprentissage"""
-        try:
+        """Écrit un instantané complet et vide le journal"""
+        with self._lock:
             data = {
-                'patterns': self.user_patterns,
-                'feedback': self.suggestion_feedback,
-                'transitions': self.app_transitions[-1000:]  # Garder seulement les 1000 dernières
+                'patterns': {app: list(actions) for app, actions in self.user_patterns.items()},
+                'feedback': dict(self.suggestion_feedback)
             }
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            seq = self._seq
+        try:
+            self.journal.snapshot(data, seq)
         except Exception as e:
             print(f"[LEARNING] Erreur sauvegarde données: {e}")
     
+    def _journal(self, event: Dict[str, Any]):
+        """Applique un événement en mémoire et le met en file pour le journal"""
+        with self._lock:
+            self._seq += 1
+            event['seq'] = self._seq
+            self._apply(event)
+        self.writer.submit(event)
+    
+    def _write_events(self, events: List[Dict[str, Any]]):
+        """Thread learning-writer : ajout au journal, instantané si dû"""
+        if self.journal.append(events):
+            self.save_data()
+    
+    def _apply(self, event: Dict[str, Any]):
+        if event['type'] == 'action':
+            self._apply_action(event['app'], event['action'], event['timestamp'])
+        elif event['type'] == 'feedback':
+            self.suggestion_feedback[event['id']] = self.suggestion_feedback.get(event['id'], 0) + event['delta']
+    
+    def _migrate_to_store(self):
+        """Première utilisation de la base : reprend les données JSON et la chronologie"""
+        if self.store.is_empty():
+            actions = [(app_name, action['action'], action['timestamp'])
+                       for app_name, app_actions in self.user_patterns.items() for action in app_actions]
+            count = self.store.import_data(self.timeline.transitions(), actions, self.suggestion_feedback.items())
+            print(f"[LEARNING] Base SQLite initialisée ({count} lignes reprises)")
+        
+        # Les données sont lues dans la base à la demande
+        self.user_patterns = {}
+        self.suggestion_feedback = {}
+    
+    def close(self):
+        """Écrit les événements en file puis compacte le journal (fermeture de l'application)"""
+        if self.store:
+            self.store.close()
+            return
+        self.writer.close()
+        # Événements abandonnés (file pleine) : présents en mémoire, repris par l'instantané
+        if self.journal.pending or self.writer.stats['dropped']:
+            self.save_data()
+        self.journal.close()
+    
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """File d'écriture disque (contre-pression)"""
+        return self.writer.get_stats()
+    
+    def _import_legacy_transitions(self, transitions: List[Dict]):
+        """
+        Reprend les transitions de l'ancien format JSON dans une chronologie vide
+        
+        Une transition vers une application au temps t devient un intervalle de
+        focus de t jusqu'à la transition suivante.
+        """
+        if not transitions or len(self.timeline):
+            return
+        
+        for current, following in zip(transitions, transitions[1:]):
+            self.timeline.add_interval(current['to'], current['timestamp'], following['timestamp'])
+        self.timeline.flush()
+        print(f"[LEARNING] {len(transitions)} transitions reprises dans la chronologie")
+    
+    def _rebuild_transitions(self):
+        """
+        Reconstruit les comptes et le prédicteur au démarrage
+        
+        json : rejoue la chronologie ; sqlite : agrégation SQL des
+        `predictor_window_days` derniers jours (une ligne par depuis, vers et
+        tranche horaire, quelle que soit la taille de l'historique).
+        """
+        with self._lock:
+            self.transitions.clear()
+            self.hour_counts = [0] * 24
+        self.predictor.clear()
+        if self.store:
+            since = time.time() - settings.learning.predictor_window_days * 86400
+            for from_app, to_app, bucket, count in self.store.transition_counts(since):
+                self.predictor.add_counts(from_app, to_app, bucket, count)
+            return
+        with self._lock:
+            for from_app, to_app, timestamp in self.timeline.transitions():
+                self._count_transition(from_app, to_app, timestamp)
+        # L'application suivante ne prolonge pas la session précédente
+        self.predictor.reset_context()
+    
+    def _count_transition(self, from_app: str, to_app: str, timestamp: float):
+        """À appeler sous `_lock`"""
+        self.transitions.record(from_app, to_app, timestamp)
+        self.predictor.record(from_app, to_app, timestamp)
+        self.hour_counts[time.localtime(timestamp).tm_hour] += 1
+    
     def record_user_action(self, app_name: str, action: str, timestamp: float):
         """Enregistre une action utilisateur"""
+        if self.store:
+            self.store.add_action(app_name, action, timestamp)
+            return
+        self._journal({'type': 'action', 'app': app_name, 'action': action, 'timestamp': timestamp})
+    
+    def _apply_action(self, app_name: str, action: str, timestamp: float):
         # Enregistrer dans les patterns
         if app_name not in self.user_patterns:
             self.user_patterns[app_name] = []
@@ -61,59 +213,84 @@ class UserLearningEngine:
             self.user_patterns[app_name] = self.user_patterns[app_name][-50:]
     
     def record_app_transition(self, from_app: str, to_app: str):
-        """Enregistre une transition entre applications"""
-        transition = {
-            'from': from_app,
-            'to': to_app,
-            'timestamp': time.time(),
-            'hour': time.localtime().tm_hour
-        }
-        self.app_transitions.append(transition)
-        
-        # Sauvegarder périodiquement
-        if len(self.app_transitions) % 10 == 0:
-            self.save_data()
+        """
+        Enregistre une transition entre applications
+        
+        json : le focus n'est ajouté à la chronologie que si SystemMonitor ne
+        l'a pas déjà fait ; sqlite : la transition n'est écrite que dans la
+        base. Les comptes sont mis à jour en O(1).
+        """
+        timestamp = time.time()
+        if self.store:
+            if from_app and from_app != to_app:
+                self.store.add_transition(from_app, to_app, timestamp)
+                self.predictor.record(from_app, to_app, timestamp)
+            return
+        self.timeline.record_focus(to_app)
+        if from_app and from_app != to_app:
+            with self._lock:
+                self._count_transition(from_app, to_app, timestamp)
+    
+    def get_next_apps(self, app_name: str) -> List[str]:
+        """Applications vers lesquelles l'utilisateur passe souvent après `app_name` (plus fréquente d'abord)"""
+        if self.store:
+            successors = self.store.successors(app_name, time.time(), WORKFLOW_MIN_WEIGHT)
+        else:
+            with self._lock:
+                successors = self.transitions.successors(app_name, time.time(), WORKFLOW_MIN_WEIGHT)
+        return [to_app for to_app, _ in successors]
+    
+    def predict_next_apps(self, app_name: str, k: int = 3,
+                          min_probability: float = PREDICTION_MIN_PROBABILITY) -> List[str]:
+        """
+        Prochaines applications probables selon le prédicteur de Markov
+        
+        Tient compte de l'heure et de l'application précédente ; rien tant que
+        `app_name` a moins de PREDICTION_MIN_OBSERVATIONS transitions.
+        """
+        if self.predictor.observations(app_name) < PREDICTION_MIN_OBSERVATIONS:
+            return []
+        return [next_app for next_app, probability in self.predictor.predict(app_name, k)
+                if probability >= min_probability]
     
     def get_common_workflows(self) -> Dict[str, List[str]]:
         """Identifie les workflows communs de l'utilisateur"""
+        if self.store:
+            return self.store.workflows(time.time(), WORKFLOW_MIN_WEIGHT)
+        
         workflows = {}
+        now = time.time()
+        with self._lock:
+            for app_name in self.transitions.edges:
+                successors = self.transitions.successors(app_name, now, WORKFLOW_MIN_WEIGHT)
+                if successors:
+                    workflows[app_name] = [to_app for to_app, _ in successors]
+        return workflows
+    
+    def get_active_hours(self, min_share: float = 0.02, min_transitions: int = 50) -> Optional[Set[int]]:
+        """
+        Heures de la journée où l'utilisateur est habituellement actif
         
-        # Analyser les transitions des 7 derniers jours
-        week_ago = time.time() - (86400 * 7)
-        recent_transitions = [t for t in self.app_transitions 
-                            if t['timestamp'] > week_ago]
-        
-        for transition in recent_transitions:
-            from_app = transition['from']
-            to_app = transition['to']
-            
-            if from_app not in workflows:
-                workflows[from_app] = []
-            workflows[from_app].append(to_app)
-        
-        # Garder seulement les transitions fréquentes
-        for app in list(workflows.keys()):
-            app_counts = {}
-            for target in workflows[app]:
-                app_counts[target] = app_counts.get(target, 0) + 1
-            
-            # Garder seulement si >= 3 occurrences
-            frequent_targets = [app for app, count in app_counts.items() if count >= 3]
-            if frequent_targets:
-                workflows[app] = frequent_targets
-            else:
-                del workflows[app]
+        Retourne None tant que l'historique est trop court pour conclure.
+        """
+        if self.store:
+            hour_counts = self.store.hour_counts()
+        else:
+            with self._lock:
+                hour_counts = list(self.hour_counts)
+        total = sum(hour_counts)
+        if total < min_transitions:
+            return None
         
-        return workflows
+        return {hour for hour, count in enumerate(hour_counts) if count / total >= min_share}
     
     def get_contextual_suggestion(self, app_name: str, context: str) -> Optional[str]:
         """Génère une suggestion basée sur l'apprentissage utilisateur"""
-        workflows = self.get_common_workflows()
+        next_apps = self.predict_next_apps(app_name, k=2)
         current_hour = time.localtime().tm_hour
         
         # Suggestion basée sur les workflows
-        if app_name in workflows and workflows[app_name]:
-            next_apps = workflows[app_name][:2]  # Top 2
+        if next_apps:
             if len(next_apps) == 1:
                 return f"Tu passes souvent à {next_apps[0]} après {app_name}"
             else:
@@ -136,15 +313,19 @@ class UserLearningEngine:
     
     def record_suggestion_feedback(self, suggestion_id: str, feedback: bool):
         """Enregistre le feedback sur une suggestion"""
-        if suggestion_id not in self.suggestion_feedback:
-            self.suggestion_feedback[suggestion_id] = 0
-        
         # +1 pour positif, -1 pour négatif
-        self.suggestion_feedback[suggestion_id] += 1 if feedback else -1
+        if self.store:
+            self.store.add_feedback(suggestion_id, 1 if feedback else -1)
+            return
+        self._journal({'type': 'feedback', 'id': suggestion_id, 'delta': 1 if feedback else -1})
     
     def get_usage_stats(self) -> Dict[str, Any]:
         """Retourne des statistiques d'usage"""
-        total_transitions = len(self.app_transitions)
+        if self.store:
+            total_transitions = self.store.count_transitions()
+        else:
+            with self._lock:
+                total_transitions = self.transitions.total
         workflows = self.get_common_workflows()
         
         return {
@@ -4,17 +4,23 @@ Fenêtre principale de l'assistant IA
 
 import tkinter as tk
 from tkinter import messagebox
-import threading
-from typing import Optional
+from typing import List, Optional
 
 from ..config.settings import settings
-from ..core.ollama_client import OllamaClient
+from ..core.async_ollama_client import AsyncOllamaClient
 from ..core.system_monitor import SystemMonitor
+from ..core.generation_scheduler import GenerationScheduler
+from ..core.suggestion_prefetcher import SuggestionPrefetcher
+from ..core.model_warmup import ModelWarmer
+from ..core.llm_metrics import llm_metrics
+from ..core.usage_timeline import usage_timeline
+from ..core.self_monitor import self_monitor
 from .character import CharacterWidget
 from .speech_bubble import SpeechBubble
 from ..core.user_learning import UserLearningEngine
 from .themes import THEMES
-from ..utils.voice_engine import voice_engine
+from ..utils.voice_engine import voice_engine, split_sentences
+from ..utils.event_loop import shared_event_loop
 
 
 class MainWindow:
@@ -22,9 +28,17 @@ class MainWindow:
     
     def __init__(self):
         self.root = tk.Tk()
-        self.ollama_client: Optional[OllamaClient] = None
+        
+        # Boucle asyncio partagée (générations LLM + assistant vocal) : résultats livrés dans le thread Tk
+        self.event_loop = shared_event_loop
+        self.event_loop.attach_tk(self.root)
+        self.ollama_client: Optional[AsyncOllamaClient] = None
         self.system_monitor: Optional[SystemMonitor] = None
         self.learning_engine: Optional[UserLearningEngine] = None
+        self.generation_scheduler = GenerationScheduler(settings.ollama.max_concurrent_generations,
+                                                        self.event_loop)
+        self.prefetcher: Optional[SuggestionPrefetcher] = None
+        self.model_warmer: Optional[ModelWarmer] = None
         self.previous_app = ""
         
         # Paramètres vocaux
@@ -66,6 +80,14 @@ class MainWindow:
         
         # Gestion de la fermeture
         self.root.protocol("WM_DELETE_WINDOW", self.close_app)
+        
+        # Le focus quitte l'assistant : l'utilisateur change probablement d'application
+        self.root.bind("<FocusOut>", self._on_focus_out)
+    
+    def _on_focus_out(self, event):
+        """Relance la détection d'application sans attendre le prochain scan"""
+        if event.widget is self.root and self.system_monitor:
+            self.system_monitor.notify_activity()
     
     def _position_window(self):
         """Positionne la fenêtre au coin bas-droit"""
@@ -234,12 +256,28 @@ class MainWindow:
     
     def _initialize_components(self):
         """Initialise les composants (Ollama, monitoring, apprentissage, voix)"""
-        # Client Ollama
-        self.ollama_client = OllamaClient()
+        # Client Ollama (asyncio, sur la boucle partagée)
+        self.ollama_client = AsyncOllamaClient()
+        self.event_loop.run_sync(self.ollama_client.check_connection())
+        
+        # Empreinte de l'assistant (mémoire, CPU, threads)
+        self_monitor.start()
+        
+        # Chronologie d'utilisation (lue par le système d'apprentissage)
+        usage_timeline.load()
         
         # Système d'apprentissage
         self.learning_engine = UserLearningEngine()
         
+        # Charger le modèle tout de suite (sans bloquer l'interface) et le garder chaud
+        self.model_warmer = ModelWarmer(self.ollama_client, self.learning_engine, self.event_loop)
+        self.model_warmer.start()
+        
+        # Préchargement des suggestions pour les prochaines applications probables
+        self.prefetcher = SuggestionPrefetcher(
+            self.ollama_client, self.generation_scheduler, self.learning_engine
+        )
+        
         # Test synthèse vocale
         if voice_engine.available:
             print("✅ Synthèse vocale disponible")
@@ -307,6 +345,10 @@ class MainWindow:
             self.learning_engine.record_app_transition(self.previous_app, app_name)
         self.previous_app = app_name
         
+        # Mesurer la précision du préchargement
+        if self.prefetcher:
+            self.prefetcher.record_switch(app_name)
+        
         # Afficher l'info de base immédiatement
         basic_message = f"📱 {app_name}\n🕒 {context}\n\n🤔 Analyse en cours..."
         self.root.after(0, lambda: self.speech_bubble.update_text(basic_message))
@@ -315,8 +357,8 @@ class MainWindow:
         if self.character_widget:
             self.root.after(0, lambda: self.character_widget.set_mood("thinking"))
         
-        # Générer suggestion IA et personnalisée en arrière-plan
-        def generate_ai_response():
+        # Générer suggestion IA et personnalisée sur la boucle partagée
+        async def generate_ai_response() -> str:
             suggestions = []
             
             # Suggestion personnalisée basée sur l'apprentissage
@@ -328,34 +370,91 @@ class MainWindow:
                 except:
                     pass  # Ignorer les erreurs de l'apprentissage pour l'instant
             
+            # Suggestion IA en streaming : affichage au fil des chunks
+            if self.ollama_client and settings.ollama.stream:
+                return await self._stream_ai_response(app_name, context, suggestions)
+            
             # Suggestion IA classique
             if self.ollama_client:
-                ai_suggestion = self.ollama_client.generate_suggestion(app_name, context)
+                ai_suggestion = await self.ollama_client.generate_suggestion(app_name, context)
                 suggestions.append(f"🤖 {ai_suggestion}")
             
             # Combiner les suggestions
             if suggestions:
-                final_message = f"📱 {app_name}\n🕒 {context}\n\n" + "\n\n".join(suggestions)
-            else:
-                final_message = f"📱 {app_name}\n🕒 {context}\n\n🔌 IA non disponible"
+                return f"📱 {app_name}\n🕒 {context}\n\n" + "\n\n".join(suggestions)
+            return f"📱 {app_name}\n🕒 {context}\n\n🔌 IA non disponible"
+        
+        def on_result(final_message: str):
+            # Mettre à jour l'UI dans le thread principal (la voix a déjà lu le streaming)
+            speak = not settings.ollama.stream
+            self.root.after(0, lambda: self._update_ai_response(final_message, speak=speak))
             
-            # Mettre à jour l'UI dans le thread principal
-            self.root.after(0, lambda: self._update_ai_response(final_message))
+            # Le LLM est libre : préparer les applications suivantes probables
+            if self.prefetcher:
+                self.prefetcher.prefetch_after(app_name)
         
-        # Lancer l'IA dans un thread séparé
-        threading.Thread(target=generate_ai_response, daemon=True).start()
+        # Une seule génération par application ; les demandes obsolètes sont annulées
+        self.generation_scheduler.submit(app_name, generate_ai_response, on_result)
+    
+    async def _stream_ai_response(self, app_name: str, context: str, suggestions: list) -> str:
+        """
+        Affiche la suggestion IA chunk par chunk et la lit phrase par phrase
+        
+        Si une application plus récente prend la main, la tâche est annulée
+        (CancelledError) : l'interface n'est plus touchée.
+        """
+        header = f"📱 {app_name}\n🕒 {context}\n\n"
+        
+        # La suggestion personnelle est déjà complète : la lire tout de suite
+        for suggestion in suggestions:
+            self._speak_text(suggestion[2:].strip())
+        
+        ai_text = ""
+        spoken_count = 0
+        async for ai_text in self.ollama_client.stream_suggestion(app_name, context):
+            message = header + "\n\n".join(suggestions + [f"🤖 {ai_text}"])
+            self.root.after(0, lambda m=message: self._update_ai_response(m, partial=True))
+            
+            # Envoyer à la voix chaque phrase dès qu'elle est terminée
+            sentences, _ = split_sentences(ai_text)
+            for sentence in sentences[spoken_count:]:
+                self._speak_text(sentence)
+            spoken_count = max(spoken_count, len(sentences))
+        
+        # Lire la fin de la suggestion (dernière phrase sans espace final)
+        sentences, rest = split_sentences(ai_text)
+        for sentence in (sentences + [rest])[spoken_count:]:
+            self._speak_text(sentence)
+        
+        return header + "\n\n".join(suggestions + [f"🤖 {ai_text}"])
+    
+    def _speak_text(self, text: str):
+        """Envoie un texte brut à la synthèse vocale (si activée)"""
+        if text and self.voice_enabled and voice_engine.available:
+            voice_engine.speak(text)
     
-    def _update_ai_response(self, message: str):
-        """Met à jour l'interface avec la réponse de l'IA"""
+    def _update_ai_response(self, message: str, partial: bool = False, speak: bool = True):
+        """
+        Met à jour l'interface avec la réponse de l'IA
+        
+        Args:
+            message: Texte complet à afficher dans la bulle
+            partial: True pendant le streaming (réponse incomplète)
+            speak: False si le texte a déjà été envoyé à la voix
+        """
         if self.speech_bubble:
             self.speech_bubble.update_text(message)
         
+        if partial:
+            return
+        
         # Animer le personnage
         if self.character_widget:
             self.character_widget.set_mood("happy")
         
         # Synthèse vocale des suggestions
-        self._speak_message(message)
+        if speak:
+            self._speak_message(message)
     
     def _cycle_theme(self):
         """Change de thème (cycle entre light, dark, cyberpunk)"""
@@ -425,6 +524,23 @@ class MainWindow:
             voices_count = len(voices)
             voices_info = f"\nVoix disponibles: {voices_count}"
         
+        if self.system_monitor and self.system_monitor.backend == "x11":
+            monitor_interval = "événements X11"
+        elif settings.monitoring.adaptive_interval and self.system_monitor:
+            monitor_interval = (f"{self.system_monitor.current_interval:.1f}s "
+                                f"(adaptatif {settings.monitoring.min_check_interval}-"
+                                f"{settings.monitoring.max_check_interval:.0f}s)")
+        else:
+            monitor_interval = f"{settings.monitoring.check_interval}s"
+        
+        # Statistiques détaillées, une section par composant
+        stats_sections = [
+            self._format_generation_stats(),
+            self._format_llm_stats(),
+            self._format_runtime_stats()
+        ]
+        stats_info = "".join(f"\n{line}" for section in stats_sections for line in section)
+        
         messagebox.showinfo(
             "Paramètres", 
             f"Assistant IA v1.1\n\n"
@@ -433,14 +549,82 @@ class MainWindow:
             f"🔊 Moteur vocal: {voice_engine_status}\n"
             f"🗣️ Synthèse: {voice_status}{voices_info}\n"
             f"🎨 Thème: {self.current_theme}\n"
-            f"⏱️ Intervalle: {settings.monitoring.check_interval}s\n"
+            f"⏱️ Intervalle: {monitor_interval}\n"
             f"🎭 Apprentissage: ✅ Actif"
+            f"{stats_info}"
         )
         
         # Annonce vocale des paramètres
         if self.voice_enabled and voice_engine.available:
             voice_engine.speak("Paramètres affichés")
     
+    def _format_generation_stats(self) -> List[str]:
+        """Générations (single-flight), disjoncteur, timeout et préchargement"""
+        gen_stats = self.generation_scheduler.get_stats()
+        lines = [
+            f"⚡ Générations: {gen_stats['completed']} terminées, "
+            f"{gen_stats['coalesced']} fusionnées, "
+            f"{gen_stats['dropped'] + gen_stats['stale']} abandonnées"
+        ]
+        cold_start_ms = self.ollama_client.latency_stats['cold_start_ms']
+        if cold_start_ms is not None:
+            warm_ms = self.ollama_client.latency_stats['warm_ms']
+            line = f"🔥 Chargement modèle: {cold_start_ms / 1000:.1f}s"
+            if warm_ms is not None:
+                line += f" (à chaud: {warm_ms:.0f} ms)"
+            lines.append(line)
+        if self.ollama_client.breaker.get_stats()['state'] != 'closed':
+            lines.append(f"🛑 Disjoncteur ouvert: nouvel essai dans "
+                         f"{self.ollama_client.breaker.time_until_retry():.0f}s")
+        timeout = self.ollama_client.adaptive_timeouts['stream' if settings.ollama.stream else 'generate']
+        lines.append(f"⏳ Timeout génération: {timeout.current():.1f}s")
+        if self.prefetcher:
+            prefetch_stats = self.prefetcher.get_stats()
+            lines.append(f"🔮 Préchargement: {prefetch_stats['hits']} utiles, "
+                         f"{prefetch_stats['wasted']} inutiles "
+                         f"(précision {prefetch_stats['precision']:.0%})")
+        return lines
+    
+    def _format_llm_stats(self) -> List[str]:
+        """Latence et débit du modèle (llm_metrics)"""
+        model_metrics = llm_metrics.get_model_summary(self.ollama_client.model)
+        if not model_metrics:
+            return []
+        
+        latency = model_metrics['latency_ms']
+        line = f"📊 Latence: p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms"
+        if model_metrics['tokens_per_s']:
+            line += f" - {model_metrics['tokens_per_s']:.1f} tokens/s"
+        lines = [line]
+        if model_metrics['prompt_eval_ms'] is not None:
+            line = f"🧾 Prompt: {model_metrics['prompt_eval_ms']:.0f} ms"
+            queue_ms = llm_metrics.snapshot()['queue_ms']['p50']
+            if queue_ms is not None:
+                line += f" - attente {queue_ms:.0f} ms"
+            lines.append(line)
+        return lines
+    
+    def _format_runtime_stats(self) -> List[str]:
+        """Empreinte de l'assistant, anti-rebond et écritures disque"""
+        lines = []
+        footprint = self_monitor.latest()
+        if footprint:
+            line = f"🪶 Assistant: {footprint['rss_mb']:.0f} Mo, {footprint['threads']} threads"
+            if footprint['cpu_percent'] is not None:
+                line += f", {footprint['cpu_percent']:.1f}% CPU"
+            lines.append(line)
+        if self.system_monitor:
+            debounce_stats = self.system_monitor.debouncer.get_stats()
+            lines.append(f"🪃 Rebonds évités: {debounce_stats['suppressed']} ({debounce_stats['flap_rate']:.0%})")
+            memory_stats = self.system_monitor.get_memory_stats()
+            lines.append(f"🗂️ Historique processus: {memory_stats['process_history_pids']} pid, "
+                         f"{memory_stats['process_history_bytes'] / 1024:.0f} Ko")
+        if self.learning_engine:
+            writer_stats = self.learning_engine.get_persistence_stats()
+            lines.append(f"💾 Écritures: {writer_stats['pending']} en attente, "
+                         f"{writer_stats['dropped']} abandonnées")
+        return lines
+    
     def start_monitoring(self):
         """Démarre la surveillance système"""
         if self.system_monitor:
@@ -478,10 +662,26 @@ class MainWindow:
         # Arrêter la surveillance
         self.stop_monitoring()
         
+        # Annuler les générations en cours puis fermer les connexions HTTP vers Ollama
+        if self.model_warmer:
+            self.model_warmer.stop()
+        self.generation_scheduler.shutdown()
+        if self.ollama_client:
+            self.event_loop.run_sync(self.ollama_client.aclose(), timeout=2)
+        llm_metrics.export_json()
+        self_monitor.stop()
+        self_monitor.export_json()
+        usage_timeline.shutdown()
+        if self.learning_engine:
+            self.learning_engine.close()
+        
         # Arrêter proprement la synthèse vocale
         if voice_engine.available:
             voice_engine.shutdown()
         
+        # Arrêter la boucle asyncio partagée
+        self.event_loop.stop()
+        
         # Fermer la fenêtre
         self.root.quit()
         self.root.destroy()
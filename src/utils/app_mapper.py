@@ -2,9 +2,58 @@
 Mapping des noms d'applications pour un affichage convivial
 """
 
-from typing import Dict, Tuple
+from typing import Dict, FrozenSet, Tuple
+from functools import lru_cache
+import json
 import time
 
+from ..config.settings import settings
+
+# Longueur maximale de /proc/<pid>/comm sous Linux (nom tronqué au-delà)
+COMM_MAX_LENGTH = 15
+
+# Noms des binaires Linux/macOS → processus Windows de référence (clé de app_names)
+PLATFORM_ALIASES: Dict[str, str] = {
+    'google-chrome': 'chrome.exe',
+    'google-chrome-stable': 'chrome.exe',
+    'chromium': 'chrome.exe',
+    'chromium-browser': 'chrome.exe',
+    'firefox-esr': 'firefox.exe',
+    'firefox-bin': 'firefox.exe',
+    'microsoft-edge': 'msedge.exe',
+    'brave-browser': 'brave.exe',
+    'code-oss': 'code.exe',
+    'codium': 'code.exe',
+    'nvim': 'vim.exe',
+    'gvim': 'vim.exe',
+    'python3': 'python.exe',
+    'pycharm': 'pycharm64.exe',
+    'pycharm.sh': 'pycharm64.exe',
+    'idea': 'idea64.exe',
+    'idea.sh': 'idea64.exe',
+    'teams-for-linux': 'teams.exe',
+    'telegram-desktop': 'telegram.exe',
+    'gimp-2.10': 'gimp.exe',
+    'pwsh': 'powershell.exe'
+}
+
+# Processus connus mais jamais au premier plan (pas de suggestion)
+BACKGROUND_PROCESSES = frozenset({'conhost'})
+
+
+@lru_cache(maxsize=4096)
+def normalize_process_name(name: str) -> str:
+    """
+    Forme canonique d'un nom de processus, quelle que soit la plateforme
+    
+    'C:\\Program Files\\Code.exe', 'code' et '/usr/share/code/code' donnent 'code'.
+    """
+    name = name.strip().lower().replace('\\', '/')
+    name = name.rsplit('/', 1)[-1]
+    if name.endswith('.exe'):
+        name = name[:-4]
+    return name
+
 
 class AppMapper:
     """Classe pour mapper les noms de processus vers des noms conviviaux"""
@@ -87,6 +136,9 @@ class AppMapper:
             'filezilla.exe': 'FileZilla'
         }
         
+        # Alias propres aux plateformes (noms de binaires Linux/macOS)
+        self.aliases: Dict[str, str] = dict(PLATFORM_ALIASES)
+        
         self.context_templates: Dict[str, str] = {
             # Navigateurs
             'Chrome': "Navigation web ({time})",
@@ -120,11 +172,68 @@ class AppMapper:
             'Spotify': "Écoute de musique ({time})",
             'VLC': "Lecture vidéo/audio ({time})"
         }
+        
+        # Index nom normalisé → nom d'affichage, recalculé à chaque modification
+        self.process_index: Dict[str, str] = {}
+        self.interesting_processes: FrozenSet[str] = frozenset()
+        
+        if settings.monitoring.app_index_file:
+            self.load_index(settings.monitoring.app_index_file)
+        else:
+            self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Précalcule l'index des processus intéressants (appartenance en O(1))"""
+        index = {}
+        for process_name, display_name in self.app_names.items():
+            index[normalize_process_name(process_name)] = display_name
+        for alias, process_name in self.aliases.items():
+            display_name = self.app_names.get(process_name.lower())
+            if display_name:
+                index[normalize_process_name(alias)] = display_name
+        
+        # Noms tronqués tels qu'ils apparaissent dans /proc/<pid>/comm
+        for name in list(index):
+            if len(name) > COMM_MAX_LENGTH:
+                index.setdefault(name[:COMM_MAX_LENGTH], index[name])
+        
+        self.process_index = index
+        self.interesting_processes = frozenset(index) - BACKGROUND_PROCESSES
+    
+    def load_index(self, path: str) -> bool:
+        """
+        Charge des noms supplémentaires depuis un fichier JSON
+        
+        Format: {"app_names": {"processus": "Nom affiché"}, "aliases": {"binaire": "processus"}}
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            for process_name, display_name in data.get('app_names', {}).items():
+                self.app_names[process_name.lower()] = display_name
+            for alias, process_name in data.get('aliases', {}).items():
+                self.aliases[alias.lower()] = process_name.lower()
+            return True
+        
+        except Exception as e:
+            print(f"Erreur chargement index des applications: {e}")
+            return False
+        
+        finally:
+            self._rebuild_index()
+    
+    def is_interesting(self, process_name: str) -> bool:
+        """True si le processus correspond à une application connue (toutes plateformes)"""
+        return normalize_process_name(process_name) in self.interesting_processes
     
     def get_display_name(self, process_name: str) -> str:
         """Convertit un nom de processus en nom d'affichage convivial"""
-        clean_name = process_name.lower()
-        return self.app_names.get(clean_name, process_name.replace('.exe', '').title())
+        clean_name = normalize_process_name(process_name)
+        display_name = self.process_index.get(clean_name)
+        if display_name:
+            return display_name
+        return process_name.replace('.exe', '').title()
     
     def get_context(self, app_name: str) -> str:
         """Génère un contexte pour l'application"""
@@ -138,6 +247,7 @@ class AppMapper:
     def add_custom_mapping(self, process_name: str, display_name: str, context_template: str = None):
         """Ajoute un mapping personnalisé"""
         self.app_names[process_name.lower()] = display_name
+        self._rebuild_index()
         
         if context_template:
             self.context_templates[display_name] = context_template
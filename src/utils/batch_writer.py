@@ -0,0 +1,145 @@
+"""
+Écriture disque en arrière-plan, par lots, avec file bornée
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Marqueurs internes de la file
+_FLUSH = object()
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Thread d'écriture dédié : les appelants ne touchent jamais au disque
+    
+    `submit()` met un élément en file sans jamais bloquer ; le thread appelle
+    `write_batch(éléments)` dès que `batch_size` éléments sont réunis ou que le
+    plus ancien attend depuis `flush_interval` secondes. Si la file
+    (`max_queue` éléments) est pleine, l'élément est abandonné et compté :
+    un disque lent ne ralentit ni la surveillance ni l'interface.
+    
+    Métriques de contre-pression : profondeur de file maximale, éléments
+    abandonnés, durée des lots.
+    """
+    
+    def __init__(self, name: str, write_batch: Callable[[List[Any]], None], max_queue: int = 1000,
+                 batch_size: int = 100, flush_interval: float = 1.0):
+        self.name = name
+        self.write_batch = write_batch
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self.thread: Optional[threading.Thread] = None
+        
+        self.stats = {
+            'submitted': 0,
+            'written': 0,
+            'batches': 0,
+            'dropped': 0,          # File pleine (contre-pression)
+            'errors': 0,
+            'queue_high_water': 0,
+            'last_batch_ms': 0.0,
+            'max_batch_ms': 0.0
+        }
+    
+    def _ensure_started(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+    
+    def submit(self, item: Any) -> bool:
+        """Met un élément en file (non bloquant) ; False s'il a été abandonné"""
+        with self._condition:
+            if self._closed:
+                self.stats['dropped'] += 1
+                return False
+            self._ensure_started()
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                if self.stats['dropped'] % 100 == 1:
+                    print(f"⚠️ [WRITER] {self.name}: file pleine, {self.stats['dropped']} écritures abandonnées")
+                return False
+            self._submitted += 1
+            self.stats['submitted'] += 1
+            self.stats['queue_high_water'] = max(self.stats['queue_high_water'], self._queue.qsize())
+            return True
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _FLUSH and item is not _STOP:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            
+            if batch:
+                self._write(batch)
+            if item is _STOP:
+                return
+    
+    def _write(self, batch: List[Any]):
+        start = time.perf_counter()
+        try:
+            self.write_batch(batch)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"[WRITER] {self.name}: erreur écriture ({len(batch)} éléments perdus): {e}")
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._condition:
+            self._written += len(batch)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['last_batch_ms'] = elapsed_ms
+            self.stats['max_batch_ms'] = max(self.stats['max_batch_ms'], elapsed_ms)
+            self._condition.notify_all()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Écrit tout ce qui a été soumis jusqu'ici (bloquant, pour l'arrêt et les tests)"""
+        with self._condition:
+            if self.thread is None:
+                return True
+            target = self._submitted
+        try:
+            self._queue.put(_FLUSH, timeout=timeout)
+        except queue.Full:
+            return False
+        with self._condition:
+            return self._condition.wait_for(lambda: self._written >= target, timeout=timeout)
+    
+    def close(self, timeout: float = 5.0):
+        """Écrit les éléments restants et arrête le thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+        if self.thread is not None and self.thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                print(f"[WRITER] {self.name}: arrêt sans vider la file")
+                return
+            self.thread.join(timeout=timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {**self.stats, 'pending': self._queue.qsize(), 'max_queue': self.max_queue}
@@ -0,0 +1,95 @@
+"""
+Boucle asyncio partagée entre l'interface Tk et l'assistant vocal
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+
+class EventLoopThread:
+    """Une seule boucle asyncio, dans un thread dédié, pour toutes les tâches d'E/S"""
+    
+    def __init__(self, name: str = "asyncio-loop"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._tk_root = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Démarre la boucle (idempotent)"""
+        with self._lock:
+            if self.loop and self.thread and self.thread.is_alive():
+                return self.loop
+            
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+            
+            self.thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self.thread.start()
+            ready.wait()
+            return self.loop
+    
+    def attach_tk(self, root):
+        """Les callbacks de `submit` seront exécutés dans le thread Tk (via root.after)"""
+        self._tk_root = root
+    
+    def submit(self, coro: Awaitable, callback: Callable[[Any], None] = None) -> Future:
+        """
+        Planifie une coroutine sur la boucle partagée
+        
+        Args:
+            coro: Coroutine à exécuter
+            callback: Appelé avec le résultat (dans le thread Tk si attaché)
+        
+        Returns:
+            Future thread-safe ; `future.cancel()` annule la tâche asyncio
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.start())
+        if callback:
+            future.add_done_callback(lambda f: self._deliver(callback, f))
+        return future
+    
+    def run_sync(self, coro: Awaitable, timeout: float = None) -> Any:
+        """Exécute une coroutine et attend son résultat (depuis un autre thread)"""
+        return self.submit(coro).result(timeout)
+    
+    def _deliver(self, callback: Callable[[Any], None], future: Future):
+        """Transmet le résultat d'une tâche à son callback"""
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error:
+            print(f"[ASYNC] Erreur tâche: {error}")
+            return
+        
+        result = future.result()
+        root = self._tk_root
+        if root is not None:
+            try:
+                root.after(0, lambda: callback(result))
+                return
+            except Exception:
+                pass  # Fenêtre détruite : exécuter directement
+        callback(result)
+    
+    def stop(self):
+        """Arrête la boucle"""
+        with self._lock:
+            if self.loop and self.loop.is_running():
+                self.loop.call_soon_threadsafe(self.loop.stop)
+            if self.thread and self.thread.is_alive():
+                self.thread.join(timeout=2)
+            self.thread = None
+
+
+# Instance globale
+shared_event_loop = EventLoopThread()
@@ -149,8 +149,8 @@ class VoiceCommandEngine:
         self.active = True
         
         # Démarrer les threads
-        self.listen_thread = threading.Thread(target=self._listen_worker, daemon=True)
-        self.process_thread = threading.Thread(target=self._process_worker, daemon=True)
+        self.listen_thread = threading.Thread(target=self._listen_worker, name="voice-listen", daemon=True)
+        self.process_thread = threading.Thread(target=self._process_worker, name="voice-commands", daemon=True)
         
         self.listen_thread.start()
         self.process_thread.start()
@@ -4,8 +4,9 @@ Moteur de synthèse vocale pour l'Assistant IA
 
 import threading
 import queue
+import re
 import time
-from typing import Optional
+from typing import Optional, List, Tuple
 
 # Import conditionnel pour éviter les erreurs si pyttsx3 n'est pas installé
 try:
@@ -18,6 +19,29 @@ except ImportError:
 from ..config.settings import settings
 
 
+# Fin de phrase : ponctuation forte suivie d'un espace
+SENTENCE_END = re.compile(r'[.!?…]+(?=\s)')
+
+
+def split_sentences(text: str) -> Tuple[List[str], str]:
+    """
+    Découpe un texte en cours de génération en phrases complètes
+    
+    Returns:
+        (phrases terminées, reste non terminé)
+    """
+    sentences = []
+    start = 0
+    
+    for match in SENTENCE_END.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    
+    return sentences, text[start:].strip()
+
+
 class VoiceEngine:
     """Gestionnaire de synthèse vocale"""
     
@@ -81,7 +105,7 @@ class VoiceEngine:
     def _start_worker(self):
         """Démarre le thread worker pour la synthèse vocale"""
         if self.available and not self._shutdown_requested:
-            self.worker_thread = threading.Thread(target=self._voice_worker, daemon=True)
+            self.worker_thread = threading.Thread(target=self._voice_worker, name="voice-worker", daemon=True)
             self.worker_thread.start()
     
     def _voice_worker(self):
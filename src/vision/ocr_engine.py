@@ -8,6 +8,8 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional
 import re
 
+from ..core.self_monitor import self_monitor
+
 # Import conditionnel des moteurs OCR
 try:
     import pytesseract
@@ -133,17 +135,18 @@ class OCREngine:
     
     def extract_text_auto(self, image: Image.Image) -> str:
         """Extraction automatique avec le meilleur moteur disponible"""
-        # Essayer EasyOCR en premier (généralement plus précis)
-        if self.easyocr_available:
-            text = self.extract_text_easyocr(image)
-            if text.strip():
-                return text
-        
-        # Fallback sur Tesseract
-        if self.tesseract_available:
-            text = self.extract_text_tesseract(image)
-            if text.strip():
-                return text
+        with self_monitor.track("ocr"):
+            # Essayer EasyOCR en premier (généralement plus précis)
+            if self.easyocr_available:
+                text = self.extract_text_easyocr(image)
+                if text.strip():
+                    return text
+            
+            # Fallback sur Tesseract
+            if self.tesseract_available:
+                text = self.extract_text_tesseract(image)
+                if text.strip():
+                    return text
         
         return "Aucun texte détecté"
     
@@ -183,6 +186,10 @@ class OCREngine:
     
     def find_text_in_image(self, image: Image.Image, search_text: str, case_sensitive=False) -> List[Dict]:
         """Trouve du texte spécifique dans une image"""
+        with self_monitor.track("ocr"):
+            return self._find_text_in_image(image, search_text, case_sensitive)
+    
+    def _find_text_in_image(self, image: Image.Image, search_text: str, case_sensitive: bool) -> List[Dict]:
         try:
             # Extraire tout le texte avec positions
             detailed_results = self.extract_text_detailed_easyocr(image)
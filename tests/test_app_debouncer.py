@@ -0,0 +1,69 @@
+"""
+Tests de l'anti-rebond des changements d'application
+"""
+
+import threading
+import time
+
+from src.core.app_debouncer import AppChangeDebouncer
+
+
+def test_flip_suppressed_until_dwell_unless_clear_lead():
+    """Un candidat d'un seul scan est ignoré ; marge de score = changement immédiat"""
+    debouncer = AppChangeDebouncer(dwell_time=1.5, score_margin=15)
+    
+    assert debouncer.observe("VS Code", now=0.0)          # Première application
+    assert not debouncer.observe("Spotify", lead=2, now=1.0)
+    assert not debouncer.observe("VS Code", now=2.0)      # Rebond évité
+    
+    assert not debouncer.observe("Chrome", lead=5, now=3.0)
+    assert not debouncer.observe("Chrome", lead=5, now=4.0)
+    assert debouncer.observe("Chrome", lead=5, now=4.5)   # Resté en tête 1,5 s
+    
+    assert debouncer.observe("Slack", lead=20, now=5.0)   # Nettement en tête
+    assert debouncer.observe("Terminal", lead=float('inf'), now=5.5)  # Slack fermé
+    
+    stats = debouncer.get_stats()
+    assert stats['changes'] == 4
+    assert stats['suppressed'] == 1
+    assert stats['after_dwell'] == 1 and stats['immediate'] == 2
+    assert stats['flap_rate'] == 0.2
+
+
+def test_deferred_focus_only_last_window_notified():
+    """Fenêtres traversées rapidement (Alt-Tab) : seule la dernière est transmise"""
+    debouncer = AppChangeDebouncer(dwell_time=1.5, score_margin=15, focus_dwell_time=0.05)
+    notified = []
+    done = threading.Event()
+    
+    def notify(app):
+        notified.append(app)
+        if app == "Slack":
+            done.set()
+    
+    debouncer.defer("VS Code", lambda: notify("VS Code"))
+    for app in ("Chrome", "Spotify", "Slack"):
+        debouncer.defer(app, lambda app=app: notify(app))
+    
+    assert done.wait(2)
+    assert notified == ["VS Code", "Slack"]
+    assert debouncer.get_stats()['suppressed'] == 2
+
+
+def test_focus_change_waits_short_dwell_not_polling_dwell():
+    """Un changement de fenêtre X11 est transmis bien avant le délai du polling"""
+    debouncer = AppChangeDebouncer(dwell_time=1.5, score_margin=15, focus_dwell_time=0.05)
+    notified = threading.Event()
+    
+    debouncer.defer("VS Code", lambda: None)
+    start = time.monotonic()
+    debouncer.defer("Chrome", notified.set)
+    
+    assert notified.wait(1.0)
+    assert time.monotonic() - start < 0.5
+    assert debouncer.current == "Chrome"
+    
+    # Le polling garde son délai
+    assert not debouncer.observe("Slack", lead=0, now=0.0)
+    assert not debouncer.observe("Slack", lead=0, now=1.0)
+    assert debouncer.observe("Slack", lead=0, now=1.5)
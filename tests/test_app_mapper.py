@@ -0,0 +1,37 @@
+"""
+Tests de l'index des processus intéressants
+"""
+
+import json
+
+from src.utils.app_mapper import AppMapper, normalize_process_name
+
+
+def test_names_are_normalized_across_platforms():
+    """Même application sous Windows, Linux (comm, chemin du binaire) et via alias"""
+    mapper = AppMapper()
+    
+    assert normalize_process_name(r"C:\Program Files\Microsoft VS Code\Code.exe") == "code"
+    for name in ("code.exe", "code", "/usr/share/code/code", "codium"):
+        assert mapper.is_interesting(name)
+        assert mapper.get_display_name(name) == "VS Code"
+    
+    # /proc/<pid>/comm tronque les noms à 15 caractères
+    assert mapper.get_display_name("epicgameslaunch") == "Epic Games"
+    assert not mapper.is_interesting("conhost.exe")
+    assert not mapper.is_interesting("bash")
+
+
+def test_index_loaded_from_json(tmp_path):
+    """Noms et alias supplémentaires chargés depuis un fichier"""
+    index_file = tmp_path / "apps.json"
+    index_file.write_text(json.dumps({
+        "app_names": {"obsidian.exe": "Obsidian"},
+        "aliases": {"obsidian-bin": "obsidian.exe"}
+    }), encoding="utf-8")
+    
+    mapper = AppMapper()
+    assert not mapper.is_interesting("obsidian")
+    assert mapper.load_index(str(index_file))
+    assert mapper.is_interesting("obsidian-bin")
+    assert mapper.get_display_name("obsidian") == "Obsidian"
@@ -0,0 +1,50 @@
+"""
+Tests de l'écriture disque en arrière-plan
+"""
+
+import threading
+import time
+
+from src.utils.batch_writer import BatchWriter
+
+
+def test_items_are_written_in_order_by_size_and_time():
+    batches = []
+    writer = BatchWriter("test-writer", batches.append, batch_size=3, flush_interval=0.05)
+    for i in range(7):
+        writer.submit(i)
+    assert writer.flush()
+    
+    assert [item for batch in batches for item in batch] == list(range(7))
+    assert max(len(batch) for batch in batches) <= 3
+    
+    # Sous le seuil de taille : écrit après flush_interval
+    writer.submit(7)
+    time.sleep(0.3)
+    assert batches[-1] == [7]
+    writer.close()
+    assert not writer.submit(8)
+
+
+def test_full_queue_drops_without_blocking_the_caller():
+    """Disque lent : submit retourne immédiatement et compte les abandons"""
+    release = threading.Event()
+    written = []
+    
+    def slow_write(batch):
+        release.wait(2)
+        written.extend(batch)
+    
+    writer = BatchWriter("test-writer", slow_write, max_queue=5, batch_size=1, flush_interval=0.01)
+    start = time.perf_counter()
+    accepted = [writer.submit(i) for i in range(50)]
+    assert time.perf_counter() - start < 0.5
+    
+    stats = writer.get_stats()
+    assert stats['dropped'] == accepted.count(False) > 0
+    assert stats['queue_high_water'] == 5
+    
+    release.set()
+    writer.close()
+    assert len(written) == accepted.count(True)
+    assert writer.get_stats()['pending'] == 0
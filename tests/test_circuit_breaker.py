@@ -0,0 +1,96 @@
+"""
+Tests du disjoncteur et du timeout adaptatif
+"""
+
+from src.core.circuit_breaker import AdaptiveTimeout, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_threshold_and_probes():
+    """Ouvert après N échecs, une seule requête de test, fermé si elle réussit"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, base_backoff=2.0, clock=clock)
+    
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.time_until_retry() == 2.0
+    
+    clock.now = 2.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()  # Test déjà en cours
+    
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_breaker_backoff_is_exponential_and_capped():
+    """Chaque test raté double le délai, jusqu'au plafond"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(base_backoff=2.0, max_backoff=10.0, clock=clock)
+    
+    breaker.trip()
+    delays = []
+    for _ in range(4):
+        delays.append(breaker.time_until_retry())
+        clock.now += breaker.time_until_retry()
+        assert breaker.allow_request()
+        breaker.trip()
+    
+    assert delays == [2.0, 4.0, 8.0, 10.0]
+    
+    # Test annulé : la prochaine requête peut tester immédiatement
+    clock.now += breaker.time_until_retry()
+    assert breaker.allow_request()
+    breaker.abandon_probe()
+    assert breaker.time_until_retry() == 0.0
+    assert breaker.allow_request()
+
+
+def test_adaptive_timeout_follows_latency_percentile():
+    """Timeout maximal sans historique, puis percentile x facteur borné"""
+    timeout = AdaptiveTimeout(max_timeout=15.0, min_timeout=3.0, percentile=0.95,
+                              factor=2.0, min_samples=5)
+    assert timeout.current() == 15.0
+    
+    for latency in [2.0, 2.5, 2.2, 2.8, 2.4]:
+        timeout.record(latency)
+    assert timeout.current() == 5.6
+    
+    for _ in range(5):
+        timeout.record(0.1)
+    assert timeout.current() >= 3.0
+    
+    for _ in range(50):
+        timeout.record(20.0)
+    assert timeout.current() == 15.0
+
+
+def test_timeout_widens_to_max_when_model_goes_cold():
+    """Modèle chaud (1 s) puis déchargé : après un timeout, le maximum jusqu'à la réussite"""
+    timeout = AdaptiveTimeout(max_timeout=15.0, min_timeout=3.0, percentile=0.95, factor=2.0)
+    for _ in range(49):
+        timeout.record(1.0)
+    assert timeout.current() == 3.0
+    
+    # Chargement du modèle plus long que 3 s
+    timeout.record_timeout()
+    assert timeout.current() == 15.0
+    assert timeout.current() == 15.0
+    
+    # Le chargement aboutit avec le timeout maximal, le modèle est de nouveau chaud
+    timeout.record(8.0)
+    assert timeout.current() == 3.0
@@ -0,0 +1,80 @@
+"""
+Tests du suivi X11 de la fenêtre active (sous Xvfb)
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src.core.focus_watcher import XLIB_AVAILABLE, X11FocusWatcher
+
+pytestmark = pytest.mark.skipif(
+    not XLIB_AVAILABLE or shutil.which("Xvfb") is None,
+    reason="python-xlib et Xvfb requis"
+)
+
+
+@pytest.fixture
+def xvfb():
+    """Serveur X virtuel sur un affichage libre"""
+    display_name = f":{90 + os.getpid() % 100}"
+    server = subprocess.Popen(["Xvfb", display_name, "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    from Xlib import display as xdisplay
+    for _ in range(50):
+        try:
+            xdisplay.Display(display_name).close()
+            break
+        except Exception:
+            time.sleep(0.1)
+    else:
+        server.kill()
+        pytest.skip("Xvfb n'a pas démarré")
+    
+    yield display_name
+    server.terminate()
+    server.wait(timeout=5)
+
+
+def test_focus_change_resolves_window_pid(xvfb):
+    """Changer _NET_ACTIVE_WINDOW notifie le pid de la fenêtre en quelques ms"""
+    from Xlib import X, Xatom, display as xdisplay
+    
+    # Faux gestionnaire de fenêtres : crée une fenêtre et publie la fenêtre active
+    wm = xdisplay.Display(xvfb)
+    root = wm.screen().root
+    window = root.create_window(0, 0, 100, 100, 0, wm.screen().root_depth)
+    window.change_property(wm.intern_atom('_NET_WM_PID'), Xatom.CARDINAL, 32, [os.getpid()])
+    wm.flush()
+    
+    focused = threading.Event()
+    received = []
+    
+    def on_focus(pid, name, title):
+        received.append((pid, name, time.perf_counter()))
+        focused.set()
+    
+    watcher = X11FocusWatcher(on_focus, display_name=xvfb)
+    assert watcher.start()
+    try:
+        time.sleep(0.2)
+        changed_at = time.perf_counter()
+        root.change_property(wm.intern_atom('_NET_ACTIVE_WINDOW'), Xatom.WINDOW, 32,
+                             [window.id], mode=X.PropModeReplace)
+        wm.flush()
+        
+        assert focused.wait(2)
+        pid, name, notified_at = received[-1]
+        assert pid == os.getpid()
+        assert name
+        assert notified_at - changed_at < 0.5
+    finally:
+        watcher.stop()
+        wm.close()
+    
+    assert not watcher.thread.is_alive()
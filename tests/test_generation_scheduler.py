@@ -0,0 +1,152 @@
+"""
+Tests du scheduler de générations (fusion, annulation, concurrence)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.generation_scheduler import GenerationScheduler
+from src.utils.event_loop import EventLoopThread
+
+
+@pytest.fixture
+def scheduler():
+    event_loop = EventLoopThread("test-loop")
+    scheduler = GenerationScheduler(max_concurrent=1, event_loop=event_loop)
+    yield scheduler
+    scheduler.shutdown()
+    event_loop.stop()
+
+
+def wait_idle(scheduler: GenerationScheduler, timeout: float = 2.0):
+    deadline = time.time() + timeout
+    while scheduler.get_stats()['inflight'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert scheduler.get_stats()['inflight'] == 0
+
+
+def blocking_generation(release: threading.Event, result: str, started: threading.Event = None):
+    """Génération factice qui attend `release` (ou l'annulation de sa tâche)"""
+    async def func() -> str:
+        if started:
+            started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+        return result
+    return func
+
+
+def test_identical_requests_are_coalesced(scheduler):
+    """Deux demandes identiques ne lancent qu'une génération"""
+    release = threading.Event()
+    results = []
+    
+    scheduler.submit("Chrome", blocking_generation(release, "conseil"), results.append)
+    scheduler.submit("Chrome", blocking_generation(release, "doublon"), results.append)
+    release.set()
+    wait_idle(scheduler)
+    
+    stats = scheduler.get_stats()
+    assert results == ["conseil"]
+    assert stats['coalesced'] == 1
+    assert stats['started'] == 1
+
+
+def test_newer_request_cancels_stale_ones(scheduler):
+    """Une nouvelle application rend obsolètes les demandes précédentes"""
+    release = threading.Event()
+    started = threading.Event()
+    results = []
+    
+    scheduler.submit("Chrome", blocking_generation(release, "chrome", started), results.append)
+    started.wait(1)
+    scheduler.submit("Word", blocking_generation(release, "word"), results.append)
+    scheduler.submit("VS Code", blocking_generation(release, "vscode"), results.append)
+    release.set()
+    wait_idle(scheduler)
+    
+    stats = scheduler.get_stats()
+    assert results == ["vscode"]
+    assert stats['stale'] >= 1      # Chrome démarré puis annulé
+    # Word abandonné avant de démarrer, ou annulé s'il a démarré avant VS Code
+    assert stats['stale'] + stats['dropped'] == 2
+    assert stats['completed'] == 1
+
+
+def test_started_generation_is_interrupted(scheduler):
+    """La tâche d'une génération obsolète est annulée, sans attendre sa fin"""
+    never = threading.Event()
+    started = threading.Event()
+    interrupted = threading.Event()
+    
+    async def endless() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            interrupted.set()
+            raise
+        return "jamais"
+    
+    scheduler.submit("Chrome", endless)
+    started.wait(1)
+    scheduler.submit("Word", blocking_generation(never, "word"))
+    
+    assert interrupted.wait(1)
+    never.set()
+    wait_idle(scheduler)
+
+
+def test_concurrency_is_capped():
+    """Jamais plus de `max_concurrent` générations simultanées"""
+    event_loop = EventLoopThread("test-loop")
+    scheduler = GenerationScheduler(max_concurrent=2, event_loop=event_loop)
+    running = [0]
+    peak = [0]
+    
+    async def func():
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+    
+    for i in range(6):
+        scheduler.submit_background(f"app-{i}", func)
+    wait_idle(scheduler)
+    
+    assert peak[0] == 2
+    scheduler.shutdown()
+    event_loop.stop()
+
+
+def test_background_job_cancelled_by_real_request(scheduler):
+    """Un préchargement est annulé dès qu'une vraie demande arrive"""
+    release = threading.Event()
+    started = threading.Event()
+    results = []
+    
+    scheduler.submit_background("prefetch-word", blocking_generation(release, "word", started), results.append)
+    started.wait(1)
+    scheduler.submit("Chrome", blocking_generation(release, "chrome"), results.append)
+    release.set()
+    wait_idle(scheduler)
+    
+    stats = scheduler.get_stats()
+    assert results == ["chrome"]
+    assert stats['background_cancelled'] == 1
+    assert stats['completed'] == 1
+
+
+def test_background_job_rejected_while_busy(scheduler):
+    """Pas de préchargement tant qu'une vraie génération est en cours"""
+    release = threading.Event()
+    
+    scheduler.submit("Chrome", blocking_generation(release, "chrome"))
+    assert scheduler.submit_background("prefetch-word", blocking_generation(release, "word")) is None
+    release.set()
+    wait_idle(scheduler)
+    
+    assert scheduler.get_stats()['background_rejected'] == 1
@@ -0,0 +1,73 @@
+"""
+Tests du journal des données d'apprentissage
+"""
+
+import json
+
+from src.core.learning_journal import LearningJournal
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+
+def make_engine(tmp_path):
+    timeline = UsageTimeline(str(tmp_path / "timeline"))
+    return UserLearningEngine(str(tmp_path / "patterns.json"), timeline=timeline)
+
+
+def test_events_are_replayed_after_crash_and_compacted_on_close(tmp_path):
+    """Sans instantané (arrêt brutal), le journal suffit ; close() compacte"""
+    engine = make_engine(tmp_path)
+    engine.record_user_action("VS Code", "save", 1000.0)
+    engine.record_suggestion_feedback("tip-1", True)
+    engine.record_suggestion_feedback("tip-1", True)
+    engine.writer.flush()
+    assert not (tmp_path / "patterns.json").exists()
+    
+    recovered = make_engine(tmp_path)
+    assert recovered.suggestion_feedback == {"tip-1": 2}
+    assert recovered.user_patterns["VS Code"][0]['action'] == "save"
+    
+    recovered.close()
+    assert (tmp_path / "patterns.journal").read_text() == ""
+    assert make_engine(tmp_path).suggestion_feedback == {"tip-1": 2}
+
+
+def test_snapshot_is_periodic_and_never_applied_twice(tmp_path):
+    journal = LearningJournal(str(tmp_path / "patterns.json"), snapshot_every=3)
+    journal.load()
+    assert not journal.append([{'type': 'feedback', 'id': 'a', 'delta': 1, 'seq': 1}])
+    assert journal.append([{'type': 'feedback', 'id': 'a', 'delta': 1, 'seq': seq} for seq in (2, 3)])
+    
+    # Arrêt entre l'instantané et la remise à zéro du journal
+    journal_lines = (tmp_path / "patterns.journal").read_text()
+    journal.snapshot({'feedback': {'a': 3}}, 3)
+    (tmp_path / "patterns.journal").write_text(journal_lines)
+    
+    data, events = LearningJournal(str(tmp_path / "patterns.json")).load()
+    assert data == {'feedback': {'a': 3}}
+    assert events == []
+
+
+def test_truncated_tail_is_dropped_and_journal_stays_appendable(tmp_path):
+    engine = make_engine(tmp_path)
+    engine.record_suggestion_feedback("tip-1", False)
+    engine.writer.flush()
+    engine.journal.close()
+    with open(tmp_path / "patterns.journal", "a") as f:
+        f.write('{"type":"feedback","id":"tip-1","de')
+    
+    recovered = make_engine(tmp_path)
+    assert recovered.journal.stats['truncated'] == 1
+    recovered.record_suggestion_feedback("tip-2", True)
+    recovered.writer.flush()
+    recovered.journal.close()
+    
+    lines = (tmp_path / "patterns.journal").read_text().splitlines()
+    assert [json.loads(line)['seq'] for line in lines] == [1, 2]
+    assert make_engine(tmp_path).suggestion_feedback == {"tip-1": -1, "tip-2": 1}
+
+
+def test_legacy_patterns_file_is_loaded(tmp_path):
+    legacy = {'patterns': {}, 'feedback': {'tip-1': 4}, 'transitions': []}
+    (tmp_path / "patterns.json").write_text(json.dumps(legacy, indent=2))
+    assert make_engine(tmp_path).suggestion_feedback == {'tip-1': 4}
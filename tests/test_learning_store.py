@@ -0,0 +1,117 @@
+"""
+Tests du stockage SQLite des données d'apprentissage
+"""
+
+import sqlite3
+import time
+import tracemalloc
+
+import pytest
+
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+
+def make_engine(tmp_path, timeline=None):
+    timeline = timeline or UsageTimeline(str(tmp_path / "timeline"))
+    return UserLearningEngine(str(tmp_path / "patterns.json"), timeline=timeline, backend="sqlite")
+
+
+def test_sqlite_backend_matches_in_memory_matrix(tmp_path):
+    """Mêmes workflows et heures actives qu'en mémoire, agrégés en SQL"""
+    timeline = UsageTimeline(str(tmp_path / "timeline"))
+    t = time.time() - 600 * 3 * 3600 - 3600
+    for i in range(600):
+        timeline.record_focus(["VS Code", "Chrome", "Terminal", "Chrome"][i % 4], t)
+        t += 3 * 3600
+    timeline.close(t)
+    
+    memory = UserLearningEngine(str(tmp_path / "memory.json"), timeline=timeline, backend="json")
+    engine = make_engine(tmp_path, timeline)
+    try:
+        assert engine.get_common_workflows() == memory.get_common_workflows()
+        # Écart dû à l'horizon de 10 demi-vies côté SQL
+        for app, weight in memory.transitions.successors("Chrome", time.time()):
+            assert dict(engine.store.successors("Chrome", time.time()))[app] == pytest.approx(weight, rel=1e-3)
+        assert engine.store.hour_counts() == memory.hour_counts
+        assert engine.get_usage_stats()['total_transitions'] == memory.get_usage_stats()['total_transitions']
+    finally:
+        engine.close()
+
+
+def test_writes_are_batched_and_survive_restart(tmp_path):
+    engine = make_engine(tmp_path)
+    for i in range(500):
+        engine.record_user_action("VS Code", f"action-{i}", 1000.0 + i)
+    engine.record_suggestion_feedback("tip-1", True)
+    engine.record_suggestion_feedback("tip-1", False)
+    engine.record_suggestion_feedback("tip-1", True)
+    engine.close()
+    
+    writer_stats = engine.get_persistence_stats()
+    assert writer_stats['written'] == 503 and writer_stats['dropped'] == 0
+    assert writer_stats['batches'] < 503
+    with sqlite3.connect(tmp_path / "patterns.db") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    reopened = make_engine(tmp_path)
+    try:
+        # Historique complet (plus de limite à 50 actions par application)
+        assert len(reopened.store.recent_actions("VS Code", limit=1000)) == 500
+        assert reopened.store.recent_actions("VS Code", limit=2)[-1]['action'] == "action-499"
+        assert reopened.store.feedback_scores() == {"tip-1": 1}
+    finally:
+        reopened.close()
+
+
+def test_json_data_is_migrated_into_empty_database(tmp_path):
+    json_engine = UserLearningEngine(str(tmp_path / "patterns.json"),
+                                     timeline=UsageTimeline(str(tmp_path / "timeline")), backend="json")
+    json_engine.record_suggestion_feedback("tip-1", True)
+    json_engine.record_user_action("Slack", "send", 1000.0)
+    json_engine.close()
+    
+    engine = make_engine(tmp_path)
+    try:
+        assert engine.store.feedback_scores() == {"tip-1": 1}
+        assert engine.store.recent_actions("Slack")[0]['action'] == "send"
+    finally:
+        engine.close()
+
+
+def test_memory_stays_bounded_as_history_grows(tmp_path):
+    """Le prédicteur est entraîné par agrégation SQL : mémoire indépendante de la taille de l'historique"""
+    apps = ["VS Code", "Chrome", "Terminal", "Slack", "Spotify", "Jira"]
+    now = time.time()
+    
+    def open_with_history(name, count):
+        directory = tmp_path / name
+        directory.mkdir()
+        seed = make_engine(directory)
+        seed.store.import_data(
+            ((apps[i % 6], apps[(i * 5 + 1) % 6], now - 86400 * 30 * i / count) for i in range(count)), [], []
+        )
+        seed.close()
+        
+        tracemalloc.start()
+        engine = make_engine(directory)
+        for i in range(200):
+            engine.record_app_transition(apps[i % 6], apps[(i + 1) % 6])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return engine, peak
+    
+    small, small_peak = open_with_history("small", 2_000)
+    large, large_peak = open_with_history("large", 50_000)
+    try:
+        # Rien n'est ajouté à la chronologie en mémoire
+        assert len(small.timeline) == len(large.timeline) == 0
+        assert small.timeline.open_app is None
+        # Mêmes contextes, seuls les comptes changent
+        assert len(large.predictor.first_hour) == len(small.predictor.first_hour)
+        assert large.predictor.observations("VS Code") > small.predictor.observations("VS Code")
+        assert large_peak < 2 * small_peak
+        assert large.predict_next_apps("VS Code", k=1)
+    finally:
+        small.close()
+        large.close()
@@ -0,0 +1,51 @@
+"""
+Tests du registre de métriques LLM
+"""
+
+import json
+
+from src.core.llm_metrics import LLMMetrics
+
+
+def ollama_response(eval_count=50, eval_ms=1000, prompt_ms=200, load_ms=10):
+    """Champs de métriques d'une réponse finale d'Ollama (durées en ns)"""
+    return {
+        "done": True,
+        "eval_count": eval_count,
+        "eval_duration": eval_ms * 1_000_000,
+        "prompt_eval_count": 30,
+        "prompt_eval_duration": prompt_ms * 1_000_000,
+        "load_duration": load_ms * 1_000_000,
+        "total_duration": (eval_ms + prompt_ms + load_ms) * 1_000_000
+    }
+
+
+def test_registry_aggregates_per_model(tmp_path):
+    """Débit, temps de prompt, histogramme par modèle et export JSON"""
+    metrics = LLMMetrics(window=10)
+    for latency in (0.2, 0.4, 1.5):
+        metrics.record_generation("llama3.2", ollama_response(), latency)
+    metrics.record_generation("mistral", ollama_response(eval_count=20), 0.05)
+    metrics.record_queue_time(0.01)
+    
+    llama = metrics.get_model_summary("llama3.2")
+    assert llama['generations'] == 3
+    assert llama['tokens_per_s'] == 50.0
+    assert llama['prompt_eval_ms'] == 200.0
+    assert llama['server_ms'] == 1210.0
+    assert llama['latency_ms']['p50'] == 400.0
+    # Comptes cumulés : générations de latence ≤ borne
+    assert llama['histogram']['le_100'] == 0
+    assert llama['histogram']['le_250'] == 1
+    assert llama['histogram']['le_500'] == 2
+    assert llama['histogram']['le_1000'] == 2
+    assert llama['histogram']['le_2000'] == 3
+    assert llama['histogram']['le_inf'] == llama['generations']
+    assert metrics.get_model_summary("mistral")['tokens_per_s'] == 20.0
+    assert metrics.get_model_summary("inconnu") is None
+    
+    export_file = tmp_path / "llm_metrics.json"
+    assert metrics.export_json(str(export_file))
+    exported = json.loads(export_file.read_text(encoding="utf-8"))
+    assert set(exported['models']) == {"llama3.2", "mistral"}
+    assert exported['queue_ms']['p50'] == 10.0
@@ -0,0 +1,137 @@
+"""
+Tests de l'enregistrement et du rejeu de sessions SystemMonitor
+"""
+
+import contextlib
+import json
+from collections import namedtuple
+
+import psutil
+
+from src.core.monitor_backends import RECORDING_VERSION, MonitorBackend, RecordingBackend, ReplayBackend
+from src.core.system_monitor import SystemMonitor
+from src.core.usage_timeline import UsageTimeline
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+CpuTimes = namedtuple("CpuTimes", "user system")
+
+
+class ScriptedBackend(MonitorBackend):
+    """Table de processus dont l'application active (CPU) change à chaque scan"""
+    
+    def __init__(self, script):
+        self.script = script
+        self.step = -1
+        self.cpu = {}
+        self.table = {10: "code", 11: "firefox", 12: "slack", 13: "daemon", 14: "protected"}
+    
+    def pids(self):
+        self.step += 1
+        active = self.script[min(self.step, len(self.script) - 1)]
+        for pid, name in self.table.items():
+            self.cpu[pid] = self.cpu.get(pid, 0.0) + (0.5 if name == active else 0.0)
+        return list(self.table)
+    
+    def process(self, pid):
+        if self.table[pid] == "protected":
+            raise psutil.AccessDenied(pid)
+        return ScriptedProcess(self, pid)
+    
+    def time(self):
+        return 1_780_000_000.0 + self.step
+    
+    def monotonic(self):
+        return float(self.step)
+
+
+class ScriptedProcess:
+    def __init__(self, backend, pid):
+        self.backend = backend
+        self.pid = pid
+    
+    def oneshot(self):
+        return contextlib.nullcontext()
+    
+    def name(self):
+        return self.backend.table[self.pid]
+    
+    def create_time(self):
+        return 1_779_990_000.0
+    
+    def memory_info(self):
+        return MemoryInfo(200 * 1024 * 1024, 0)
+    
+    def cpu_times(self):
+        return CpuTimes(self.backend.cpu[self.pid], 0.0)
+    
+    def is_running(self):
+        return True
+
+
+def run_scans(backend, scans, tmp_path):
+    detected = []
+    monitor = SystemMonitor(lambda app, context: detected.append(app), process_backend=backend)
+    monitor.timeline = UsageTimeline(str(tmp_path / "timeline"))
+    for _ in range(scans):
+        monitor._notify_app(*monitor._get_active_app_info())
+    monitor.stop()
+    return detected, monitor
+
+
+def test_replay_reproduces_recorded_session(tmp_path):
+    """Le rejeu d'une session enregistrée produit les mêmes détections, sans lire le système"""
+    script = ["code", "code", "firefox", "firefox", "slack", "code"]
+    path = str(tmp_path / "session.jsonl")
+    
+    recorder = RecordingBackend(ScriptedBackend(script), path)
+    recorded, _ = run_scans(recorder, len(script), tmp_path)
+    
+    replay = ReplayBackend(path)
+    replayed, monitor = run_scans(replay, len(script), tmp_path)
+    
+    assert recorded == ["VS Code", "Firefox", "Slack", "VS Code"]
+    assert replayed == recorded
+    assert replay.finished
+    assert monitor.scanner.get_stats()['stat_calls'] == 5
+
+
+def test_replay_interleaves_focus_events_with_scans(tmp_path):
+    """Les changements de fenêtre sont délivrés entre les scans, dans l'ordre enregistré, à chaque rejeu"""
+    path = tmp_path / "session.jsonl"
+    records = [{'type': 'header', 'version': RECORDING_VERSION, 'wall': 1000.0}]
+    for step in range(20):
+        records.append({'type': 'scan', 't': float(step), 'wall': 1000.0 + step, 'pids': [], 'procs': {}})
+        if step % 3 == 0:
+            for offset in (0.2, 0.5):
+                t = step + offset
+                records.append({'type': 'focus', 't': t, 'wall': 1000.0 + t,
+                                'pid': None, 'name': f"app{step}", 'title': ""})
+    records.append({'type': 'focus', 't': 19.5, 'wall': 1019.5, 'pid': None, 'name': "last", 'title': ""})
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding='utf-8')
+    
+    def replay():
+        backend = ReplayBackend(str(path))
+        sequence = []
+        
+        class LoggingBackend(MonitorBackend):
+            def pids(self):
+                pids = backend.pids()
+                sequence.append(("scan", backend.monotonic()))
+                return pids
+            
+            def process(self, pid):
+                return backend.process(pid)
+        
+        backend.on_focus = lambda pid, name, title: sequence.append((name, backend.monotonic()))
+        logged = LoggingBackend()
+        while not backend.finished:
+            logged.pids()
+        backend.deliver_focus()
+        return sequence
+    
+    first = replay()
+    assert first == replay()
+    assert first[:4] == [("scan", 0.0), ("app0", 0.2), ("app0", 0.5), ("scan", 1.0)]
+    assert first[-4:] == [("app18", 18.2), ("app18", 18.5), ("scan", 19.0), ("last", 19.5)]
+    assert [entry for entry in first if entry[0] != "scan"] == sorted(
+        (entry for entry in first if entry[0] != "scan"), key=lambda entry: entry[1])
@@ -0,0 +1,89 @@
+"""
+Tests du prédicteur de la prochaine application
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.core.next_app_predictor import NextAppPredictor
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+MORNING = datetime(2026, 3, 2, 9).timestamp()
+EVENING = datetime(2026, 3, 2, 21).timestamp()
+
+
+def test_second_order_context_disambiguates():
+    """Chrome mène à Jira après Slack, à VS Code après VS Code"""
+    predictor = NextAppPredictor()
+    for _ in range(10):
+        for from_app, to_app in [("Slack", "Chrome"), ("Chrome", "Jira"), ("Jira", "VS Code"),
+                                 ("VS Code", "Chrome"), ("Chrome", "VS Code"), ("VS Code", "Slack")]:
+            predictor.record(from_app, to_app, MORNING)
+    
+    assert predictor.predict("Chrome", k=1, previous="Slack")[0][0] == "Jira"
+    assert predictor.predict("Chrome", k=1, previous="VS Code")[0][0] == "VS Code"
+    # Contexte implicite : dernière transition enregistrée (VS Code → Slack)
+    predictor.record("Slack", "Chrome", MORNING)
+    assert predictor.predict("Chrome", k=1)[0][0] == "Jira"
+
+
+def test_hour_of_day_conditioning_and_smoothing():
+    predictor = NextAppPredictor()
+    for _ in range(10):
+        predictor.record("Terminal", "VS Code", MORNING)
+        predictor.record("Terminal", "Spotify", EVENING)
+        predictor.reset_context()
+    
+    assert predictor.predict("Terminal", k=1, timestamp=MORNING)[0][0] == "VS Code"
+    assert predictor.predict("Terminal", k=1, timestamp=EVENING)[0][0] == "Spotify"
+    
+    # Lissage : l'autre application garde une probabilité non nulle, total <= 1
+    predictions = predictor.predict("Terminal", k=5, timestamp=MORNING)
+    assert len(predictions) == 2 and predictions[1][1] > 0
+    assert sum(p for _, p in predictions) == pytest.approx(1.0)
+    assert predictor.predict("Inconnue") == []
+
+
+def test_predict_while_recording_from_another_thread():
+    """Les requêtes du préchargement peuvent croiser les mises à jour de la surveillance"""
+    predictor = NextAppPredictor()
+    apps = [f"App {i}" for i in range(50)]
+    errors = []
+    
+    def writer():
+        for i in range(20000):
+            predictor.record(apps[i % 7], apps[(i * 13) % 50], MORNING)
+    
+    def reader():
+        try:
+            for i in range(2000):
+                predictor.predict(apps[i % 7], k=3, timestamp=MORNING)
+        except RuntimeError as e:  # dictionary changed size during iteration
+            errors.append(e)
+    
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert predictor.stats['updates'] == 20000
+
+
+def test_learning_engine_predictions_need_enough_history(tmp_path):
+    timeline = UsageTimeline(str(tmp_path / "timeline"))
+    engine = UserLearningEngine(str(tmp_path / "patterns.json"), timeline=timeline)
+    
+    engine.record_app_transition("VS Code", "Chrome")
+    engine.record_app_transition("Chrome", "VS Code")
+    assert engine.predict_next_apps("VS Code") == []
+    
+    for _ in range(3):
+        engine.record_app_transition("VS Code", "Chrome")
+        engine.record_app_transition("Chrome", "VS Code")
+    assert engine.predict_next_apps("VS Code") == ["Chrome"]
+    assert engine.get_contextual_suggestion("VS Code", "") == "Tu passes souvent à Chrome après VS Code"
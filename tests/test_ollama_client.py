@@ -0,0 +1,256 @@
+"""
+Tests du client Ollama contre un faux serveur local
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.core.async_ollama_client import AsyncOllamaClient
+from src.core.generation_scheduler import GenerationScheduler
+from src.core.ollama_client import OllamaClient
+from src.core.suggestion_cache import SuggestionCache
+from src.utils.event_loop import EventLoopThread
+
+
+STREAM_CHUNKS = ["Essaie ", "Ctrl+Shift+T", " ! ", "Puis Ctrl+L."]
+PREFIX_TOKENS = [101, 102, 103]
+
+
+def is_priming(payload: dict) -> bool:
+    return payload.get("options", {}).get("num_predict") == 0
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Faux serveur Ollama (réponse complète ou NDJSON en streaming)"""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def _send(self, body: bytes, content_type: str = "application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self._send(json.dumps({"models": [{"name": "stub:latest"}]}).encode())
+    
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        
+        if is_priming(payload):
+            # Amorçage d'un préfixe : renvoyer ses tokens
+            self._send(json.dumps({"response": "", "done": True, "context": PREFIX_TOKENS,
+                                   "prompt_eval_count": 120}).encode())
+        elif payload.get("stream"):
+            time.sleep(self.server.stream_delay)
+            lines = [json.dumps({"response": chunk, "done": False}) for chunk in STREAM_CHUNKS]
+            lines.append(json.dumps({"response": "", "done": True,
+                                     "prompt_eval_count": len(payload["prompt"].split())}))
+            self._send(("\n".join(lines) + "\n").encode(), "application/x-ndjson")
+        else:
+            self._send(json.dumps({"response": "".join(STREAM_CHUNKS), "done": True}).encode())
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # Client parti en cours de réponse (génération annulée)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubOllamaServer(("127.0.0.1", 0), StubOllamaHandler)
+    server.payloads = []
+    server.stream_delay = 0.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub_server):
+    client = OllamaClient(
+        base_url=f"http://127.0.0.1:{stub_server.server_address[1]}",
+        model="stub",
+        cache=SuggestionCache()
+    )
+    yield client
+    client.close()
+
+
+def test_generate_suggestion(client, stub_server):
+    """La suggestion complète est nettoyée et renvoyée"""
+    assert client.available
+    assert client.generate_suggestion("Chrome", "Navigation web") == "Essaie Ctrl+Shift+T ! Puis Ctrl+L."
+    assert stub_server.payloads[-1]["stream"] is False
+
+
+def test_stream_suggestion_yields_cumulative_text(client, stub_server):
+    """Le streaming produit le texte cumulé chunk par chunk"""
+    parts = list(client.stream_suggestion("Chrome", "Navigation web"))
+    
+    assert stub_server.payloads[-1]["stream"] is True
+    assert parts[0] == "Essaie"
+    assert parts[-1] == "Essaie Ctrl+Shift+T ! Puis Ctrl+L."
+    assert len(parts) == len(STREAM_CHUNKS)
+
+
+def test_repeated_app_switch_hits_cache(client, stub_server):
+    """Un retour sur la même application est servi par le cache"""
+    first = client.generate_suggestion("Chrome", "Navigation web (10:00)")
+    requests_sent = len(stub_server.payloads)
+    
+    assert client.generate_suggestion("Chrome", "Navigation web (10:05)") == first
+    assert list(client.stream_suggestion("Chrome", "Navigation web")) == [first]
+    assert len(stub_server.payloads) == requests_sent
+    assert client.cache.get_stats()['hits'] == 2
+
+
+def test_prefix_context_reused_within_category(client, stub_server):
+    """Le préfixe d'une catégorie est amorcé une fois, puis seul le suffixe est envoyé"""
+    list(client.stream_suggestion("Chrome", "Navigation web"))
+    list(client.stream_suggestion("Firefox", "Navigation web"))
+    
+    priming = [p for p in stub_server.payloads if is_priming(p)]
+    generations = [p for p in stub_server.payloads if p.get("stream")]
+    assert len(priming) == 1
+    # Préfixe nu : le contexte mémorisé ne contient ni consigne ni réponse
+    assert priming[0]["prompt"] == client._prompt_prefix("Navigation")
+    
+    assert [p["context"] for p in generations] == [PREFIX_TOKENS, PREFIX_TOKENS]
+    assert all("Tu es un assistant" not in p["prompt"] for p in generations)
+    assert "Application: Firefox" in generations[-1]["prompt"]
+    assert client.prompt_stats['context_reused'] == 2
+
+
+def test_priming_timeout_fails_fast(client, monkeypatch):
+    """Timeout de l'amorçage : signalé au disjoncteur et au timeout adaptatif, sans seconde attente"""
+    calls = []
+    
+    def post(url, json=None, **kwargs):
+        calls.append(json)
+        raise requests.exceptions.ReadTimeout("trop long")
+    
+    monkeypatch.setattr(client.session, "post", post)
+    
+    assert client.generate_suggestion("Chrome", "Navigation web").startswith("⏱️")
+    assert len(calls) == 1 and is_priming(calls[0])
+    assert client.breaker.consecutive_failures == 1
+    assert client.adaptive_timeouts['generate'].current() == client.adaptive_timeouts['generate'].max_timeout
+
+
+def test_stream_suggestion_when_unavailable(client):
+    """Connexion perdue : échec immédiat, puis reconnexion à la fin du délai"""
+    client._on_connection_lost("Connexion refusée")
+    parts = list(client.stream_suggestion("Chrome", "Navigation web"))
+    assert len(parts) == 1
+    assert parts[0].startswith("🔌")
+    assert "nouvel essai" in parts[0]
+    
+    # Fin du backoff : la requête suivante sert de test et reconnecte le client
+    client.breaker.retry_at = 0.0
+    parts = list(client.stream_suggestion("Chrome", "Navigation web"))
+    assert parts[-1] == "Essaie Ctrl+Shift+T ! Puis Ctrl+L."
+    assert client.available
+    assert client.breaker.state == "closed"
+
+
+def test_warm_up_records_cold_then_warm_latency(client, stub_server):
+    """Le premier warm-up mesure le cold start, les suivants la latence à chaud"""
+    assert client.warm_up()
+    assert client.warm_up()
+    
+    warmup_payload = stub_server.payloads[-1]
+    assert "prompt" not in warmup_payload
+    assert warmup_payload["keep_alive"]
+    assert client.latency_stats['cold_start_ms'] is not None
+    assert client.latency_stats['warm_ms'] is not None
+    assert client.latency_stats['warmups'] == 2
+
+
+def test_async_client_same_surface(stub_server):
+    """Le client asyncio expose les mêmes appels que le client bloquant"""
+    base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+    
+    async def scenario():
+        client = AsyncOllamaClient(base_url=base_url, model="stub", cache=SuggestionCache())
+        assert await client.check_connection()
+        assert await client.get_available_models() == ["stub:latest"]
+        
+        parts = [part async for part in client.stream_suggestion("Chrome", "Navigation web")]
+        assert parts[-1] == "Essaie Ctrl+Shift+T ! Puis Ctrl+L."
+        assert await client.generate_suggestion("Chrome", "Navigation web") == parts[-1]
+        
+        result = await client.test_model()
+        assert result["success"]
+        await client.aclose()
+    
+    asyncio.run(scenario())
+
+
+def test_async_client_concurrency_is_bounded(stub_server):
+    """Le sémaphore limite les générations simultanées"""
+    base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+    
+    async def scenario():
+        client = AsyncOllamaClient(base_url=base_url, model="stub",
+                                   cache=SuggestionCache(max_entries=0), max_concurrent=2)
+        await client.check_connection()
+        results = await asyncio.gather(*[
+            client.generate_suggestion(f"App {i}", "Test") for i in range(6)
+        ])
+        assert all(result.startswith("Essaie") for result in results)
+        assert client.semaphore._value == 2
+        await client.aclose()
+    
+    asyncio.run(scenario())
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_cancelled_probe_is_retried_without_backoff(stub_server):
+    """Génération de test annulée par le scheduler : la requête suivante refait le test"""
+    stub_server.stream_delay = 0.5
+    event_loop = EventLoopThread("test-loop")
+    scheduler = GenerationScheduler(event_loop=event_loop)
+    client = AsyncOllamaClient(base_url=f"http://127.0.0.1:{stub_server.server_address[1]}",
+                               model="stub", cache=SuggestionCache())
+    assert event_loop.run_sync(client.check_connection())
+    
+    # Circuit ouvert et fin du backoff : la prochaine génération sert de test
+    client.breaker.trip()
+    client.breaker.retry_at = 0.0
+    
+    async def generation() -> str:
+        return await client.generate_suggestion("Chrome", "Navigation web")
+    
+    scheduler.submit("Chrome", generation)
+    wait_until(lambda: any(p.get("stream") for p in stub_server.payloads))
+    assert client.breaker.state == "half_open"
+    scheduler.cancel_all()
+    wait_until(lambda: scheduler.get_stats()['inflight'] == 0)
+    
+    assert scheduler.get_stats()['stale'] == 1
+    assert client.breaker.state == "open"
+    assert client.breaker.time_until_retry() == 0.0
+    assert client.breaker.allow_request()
+    
+    event_loop.run_sync(client.aclose())
+    event_loop.stop()
@@ -0,0 +1,49 @@
+"""
+Tests de l'historique borné des processus
+"""
+
+from src.core.process_history import ProcessHistory
+from src.core.system_monitor import SystemMonitor
+
+
+def test_ring_lru_and_pid_reuse():
+    """Tampon circulaire par pid, éviction LRU et réinitialisation si le pid est réattribué"""
+    history = ProcessHistory(max_pids=3, ring_size=4)
+    
+    for t in range(10):
+        assert history.record(1, 100.0, float(t)) == min(t + 1, 4)
+    assert history.count(1) == 4
+    
+    history.record(2, 100.0, 1.0)
+    history.record(3, 100.0, 1.0)
+    history.record(1, 100.0, 11.0)  # 1 redevient le plus récent
+    history.record(4, 100.0, 1.0)   # évince 2
+    assert 2 not in history and 1 in history
+    assert len(history) == 3
+    assert history.stats['evicted'] == 1
+    
+    # Même pid, autre date de création : nouveau processus
+    assert history.count(1, create_time=200.0) == 0
+    assert history.record(1, 200.0, 12.0) == 1
+    
+    assert history.reap({1, 4}) == 1
+    assert list(history) == [4, 1]
+    assert history.memory_footprint() > 0
+
+
+def test_monitor_reaps_history_from_scan():
+    """Les pid disparus au scan sont retirés de l'historique ; l'empreinte est rapportée"""
+    monitor = SystemMonitor(lambda app, context: None)
+    monitor.process_history.record(4242, 1.0, 1.0)
+    monitor.process_history.record(4343, 1.0, 1.0)
+    
+    monitor.scanner.scan = lambda: []
+    monitor.scanner.last_reaped = [4242]
+    monitor._get_active_app_info()
+    
+    assert 4242 not in monitor.process_history
+    assert 4343 in monitor.process_history
+    memory_stats = monitor.get_memory_stats()
+    assert memory_stats['process_history_pids'] == 1
+    assert memory_stats['process_history_bytes'] > 0
+    assert 'process_history_bytes' not in monitor.get_usage_stats()
@@ -0,0 +1,129 @@
+"""
+Tests du scanner incrémental de processus (table de processus simulée)
+"""
+
+import contextlib
+from collections import namedtuple
+
+import psutil
+
+from src.core.process_scanner import ProcessScanner
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+CpuTimes = namedtuple("CpuTimes", "user system")
+
+
+class FakeProcessTable:
+    """Table pid → (nom, date de création) qui compte les lectures"""
+    
+    def __init__(self):
+        self.processes = {}
+        self.cpu = {}  # pid → secondes CPU consommées
+        self.reads = {'name': 0, 'memory_info': 0}
+    
+    def spawn(self, pid, name, create_time):
+        self.processes[pid] = (name, create_time)
+    
+    def pids(self):
+        return list(self.processes)
+    
+    def process(self, pid):
+        if pid not in self.processes:
+            raise psutil.NoSuchProcess(pid)
+        return FakeProcess(self, pid)
+
+
+class FakeProcess:
+    def __init__(self, table, pid):
+        self.table = table
+        self.pid = pid
+        self._create_time = table.processes[pid][1]
+    
+    def oneshot(self):
+        return contextlib.nullcontext()
+    
+    def name(self):
+        self.table.reads['name'] += 1
+        return self.table.processes[self.pid][0]
+    
+    def create_time(self):
+        return self._create_time
+    
+    def memory_info(self):
+        self.table.reads['memory_info'] += 1
+        return MemoryInfo(100 * 1024 * 1024, 0)
+    
+    def cpu_times(self):
+        return CpuTimes(self.table.cpu.get(self.pid, 0.0), 0.0)
+    
+    def is_running(self):
+        current = self.table.processes.get(self.pid)
+        return current is not None and current[1] == self._create_time
+
+
+def make_scanner(table, clock=None):
+    return ProcessScanner(lambda name: name.startswith("app"),
+                          pids_func=table.pids, process_factory=table.process,
+                          full_rescan_every=0, clock=clock or (lambda: 0.0))
+
+
+def test_only_new_pids_are_read():
+    """Les processus déjà connus ne sont pas relus, la mémoire seulement pour les intéressants"""
+    table = FakeProcessTable()
+    for pid in range(1, 101):
+        table.spawn(pid, "daemon", 1.0)
+    table.spawn(200, "app-editor", 2.0)
+    scanner = make_scanner(table)
+    
+    results = scanner.scan()
+    assert [r['name'] for r in results] == ["app-editor"]
+    assert table.reads['name'] == 101
+    
+    table.spawn(201, "app-browser", 3.0)
+    results = scanner.scan()
+    assert sorted(r['name'] for r in results) == ["app-browser", "app-editor"]
+    assert table.reads['name'] == 102
+    assert table.reads['memory_info'] == 3
+
+
+def test_dead_and_reused_pids():
+    """Les pid disparus sont oubliés, un pid réattribué est relu"""
+    table = FakeProcessTable()
+    table.spawn(10, "app-editor", 1.0)
+    table.spawn(11, "daemon", 1.0)
+    scanner = make_scanner(table)
+    scanner.scan()
+    
+    del table.processes[11]
+    table.spawn(10, "app-chat", 5.0)  # Même pid, nouveau processus
+    results = scanner.scan()
+    
+    assert [r['name'] for r in results] == ["app-chat"]
+    assert results[0]['create_time'] == 5.0
+    assert scanner.known_pids() == {10}
+    assert scanner.get_stats()['reaped'] == 1
+    assert scanner.get_stats()['reused_pids'] == 1
+
+
+
+def test_cpu_percent_from_cpu_times_delta():
+    """% CPU calculé par différence entre deux passages, sans intervalle bloquant"""
+    table = FakeProcessTable()
+    table.spawn(10, "app-editor", 1.0)
+    table.spawn(11, "app-player", 1.0)
+    now = [100.0]
+    scanner = make_scanner(table, clock=lambda: now[0])
+    
+    # Premier passage : pas encore de référence
+    assert all(r['cpu_percent'] is None for r in scanner.scan())
+    
+    now[0] += 2.0
+    table.cpu[10] = 1.0   # 1 s de CPU en 2 s → 50 %
+    results = {r['pid']: r['cpu_percent'] for r in scanner.scan()}
+    assert results == {10: 50.0, 11: 0.0}
+    
+    # Pid réattribué : l'échantillon précédent n'est pas réutilisé
+    table.spawn(10, "app-chat", 5.0)
+    now[0] += 2.0
+    results = {r['pid']: r['cpu_percent'] for r in scanner.scan()}
+    assert results[10] is None
@@ -0,0 +1,90 @@
+"""
+Tests de l'échantillonnage de l'empreinte de l'assistant
+"""
+
+import json
+import threading
+import time
+
+from src.config.settings import settings
+from src.core.self_monitor import SelfMonitor, thread_subsystem
+
+
+def burn_cpu(seconds: float):
+    deadline = time.thread_time() + seconds
+    while time.thread_time() < deadline:
+        pass
+
+
+def test_llm_threads_are_attributed_to_llm_subsystem():
+    """Générations, préchargements et préchauffage du modèle (boucle partagée) comptent dans llm"""
+    assert thread_subsystem("asyncio-loop") == 'llm'
+    assert thread_subsystem("voice-actions_0") == 'voice'
+    assert thread_subsystem("Thread-7") == 'other'
+
+
+def test_samples_attribution_and_ring_buffer(monkeypatch, tmp_path):
+    """CPU attribué par nom de thread et par bloc suivi ; tampon borné et exportable"""
+    monkeypatch.setattr(settings.monitoring, "self_monitor_samples", 3)
+    monitor = SelfMonitor()
+    
+    sampled = threading.Event()
+    
+    def worker_loop():
+        burn_cpu(0.05)
+        sampled.wait(5)
+    
+    workers = [threading.Thread(target=worker_loop, name=name)
+               for name in ("voice-worker-test", "asyncio-loop")]
+    for worker in workers:
+        worker.start()
+    with monitor.track("ocr"):
+        with monitor.track("ocr"):  # Imbriqué : compté une seule fois
+            burn_cpu(0.05)
+    time.sleep(0.1)
+    
+    sample = monitor.sample()
+    sampled.set()
+    for worker in workers:
+        worker.join()
+    
+    assert sample['rss_mb'] > 0
+    assert sample['threads'] >= 2
+    assert sample['open_fds'] > 0
+    assert sample['cpu_percent'] is None  # Premier échantillon
+    assert 0.05 <= monitor.tracked['ocr'] < 0.1
+    assert sample['subsystems_cpu_s']['tk'] >= 0.05
+    assert sample['subsystems_cpu_s']['voice'] >= 0.04
+    assert sample['subsystems_cpu_s']['llm'] >= 0.04
+    
+    for _ in range(4):
+        sample = monitor.sample()
+    assert sample['cpu_percent'] is not None
+    assert len(monitor.samples) == 3
+    
+    path = monitor.export_json(str(tmp_path / "self.json"))
+    with open(path, encoding='utf-8') as f:
+        exported = json.load(f)
+    assert len(exported['samples']) == 3
+    assert exported['summary']['rss_mb_max'] > 0
+
+
+def test_alarm_fires_once_per_crossing():
+    """Alarme au franchissement du seuil, réarmée quand la valeur redescend"""
+    monitor = SelfMonitor()
+    alarms = []
+    monitor.on_alarm(lambda name, value, threshold: alarms.append(name))
+    monitor.thresholds = {'threads': 1, 'rss_mb': 0, 'cpu_percent': 0, 'open_fds': 0}
+    
+    monitor.sample()
+    monitor.sample()
+    assert alarms == ['threads']
+    assert 'threads' in monitor.active_alarms
+    
+    monitor.thresholds['threads'] = 10_000
+    monitor.sample()
+    assert monitor.active_alarms == {}
+    
+    monitor.thresholds['threads'] = 1
+    monitor.sample()
+    assert alarms == ['threads', 'threads']
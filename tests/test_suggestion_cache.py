@@ -0,0 +1,62 @@
+"""
+Tests du cache de suggestions (LRU, expiration, persistance)
+"""
+
+import time
+
+from src.core.suggestion_cache import SuggestionCache
+
+
+def key(app_name: str):
+    return SuggestionCache.make_key("llama3.2", app_name, "Navigation", 1)
+
+
+def test_hit_and_miss_counters():
+    """Les compteurs distinguent hits et misses"""
+    cache = SuggestionCache()
+    assert cache.get(key("Chrome")) is None
+    
+    cache.put(key("Chrome"), "Essaie Ctrl+T !")
+    assert cache.get(key("Chrome")) == "Essaie Ctrl+T !"
+    
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_lru_eviction():
+    """L'entrée la moins récemment utilisée est évincée"""
+    cache = SuggestionCache(max_entries=2)
+    cache.put(key("Chrome"), "a")
+    cache.put(key("Firefox"), "b")
+    cache.get(key("Chrome"))
+    cache.put(key("Edge"), "c")
+    
+    assert key("Firefox") not in cache
+    assert key("Chrome") in cache
+    assert key("Edge") in cache
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_ttl_expiration():
+    """Une entrée expirée n'est plus servie"""
+    cache = SuggestionCache(ttl=60)
+    cache.put(key("Chrome"), "vieux conseil", created_at=time.time() - 120)
+    
+    assert cache.get(key("Chrome")) is None
+    assert cache.get_stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_persistence_roundtrip(tmp_path):
+    """Le cache persisté est rechargé au démarrage suivant"""
+    cache_file = tmp_path / "suggestion_cache.json"
+    cache = SuggestionCache(cache_file=str(cache_file))
+    cache.put(key("Chrome"), "Essaie Ctrl+T !")
+    cache.put(key("Firefox"), "expiré", created_at=time.time() - 7200)
+    cache.save()
+    
+    reloaded = SuggestionCache(ttl=3600, cache_file=str(cache_file))
+    assert reloaded.get(key("Chrome")) == "Essaie Ctrl+T !"
+    assert key("Firefox") not in reloaded
@@ -0,0 +1,97 @@
+"""
+Tests du préchargement des suggestions
+"""
+
+import asyncio
+import threading
+import time
+
+from src.core.generation_scheduler import GenerationScheduler
+from src.core.suggestion_prefetcher import SuggestionPrefetcher
+from src.utils.event_loop import EventLoopThread
+
+
+class FakeOllamaClient:
+    """Client factice : chaque génération remplit un cache en mémoire"""
+    
+    available = True
+    
+    def __init__(self):
+        self.cache = {}
+        self.generated = []
+    
+    def is_cached(self, app_name):
+        return app_name in self.cache
+    
+    async def stream_suggestion(self, app_name, context):
+        self.generated.append(app_name)
+        self.cache[app_name] = f"Conseil {app_name}"
+        yield self.cache[app_name]
+
+
+class FakeLearningEngine:
+    def predict_next_apps(self, app_name, k=3):
+        return {'VS Code': ['Chrome', 'Terminal', 'Slack']}.get(app_name, [])[:k]
+
+
+def wait_idle(scheduler, timeout=2.0):
+    deadline = time.time() + timeout
+    while scheduler.get_stats()['inflight'] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_prefetch_warms_cache_and_counts_hits():
+    """Les applications prédites sont préchargées puis comptées comme hits"""
+    client = FakeOllamaClient()
+    event_loop = EventLoopThread("test-loop")
+    scheduler = GenerationScheduler(event_loop=event_loop)
+    prefetcher = SuggestionPrefetcher(client, scheduler, FakeLearningEngine())
+    
+    prefetcher.prefetch_after('VS Code')
+    wait_idle(scheduler)
+    
+    # prefetch_max_apps = 2 par défaut
+    assert client.generated == ['Chrome', 'Terminal']
+    
+    # Passage à Chrome : hit, et Terminal est réglé comme inutile sans attendre le TTL
+    prefetcher.record_switch('Chrome')
+    stats = prefetcher.get_stats()
+    assert stats['completed'] == 2
+    assert stats['hits'] == 1
+    assert stats['wasted'] == 1
+    assert stats['pending'] == 0
+    assert stats['precision'] == 0.5
+    
+    prefetcher.record_switch('Word')
+    assert prefetcher.get_stats()['wasted'] == 1
+    
+    # Déjà en cache : pas de nouvelle génération
+    prefetcher.prefetch_after('VS Code')
+    wait_idle(scheduler)
+    assert client.generated == ['Chrome', 'Terminal']
+    scheduler.shutdown()
+    event_loop.stop()
+
+
+def test_prefetch_steps_aside_for_foreground_generation():
+    """Pas de préchargement tant qu'une vraie génération attend ou tourne"""
+    client = FakeOllamaClient()
+    event_loop = EventLoopThread("test-loop")
+    scheduler = GenerationScheduler(event_loop=event_loop)
+    prefetcher = SuggestionPrefetcher(client, scheduler, FakeLearningEngine())
+    release = threading.Event()
+    
+    async def foreground():
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+    
+    scheduler.submit('Word', foreground)
+    prefetcher.prefetch_after('VS Code')
+    release.set()
+    wait_idle(scheduler)
+    
+    assert client.generated == []
+    assert prefetcher.get_stats()['predicted'] == 0
+    assert scheduler.get_stats()['background_rejected'] == 0
+    scheduler.shutdown()
+    event_loop.stop()
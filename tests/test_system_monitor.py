@@ -0,0 +1,184 @@
+"""
+Tests de SystemMonitor (sans lire la vraie table des processus)
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+from src.config.settings import settings
+from src.core.monitor_backends import MonitorBackend
+from src.core.system_monitor import SystemMonitor
+
+MemoryInfo = namedtuple("MemoryInfo", "rss vms")
+CpuTimes = namedtuple("CpuTimes", "user system")
+
+
+def test_interval_backs_off_and_resets_on_change():
+    """Intervalle minimal après un changement, puis backoff borné"""
+    monitor = SystemMonitor(lambda app, context: None)
+    config = settings.monitoring
+    
+    monitor.current_interval = monitor._next_interval(changed=True)
+    assert monitor.current_interval == config.min_check_interval
+    
+    intervals = []
+    for _ in range(30):
+        monitor.current_interval = monitor._next_interval(changed=False)
+        intervals.append(monitor.current_interval)
+    assert intervals[0] == config.min_check_interval * config.interval_backoff
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == config.max_check_interval
+    
+    assert monitor._next_interval(changed=True) == config.min_check_interval
+
+
+def test_notify_activity_wakes_idle_loop(monkeypatch):
+    """Une activité utilisateur relance un scan sans attendre la fin de l'intervalle"""
+    # Un seul scan sans changement suffit à atteindre l'intervalle maximal
+    monkeypatch.setattr(settings.monitoring, "interval_backoff", 1000)
+    scanned = threading.Event()
+    monitor = SystemMonitor(lambda app, context: None)
+    
+    def fake_scan():
+        scanned.set()
+        return "Chrome", "Navigation web"
+    
+    monitor._get_active_app_info = fake_scan
+    monitor.running = True
+    monitor._start_polling()
+    try:
+        # Premier scan : changement, donc second scan après l'intervalle minimal
+        assert scanned.wait(2)
+        scanned.clear()
+        assert scanned.wait(2)
+        scanned.clear()
+        
+        # Pas de changement : la boucle attend maintenant l'intervalle maximal
+        time.sleep(0.1)
+        assert monitor.current_interval == settings.monitoring.max_check_interval
+        
+        start = time.perf_counter()
+        monitor.notify_activity()
+        assert scanned.wait(2)
+        assert time.perf_counter() - start < 1
+    finally:
+        monitor.stop()
+
+
+def test_switch_after_idle_backoff_is_detected_within_fixed_interval():
+    """Après une longue inactivité, un changement est vu en moins de check_interval"""
+    config = settings.monitoring
+    monitor = SystemMonitor(lambda app, context: None)
+    monitor.debouncer.dwell_time = 0
+    
+    class SimulatedWait:
+        """Remplace l'attente réelle par une horloge simulée"""
+        now = 0.0
+        
+        def wait(self, timeout):
+            SimulatedWait.now += timeout
+            return False
+        
+        def clear(self):
+            pass
+        
+        def set(self):
+            pass
+    
+    switch_at = 600.0  # 10 minutes dans la même application
+    detected = []
+    monitor._wake_event = SimulatedWait()
+    monitor._get_active_app_info = lambda: (
+        ("Chrome", "Navigation web") if SimulatedWait.now < switch_at else ("VS Code", "Développement")
+    )
+    
+    def on_change(app_name, context):
+        if app_name == "VS Code":
+            detected.append(SimulatedWait.now)
+            monitor.running = False
+    
+    monitor.callback = on_change
+    monitor.running = True
+    monitor._monitor_loop()
+    
+    assert detected[0] - switch_at <= config.check_interval
+
+
+def test_cpu_activity_raises_score():
+    """À mémoire et âge égaux, le processus actif (CPU) l'emporte"""
+    monitor = SystemMonitor(lambda app, context: None)
+    now = time.time()
+    
+    def proc_info(pid, cpu_percent):
+        return {'pid': pid, 'name': 'code', 'create_time': now - 60,
+                'memory_info': None, 'cpu_percent': cpu_percent}
+    
+    idle = monitor._calculate_app_score(proc_info(1, 0.0), now)
+    busy = monitor._calculate_app_score(proc_info(2, settings.monitoring.score_cpu_threshold), now)
+    first_scan = monitor._calculate_app_score(proc_info(3, None), now)
+    
+    assert busy - idle == pytest.approx(30)
+    assert first_scan == pytest.approx(idle)
+
+
+class BusyTable(MonitorBackend):
+    """L'assistant (python3) est le processus le plus actif, VS Code est ouvert"""
+    
+    def __init__(self):
+        self.table = {os.getpid(): ("python3", 2.0), 4242: ("code", 0.1)}
+        self.cpu = {pid: 0.0 for pid in self.table}
+        self.opened = []
+        self.step = 0
+    
+    def pids(self):
+        self.step += 1
+        for pid, (_, rate) in self.table.items():
+            self.cpu[pid] += rate
+        return list(self.table)
+    
+    def process(self, pid):
+        self.opened.append(pid)
+        backend = self
+        name, _ = self.table[pid]
+        
+        class Process:
+            def oneshot(self):
+                return contextlib.nullcontext()
+            
+            def name(self):
+                return name
+            
+            def create_time(self):
+                return time.time() - 3600
+            
+            def memory_info(self):
+                return MemoryInfo(500 * 1024 * 1024, 0)
+            
+            def cpu_times(self):
+                return CpuTimes(backend.cpu[pid], 0.0)
+            
+            def is_running(self):
+                return True
+        
+        return Process()
+    
+    def monotonic(self):
+        return float(self.step)
+
+
+def test_assistant_does_not_detect_itself():
+    """Le processus de l'assistant (python, application connue) n'est jamais lu ni retenu"""
+    backend = BusyTable()
+    monitor = SystemMonitor(lambda app, context: None, process_backend=backend)
+    
+    for _ in range(3):
+        app_name, _ = monitor._get_active_app_info()
+    
+    assert app_name == "VS Code"
+    assert os.getpid() not in backend.opened
+    assert os.getpid() not in monitor.scanner.known_pids()
@@ -0,0 +1,64 @@
+"""
+Tests de la matrice de transitions incrémentale
+"""
+
+import threading
+
+import pytest
+
+from src.core.transition_matrix import TransitionMatrix
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+DAY = 86400
+
+
+def test_decayed_weights_and_ordering():
+    """Poids divisé par deux à chaque demi-vie ; successeurs triés par poids"""
+    matrix = TransitionMatrix(half_life=7 * DAY)
+    for i in range(3):
+        matrix.record("VS Code", "Chrome", i * 60)
+    matrix.record("VS Code", "Terminal", 7 * DAY)
+    matrix.record("VS Code", "Terminal", 7 * DAY)
+    
+    successors = matrix.successors("VS Code", now=7 * DAY)
+    assert [app for app, _ in successors] == ["Terminal", "Chrome"]
+    assert dict(successors)["Chrome"] == pytest.approx(1.5, rel=1e-3)
+    
+    assert matrix.successors("VS Code", now=7 * DAY, min_weight=2.5) == []
+    assert matrix.successors("Slack", now=0) == []
+    assert matrix.total == 5
+    
+    # Transition plus ancienne que la dernière mise à jour : vieillie à l'insertion
+    matrix.record("VS Code", "Terminal", 0)
+    assert dict(matrix.successors("VS Code", now=7 * DAY))["Terminal"] == pytest.approx(2.5)
+
+
+def test_workflows_read_while_monitor_records(tmp_path):
+    """L'interface et le préchargement lisent les workflows pendant que la surveillance écrit"""
+    engine = UserLearningEngine(str(tmp_path / "patterns.json"),
+                                timeline=UsageTimeline(str(tmp_path / "timeline")))
+    apps = [f"App {i}" for i in range(200)]
+    errors = []
+    
+    def writer():
+        for i in range(5000):
+            engine.record_app_transition(apps[i % 200], apps[(i * 7 + 1) % 200])
+    
+    def reader():
+        try:
+            for _ in range(200):
+                engine.get_usage_stats()
+                engine.get_active_hours(min_transitions=1)
+        except RuntimeError as e:  # dictionary changed size during iteration
+            errors.append(e)
+    
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert engine.get_usage_stats()['total_transitions'] == 5000
+    engine.close()
@@ -0,0 +1,109 @@
+"""
+Tests de la chronologie d'utilisation des applications
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+from src.core.usage_timeline import UsageTimeline
+from src.core.user_learning import UserLearningEngine
+
+
+def brute_force_totals(intervals, start, end):
+    totals = {}
+    for app, s, e in intervals:
+        overlap = min(end, e) - max(start, s)
+        if overlap > 0:
+            totals[app] = totals.get(app, 0.0) + overlap
+    return totals
+
+
+def test_range_queries_match_brute_force_and_survive_reload(tmp_path):
+    """Cumuls journaliers + bords = parcours complet ; rechargement identique"""
+    rng = random.Random(7)
+    timeline = UsageTimeline(str(tmp_path), flush_every=50)
+    t = datetime(2026, 3, 1, 8).timestamp()
+    for _ in range(2000):
+        timeline.record_focus(rng.choice(["VS Code", "Chrome", "Slack"]), t)
+        t += rng.uniform(10, 1800)
+    timeline.close(t)
+    timeline.flush()
+    
+    intervals = timeline.intervals()
+    assert len(intervals) == len(timeline)
+    
+    for _ in range(20):
+        start = rng.uniform(intervals[0][1], t)
+        end = rng.uniform(start, t + 3600)
+        expected = brute_force_totals(intervals, start, end)
+        result = timeline.totals(start, end)
+        assert result.keys() == expected.keys()
+        for app, seconds in expected.items():
+            assert result[app] == pytest.approx(seconds)
+    
+    reloaded = UsageTimeline(str(tmp_path))
+    reloaded.load()
+    assert reloaded.intervals() == intervals
+    week = datetime(2026, 3, 9).timestamp(), datetime(2026, 3, 16).timestamp()
+    assert reloaded.time_in("VS Code", *week) == pytest.approx(timeline.time_in("VS Code", *week))
+    
+    # Enregistrement tronqué (arrêt pendant l'écriture) : ignoré au chargement
+    with open(tmp_path / "timeline.bin", "ab") as f:
+        f.write(b"\x00" * 7)
+    reloaded.load()
+    assert len(reloaded) == len(intervals)
+
+
+def test_learning_engine_reads_transitions_from_timeline(tmp_path):
+    """Les workflows sont déduits des intervalles ; une longue pause coupe la transition"""
+    timeline = UsageTimeline(str(tmp_path / "timeline"))
+    
+    t = datetime.now().timestamp() - 86400
+    for _ in range(3):
+        timeline.record_focus("VS Code", t)
+        timeline.record_focus("Chrome", t + 60)
+        timeline.close(t + 120)
+        t += 3600  # Pause : pas de transition Chrome → VS Code
+    
+    engine = UserLearningEngine(str(tmp_path / "patterns.json"), timeline=timeline)
+    assert engine.get_common_workflows() == {"VS Code": ["Chrome"]}
+    assert engine.get_usage_stats()['total_transitions'] == 3
+    
+    # record_app_transition après SystemMonitor : pas de doublon
+    timeline.record_focus("Slack", t)
+    engine.record_app_transition("Chrome", "Slack")
+    assert timeline.open_app == "Slack" and timeline.open_start == t
+
+
+def test_background_flush_and_shutdown(tmp_path):
+    """record_focus n'écrit pas lui-même ; shutdown écrit le reste"""
+    timeline = UsageTimeline(str(tmp_path), flush_every=5, background=True)
+    t = datetime(2026, 3, 2, 9).timestamp()
+    for i in range(12):
+        timeline.record_focus(["VS Code", "Chrome"][i % 2], t + i * 60)
+    timeline.writer.flush()
+    assert timeline.writer.get_stats()['written'] >= 1
+    
+    timeline.shutdown(t + 3600)
+    assert timeline.open_app is None and timeline.intervals()[-1][2] == t + 3600
+    timeline.shutdown()  # Idempotent
+    reloaded = UsageTimeline(str(tmp_path))
+    reloaded.load()
+    assert reloaded.intervals() == timeline.intervals()
+    assert len(reloaded) == 12
+
+
+def test_old_unflushed_intervals_are_flushed_without_waiting_for_count(tmp_path):
+    """Peu de changements d'application : écrits quand même après flush_age"""
+    timeline = UsageTimeline(str(tmp_path), flush_every=20, flush_age=60.0)
+    t = datetime(2026, 3, 2, 9).timestamp()
+    timeline.record_focus("VS Code", t)
+    timeline.record_focus("Chrome", t + 10)
+    assert not (tmp_path / "timeline.bin").exists()
+    
+    timeline.record_focus("Slack", t + 120)
+    reloaded = UsageTimeline(str(tmp_path))
+    reloaded.load()
+    assert len(reloaded) == 2